@@ -1,21 +1,91 @@
+"""Request role resolution.
+
+The role of a logged-in user is cached in the session as a claim bound to
+the session's user id and to the session auth hash Django stored at login.
+While the claim is younger than ``AUTH_ROLE_REVALIDATE_SECONDS`` and still
+matches the session, the role is read from the session alone, so a page does
+not load the user row just to decide access. Older claims are re-checked
+against ``request.user``, which verifies the auth hash and ``is_active``: a
+deactivated user, a changed staff flag or a password change made from
+another session therefore takes effect within one revalidation interval, and
+a session whose user no longer authenticates loses its role. Logging out
+flushes the session and the claim with it.
+"""
+
+import time
 from functools import wraps
 
+from django.conf import settings
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect
+from django.utils.crypto import constant_time_compare
 
 ROLE_ADMIN = "admin"
 ROLE_REPORT = "report"
 SESSION_ROLE_KEY = "role"
+SESSION_ROLE_CLAIM_KEY = "role_claim"
+
+
+def _revalidate_seconds() -> int:
+    return getattr(settings, "AUTH_ROLE_REVALIDATE_SECONDS", 300)
+
+
+def claim_is_fresh(claim, *, user_id=None) -> bool:
+    """Return whether a session ``claim`` dict may be trusted without a query.
+
+    With ``user_id`` the claim must also have been issued for that user.
+    """
+    if not isinstance(claim, dict):
+        return False
+    if user_id is not None and claim.get("user_id") != str(user_id):
+        return False
+    checked_at = claim.get("checked_at")
+    if not isinstance(checked_at, (int, float)):
+        return False
+    return 0 <= time.time() - checked_at < _revalidate_seconds()
+
+
+def role_claim_is_valid(session) -> bool:
+    """Return whether the session's role claim may be trusted without a query."""
+    user_id = session.get(SESSION_KEY)
+    claim = session.get(SESSION_ROLE_CLAIM_KEY)
+    if user_id is None or not claim_is_fresh(claim, user_id=user_id):
+        return False
+    if claim.get("is_active") is not True:
+        return False
+    return constant_time_compare(claim.get("auth_hash") or "", session.get(HASH_SESSION_KEY) or "")
+
+
+def store_role_claim(request: HttpRequest, user, role: str) -> None:
+    request.session[SESSION_ROLE_CLAIM_KEY] = {
+        "user_id": str(user.pk),
+        "role": role,
+        "auth_hash": user.get_session_auth_hash(),
+        "is_active": bool(user.is_active),
+        "checked_at": int(time.time()),
+    }
 
 
 def resolve_request_role(request: HttpRequest) -> str | None:
+    session = request.session
+    if role_claim_is_valid(session):
+        return session[SESSION_ROLE_CLAIM_KEY]["role"]
+
     user = getattr(request, "user", None)
-    if user and getattr(user, "is_authenticated", False):
+    if user and getattr(user, "is_authenticated", False) and user.is_active:
         role = ROLE_ADMIN if (user.is_staff or user.is_superuser) else ROLE_REPORT
-        if request.session.get(SESSION_ROLE_KEY) != role:
-            request.session[SESSION_ROLE_KEY] = role
+        if session.get(SESSION_ROLE_KEY) != role:
+            session[SESSION_ROLE_KEY] = role
+        store_role_claim(request, user, role)
         return role
-    return request.session.get(SESSION_ROLE_KEY)
+    session.pop(SESSION_ROLE_CLAIM_KEY, None)
+    if session.get(SESSION_KEY) is not None:
+        # Logged in, but the user was deactivated or changed their password
+        # elsewhere: the role stored at login no longer applies.
+        session.pop(SESSION_ROLE_KEY, None)
+        return None
+    return session.get(SESSION_ROLE_KEY)
 
 
 def require_roles(*allowed_roles: str):
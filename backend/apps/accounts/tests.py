@@ -1,4 +1,8 @@
-from django.contrib.auth import get_user_model
+import time
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import HASH_SESSION_KEY, get_user_model
 from django.test import TestCase
 from django.urls import reverse
 
@@ -48,6 +52,56 @@ class LoginFlowTests(TestCase):
                 self.assertEqual(response.url, reverse(redirect_name))
                 self.assertEqual(self.client.session.get("role"), expected_role)
 
+    def test_role_claim_skips_user_lookup_until_revalidation(self):
+        user = get_user_model().objects.get(username="admin")
+        self.client.force_login(user)
+        self.client.get(reverse("home"))
+
+        # Only the session row is read while the claim is fresh.
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("home"))
+        self.assertEqual(response.url, reverse("dashboard_index"))
+
+        user.is_staff = False
+        user.save(update_fields=["is_staff"])
+        response = self.client.get(reverse("home"))
+        self.assertEqual(response.url, reverse("dashboard_index"))
+
+        later = time.time() + settings.AUTH_ROLE_REVALIDATE_SECONDS + 1
+        with patch("apps.accounts.auth.time.time", return_value=later):
+            response = self.client.get(reverse("home"))
+        self.assertEqual(response.url, reverse("report_index"))
+        self.assertEqual(self.client.session.get("role"), "report")
+
+    def test_role_claim_is_bound_to_the_session_auth_hash(self):
+        user = get_user_model().objects.get(username="admin")
+        self.client.force_login(user)
+        self.client.get(reverse("home"))
+
+        # A password change elsewhere invalidates this login; the claim must
+        # not outlive it even though it is still fresh.
+        user.set_password("new-admin-pass")
+        user.save(update_fields=["password"])
+        session = self.client.session
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.save()
+        get_user_model().objects.filter(pk=user.pk).update(is_staff=False)
+
+        response = self.client.get(reverse("home"))
+        self.assertEqual(response.url, reverse("report_index"))
+
+    def test_deactivated_user_loses_role_on_revalidation(self):
+        user = get_user_model().objects.get(username="admin")
+        self.client.force_login(user)
+        self.client.get(reverse("home"))
+        get_user_model().objects.filter(pk=user.pk).update(is_active=False)
+
+        later = time.time() + settings.AUTH_ROLE_REVALIDATE_SECONDS + 1
+        with patch("apps.accounts.auth.time.time", return_value=later):
+            response = self.client.get(reverse("dashboard_index"))
+        self.assertEqual(response.url, reverse("home"))
+        self.assertIsNone(self.client.session.get("role"))
+
     def test_wrong_password_shows_error(self):
         response = self.client.post(
             reverse("home"),
@@ -2,7 +2,7 @@ from django.contrib.auth import login as auth_login, logout as auth_logout
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect, render
 
-from .auth import ROLE_ADMIN, ROLE_REPORT, SESSION_ROLE_KEY, resolve_request_role
+from .auth import ROLE_ADMIN, ROLE_REPORT, SESSION_ROLE_KEY, resolve_request_role, store_role_claim
 from .forms import LoginForm
 from .services.authentication import authenticate_login
 
@@ -30,6 +30,7 @@ def home(request: HttpRequest) -> HttpResponse:
             if result.is_success:
                 auth_login(request, result.user)
                 request.session[SESSION_ROLE_KEY] = result.role
+                store_role_claim(request, result.user, result.role)
                 return _redirect_by_role(result.role)
             form.add_error(result.error_field, result.error_message)
     else:
@@ -0,0 +1,301 @@
+"""Deterministic synthetic data for benchmarks and query-budget tests.
+
+Rows are written with ``bulk_create`` so that entry totals, transactions and
+department summaries stay consistent without going through the per-row
+``save()`` delta bookkeeping, which would make large datasets slow to build.
+"""
+
+from __future__ import annotations
+
+import random
+from calendar import monthrange
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from apps.accounts.models import Department, Member, MemberDepartment
+from apps.dairymetrics.models import (
+    DepartmentDailyMetricSummary,
+    MemberDailyMetricEntry,
+    MemberMetricTransaction,
+    MetricAdjustment,
+    WVMetricCancellation,
+)
+from apps.talks.models import KnowledgePost, KnowledgePostTag, KnowledgeTag
+from apps.targets.models import (
+    MonthTargetMetricValue,
+    Period,
+    PeriodTargetMetricValue,
+    TARGET_STATUS_PLANNED,
+    TargetMetric,
+)
+
+
+BATCH_SIZE = 1000
+LOCATIONS = ["渋谷", "新宿", "池袋", "横浜", "大宮", "千葉", "川崎", "町田"]
+AGE_BANDS = [value for value, _ in MemberMetricTransaction.AGE_BAND_CHOICES]
+GENDERS = [value for value, _ in MemberMetricTransaction.GENDER_CHOICES]
+NATIONALITIES = [value for value, _ in MemberMetricTransaction.NATIONALITY_CHOICES]
+
+
+@dataclass
+class BenchmarkDataset:
+    departments: dict[str, Department]
+    members: list[Member]
+    admin_user: object
+    start_date: date
+    end_date: date
+    counts: dict[str, int] = field(default_factory=dict)
+
+    def members_for(self, code: str) -> list[Member]:
+        department_id = self.departments[code].id
+        return [member for member in self.members if member.default_department_id == department_id]
+
+
+def _month_starts(start_date: date, end_date: date):
+    month = start_date.replace(day=1)
+    while month <= end_date:
+        yield month
+        month = (month + timedelta(days=32)).replace(day=1)
+
+
+def _seed_periods_and_targets(departments, *, start_date, end_date, rng) -> int:
+    metrics = {}
+    for department in departments.values():
+        for order, (code, label) in enumerate((("count", "件数"), ("amount", "金額")), start=1):
+            metric, _ = TargetMetric.objects.get_or_create(
+                department=department,
+                code=code,
+                defaults={"label": label, "display_order": order},
+            )
+            metrics[(department.code, code)] = metric
+
+    created = 0
+    for month in _month_starts(start_date, end_date):
+        month_end = month.replace(day=monthrange(month.year, month.month)[1])
+        halves = ((1, month, month.replace(day=15)), (2, month.replace(day=16), month_end))
+        for number, period_start, period_end in halves:
+            period, _ = Period.objects.get_or_create(
+                month=month,
+                name=f"{month:%Y/%m} 第{number}路程",
+                defaults={"start_date": period_start, "end_date": period_end, "status": TARGET_STATUS_PLANNED},
+            )
+            for (code, metric_code), metric in metrics.items():
+                PeriodTargetMetricValue.objects.get_or_create(
+                    period=period,
+                    department=departments[code],
+                    metric=metric,
+                    defaults={"value": rng.randint(50, 120) if metric_code == "count" else rng.randint(3, 8) * 100000},
+                )
+            created += 1
+        for (code, metric_code), metric in metrics.items():
+            MonthTargetMetricValue.objects.get_or_create(
+                department=departments[code],
+                target_month=month,
+                metric=metric,
+                defaults={"value": rng.randint(100, 240) if metric_code == "count" else rng.randint(6, 16) * 100000},
+            )
+    return created
+
+
+def _wv_transaction(entry, rng):
+    result_type = rng.choice(
+        [
+            MemberMetricTransaction.WV_RESULT_CS,
+            MemberMetricTransaction.WV_RESULT_CS,
+            MemberMetricTransaction.WV_RESULT_REFUGEE,
+            MemberMetricTransaction.WV_RESULT_BOTH,
+        ]
+    )
+    cs_count = 1 if result_type != MemberMetricTransaction.WV_RESULT_REFUGEE else 0
+    refugee_amount = rng.choice([1000, 2000, 3000]) if result_type != MemberMetricTransaction.WV_RESULT_CS else 0
+    return MemberMetricTransaction(
+        entry=entry,
+        support_amount=cs_count * MemberMetricTransaction.WV_CS_UNIT_AMOUNT + refugee_amount,
+        age_band=rng.choice(AGE_BANDS),
+        gender=rng.choice(GENDERS),
+        nationality_type=rng.choice(NATIONALITIES),
+        wv_result_type=result_type,
+        wv_cs_count=cs_count,
+        wv_refugee_amount=refugee_amount,
+        location=entry.location_name,
+    )
+
+
+def _un_transaction(entry, rng):
+    return MemberMetricTransaction(
+        entry=entry,
+        support_amount=rng.choice([1000, 1500, 2000, 3000, 5000, 10000]),
+        age_band=rng.choice(AGE_BANDS),
+        is_student=rng.random() < 0.15,
+        gender=rng.choice(GENDERS),
+        nationality_type=rng.choice(NATIONALITIES),
+        location=entry.location_name,
+    )
+
+
+@transaction.atomic
+def seed_benchmark_dataset(
+    *,
+    members: int = 200,
+    days: int = 730,
+    seed: int = 1,
+    end_date: date | None = None,
+    activity_rate: float = 0.6,
+    posts: int = 200,
+) -> BenchmarkDataset:
+    """Create UN/WV departments, members and ``days`` of history ending on ``end_date``."""
+    rng = random.Random(seed)
+    end_date = end_date or timezone.localdate()
+    start_date = end_date - timedelta(days=days - 1)
+
+    departments = {}
+    for code in ("UN", "WV"):
+        departments[code], _ = Department.objects.get_or_create(code=code, defaults={"name": code})
+
+    user_model = get_user_model()
+    admin_user, _ = user_model.objects.get_or_create(username="benchmark-admin", defaults={"is_staff": True})
+
+    member_objects = []
+    for index in range(members):
+        department = departments["UN" if index % 2 == 0 else "WV"]
+        member_objects.append(Member(name=f"ベンチ{index:04d}", default_department=department))
+    member_objects = Member.objects.bulk_create(member_objects, batch_size=BATCH_SIZE)
+    MemberDepartment.objects.bulk_create(
+        [MemberDepartment(member=member, department_id=member.default_department_id) for member in member_objects],
+        batch_size=BATCH_SIZE,
+    )
+    department_by_id = {department.id: department for department in departments.values()}
+
+    period_count = _seed_periods_and_targets(departments, start_date=start_date, end_date=end_date, rng=rng)
+
+    entries = []
+    for offset in range(days):
+        entry_date = start_date + timedelta(days=offset)
+        for member in member_objects:
+            if rng.random() >= activity_rate:
+                continue
+            approach = rng.randint(20, 120)
+            communication = rng.randint(0, approach // 2)
+            entries.append(
+                MemberDailyMetricEntry(
+                    member=member,
+                    department=department_by_id[member.default_department_id],
+                    entry_date=entry_date,
+                    approach_count=approach,
+                    communication_count=communication,
+                    location_name=rng.choice(LOCATIONS),
+                    memo="あと一歩でした。次回は声かけを工夫する。" if rng.random() < 0.1 else "",
+                    activity_closed=entry_date < end_date,
+                    input_source=MemberDailyMetricEntry.SOURCE_MEMBER,
+                )
+            )
+    entries = MemberDailyMetricEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+
+    transactions = []
+    summaries: dict[tuple[int, date], dict[str, int]] = {}
+    for entry in entries:
+        is_wv = entry.department.code == "WV"
+        entry_transactions = [
+            (_wv_transaction if is_wv else _un_transaction)(entry, rng)
+            for _ in range(rng.choice([0, 0, 1, 1, 1, 2, 3]))
+        ]
+        transactions.extend(entry_transactions)
+        entry.support_amount = sum(tx.support_amount for tx in entry_transactions)
+        if is_wv:
+            entry.cs_count = sum(tx.wv_cs_count for tx in entry_transactions)
+            entry.refugee_count = sum(1 for tx in entry_transactions if tx.wv_refugee_amount)
+            entry.result_count = entry.cs_count + entry.refugee_count
+        else:
+            entry.result_count = len(entry_transactions)
+        summary = summaries.setdefault(
+            (entry.department_id, entry.entry_date),
+            {"approach_count": 0, "communication_count": 0, "result_count": 0, "support_amount": 0},
+        )
+        for field_name in summary:
+            summary[field_name] += getattr(entry, field_name)
+    MemberDailyMetricEntry.objects.bulk_update(
+        entries,
+        ["result_count", "support_amount", "cs_count", "refugee_count"],
+        batch_size=BATCH_SIZE,
+    )
+    transactions = MemberMetricTransaction.objects.bulk_create(transactions, batch_size=BATCH_SIZE)
+    DepartmentDailyMetricSummary.objects.bulk_create(
+        [
+            DepartmentDailyMetricSummary(department_id=department_id, entry_date=entry_date, **values)
+            for (department_id, entry_date), values in summaries.items()
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    adjustments = []
+    cancellations = []
+    for entry in entries:
+        if rng.random() < 0.03:
+            adjustments.append(
+                MetricAdjustment(
+                    member_id=entry.member_id,
+                    department_id=entry.department_id,
+                    target_date=entry.entry_date,
+                    source_type=rng.choice([MetricAdjustment.SOURCE_POSTAL, MetricAdjustment.SOURCE_QR, MetricAdjustment.SOURCE_INCREASE]),
+                    result_count=1,
+                    support_amount=rng.choice([1000, 3000, 5000]),
+                    location_name=entry.location_name,
+                    created_by=admin_user,
+                )
+            )
+    wv_transactions = [tx for tx in transactions if tx.wv_result_type]
+    for tx in rng.sample(wv_transactions, k=min(len(wv_transactions), len(wv_transactions) // 50)):
+        cancellation = WVMetricCancellation(
+            member_id=tx.entry.member_id,
+            department_id=tx.entry.department_id,
+            target_date=tx.entry.entry_date,
+            original_transaction=tx,
+            wv_result_type=tx.wv_result_type,
+            wv_cs_count=tx.wv_cs_count,
+            wv_refugee_amount=tx.wv_refugee_amount,
+            created_by=admin_user,
+        )
+        # bulk_create skips save(), so apply the same normalisation explicitly.
+        cancellation._normalize_wv_fields()
+        cancellations.append(cancellation)
+    MetricAdjustment.objects.bulk_create(adjustments, batch_size=BATCH_SIZE)
+    WVMetricCancellation.objects.bulk_create(cancellations, batch_size=BATCH_SIZE)
+
+    tags = [KnowledgeTag.objects.get_or_create(name=name)[0] for name in ("共有", "事例", "連絡")]
+    post_objects = KnowledgePost.objects.bulk_create(
+        [
+            KnowledgePost(
+                title=f"ベンチ投稿{index:04d}",
+                body="活動の気づきを共有します。",
+                author_member=rng.choice(member_objects) if member_objects else None,
+                published_at=timezone.now(),
+            )
+            for index in range(posts)
+        ],
+        batch_size=BATCH_SIZE,
+    )
+    KnowledgePostTag.objects.bulk_create(
+        [KnowledgePostTag(post=post, tag=rng.choice(tags)) for post in post_objects],
+        batch_size=BATCH_SIZE,
+    )
+
+    return BenchmarkDataset(
+        departments=departments,
+        members=member_objects,
+        admin_user=admin_user,
+        start_date=start_date,
+        end_date=end_date,
+        counts={
+            "members": len(member_objects),
+            "periods": period_count,
+            "entries": len(entries),
+            "transactions": len(transactions),
+            "adjustments": len(adjustments),
+            "cancellations": len(cancellations),
+            "posts": len(post_objects),
+        },
+    )
@@ -0,0 +1,103 @@
+"""Column-oriented, date-indexed metric series for trend charts.
+
+Grouped ``values(date).annotate(...)`` rows are loaded once into one list per
+metric aligned with a shared date index, so chart payloads are produced with
+whole-column arithmetic instead of per-date dict lookups. Plain lists keep the
+engine dependency-free; the chart windows (up to a few hundred points) do not
+need an array library.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+
+RESAMPLE_DAY = "day"
+RESAMPLE_WEEK = "week"
+RESAMPLE_MONTH = "month"
+RESAMPLE_CHOICES = (RESAMPLE_DAY, RESAMPLE_WEEK, RESAMPLE_MONTH)
+
+
+def column_sum(*columns: list[int]) -> list[int]:
+    return [sum(values) for values in zip(*columns)]
+
+
+def rate_column(numerators: list[int], denominators: list[int]) -> list[float | None]:
+    return [
+        round((numerator / denominator) * 100, 1) if denominator > 0 else None
+        for numerator, denominator in zip(numerators, denominators)
+    ]
+
+
+def height_column(values: list[int], *, floor: int = 14, empty: int = 12) -> list[int]:
+    """Scale values to 0-100 bar heights with a minimum visible height."""
+    maximum = max(values, default=0) or 1
+    return [max(floor, round((value / maximum) * 100)) if value else empty for value in values]
+
+
+def dense_dates(start_date: date, end_date: date) -> list[date]:
+    return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+
+def _bucket_start(value: date, resample: str) -> date:
+    if resample == RESAMPLE_WEEK:
+        return value - timedelta(days=value.weekday())
+    if resample == RESAMPLE_MONTH:
+        return value.replace(day=1)
+    return value
+
+
+@dataclass
+class DateSeries:
+    dates: list[date]
+    columns: dict[str, list[int]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._positions = {value: index for index, value in enumerate(self.dates)}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def column(self, name: str) -> list[int]:
+        return self.columns.get(name) or [0] * len(self.dates)
+
+    def load_rows(self, rows, *, date_key: str, fields: dict[str, str], prefix: str = "") -> "DateSeries":
+        """Add grouped rows into ``prefix + column`` lists; ``fields`` maps column -> row key."""
+        targets = {}
+        for name in fields:
+            targets[name] = self.columns.setdefault(f"{prefix}{name}", [0] * len(self.dates))
+        for row in rows:
+            position = self._positions.get(row[date_key])
+            if position is None:
+                continue
+            for name, row_key in fields.items():
+                targets[name][position] += int(row.get(row_key) or 0)
+        return self
+
+    def resample(self, resample: str = RESAMPLE_DAY) -> "DateSeries":
+        """Sum every column into day, week (Monday start) or month buckets."""
+        if resample not in RESAMPLE_CHOICES:
+            raise ValueError(f"unknown resample: {resample}")
+        if resample == RESAMPLE_DAY:
+            return self
+        bucket_dates: list[date] = []
+        bucket_index: list[int] = []
+        for value in self.dates:
+            bucket = _bucket_start(value, resample)
+            if not bucket_dates or bucket_dates[-1] != bucket:
+                bucket_dates.append(bucket)
+            bucket_index.append(len(bucket_dates) - 1)
+        columns = {}
+        for name, values in self.columns.items():
+            summed = [0] * len(bucket_dates)
+            for index, value in zip(bucket_index, values):
+                summed[index] += value
+            columns[name] = summed
+        return DateSeries(bucket_dates, columns)
+
+    def labels(self, date_format: str) -> list[str]:
+        return [value.strftime(date_format) for value in self.dates]
+
+    def iso_dates(self) -> list[str]:
+        return [value.isoformat() for value in self.dates]
@@ -0,0 +1,128 @@
+"""Keyset (cursor) pagination, newest first.
+
+Rows are ordered by ``field`` descending with NULLs last, then by ``id``
+descending. A page is fetched with a range condition on that key instead of
+an ``OFFSET``, so a deep page costs the same as the first one when an index
+on ``(field, id)`` (optionally behind equality filters) exists.
+
+Cursors are opaque strings of the form ``<value>~<id>``, with an empty value
+for NULL. A cursor that does not parse restarts at the first page.
+
+Declare the supporting index with ``KeysetIndex(fields=[..., "-field", "-id"])``
+so its column order matches the query's on every backend.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.db.models import F, Q
+
+
+CURSOR_SEPARATOR = "~"
+DEFAULT_COUNT_LIMIT = 1000
+
+
+@dataclass(frozen=True)
+class KeysetPage:
+    items: list
+    next_cursor: str = ""
+    previous_cursor: str = ""
+
+    @property
+    def has_next(self) -> bool:
+        return bool(self.next_cursor)
+
+    @property
+    def has_previous(self) -> bool:
+        return bool(self.previous_cursor)
+
+
+class KeysetIndex(models.Index):
+    """``models.Index`` whose descending nullable columns sort NULLs last.
+
+    ``keyset_paginate`` orders by ``field DESC NULLS LAST``. PostgreSQL only
+    uses an index for that order when the index says so (its ``DESC`` default
+    is ``NULLS FIRST``). SQLite already puts NULLs last in a descending index
+    and rejects an explicit ``NULLS LAST`` there, so the modifier is added on
+    PostgreSQL only.
+    """
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().create_sql(model, schema_editor, using=using, **kwargs)
+        index = self.clone()
+        index.fields_orders = [
+            (name, "DESC NULLS LAST" if order == "DESC" and model._meta.get_field(name).null else order)
+            for name, order in self.fields_orders
+        ]
+        return super(KeysetIndex, index).create_sql(model, schema_editor, using=using, **kwargs)
+
+
+def encode_cursor(value, pk) -> str:
+    text = "" if value is None else (value.isoformat() if hasattr(value, "isoformat") else str(value))
+    return f"{text}{CURSOR_SEPARATOR}{pk}"
+
+
+def decode_cursor(raw: str, model_field) -> tuple | None:
+    text, separator, pk = (raw or "").rpartition(CURSOR_SEPARATOR)
+    if not separator or not pk.isdigit():
+        return None
+    if not text:
+        return None, int(pk)
+    try:
+        value = model_field.to_python(text)
+    except ValidationError:
+        return None
+    return (value, int(pk)) if value is not None else None
+
+
+def _older_than(field: str, value, pk: int) -> Q:
+    if value is None:
+        return Q(**{f"{field}__isnull": True, "id__lt": pk})
+    return Q(**{f"{field}__lt": value}) | Q(**{field: value, "id__lt": pk}) | Q(**{f"{field}__isnull": True})
+
+
+def _newer_than(field: str, value, pk: int) -> Q:
+    if value is None:
+        return Q(**{f"{field}__isnull": False}) | Q(**{f"{field}__isnull": True, "id__gt": pk})
+    return Q(**{f"{field}__gt": value}) | Q(**{field: value, "id__gt": pk})
+
+
+def keyset_paginate(queryset, *, field: str, per_page: int, after: str = "", before: str = "") -> KeysetPage:
+    """Return the page following cursor ``after`` or preceding cursor ``before``."""
+    model_field = queryset.model._meta.get_field(field)
+    newest_first = (F(field).desc(nulls_last=True), F("id").desc())
+    oldest_first = (F(field).asc(nulls_first=True), F("id").asc())
+
+    before_key = decode_cursor(before, model_field) if before else None
+    if before_key is not None:
+        rows = list(queryset.filter(_newer_than(field, *before_key)).order_by(*oldest_first)[: per_page + 1])
+        has_previous = len(rows) > per_page
+        items = rows[:per_page][::-1]
+        has_next = True
+    else:
+        after_key = decode_cursor(after, model_field) if after else None
+        if after_key is not None:
+            queryset = queryset.filter(_older_than(field, *after_key))
+        rows = list(queryset.order_by(*newest_first)[: per_page + 1])
+        items = rows[:per_page]
+        has_previous = after_key is not None
+        has_next = len(rows) > per_page
+
+    if not items:
+        return KeysetPage(items=[])
+    first, last = items[0], items[-1]
+    return KeysetPage(
+        items=items,
+        next_cursor=encode_cursor(getattr(last, field), last.pk) if has_next else "",
+        previous_cursor=encode_cursor(getattr(first, field), first.pk) if has_previous else "",
+    )
+
+
+def bounded_count(queryset, *, limit: int = DEFAULT_COUNT_LIMIT) -> tuple[int, bool]:
+    """Count at most ``limit`` rows; return ``(count, has_more)``."""
+    counted = queryset.order_by()[: limit + 1].count()
+    return min(counted, limit), counted > limit
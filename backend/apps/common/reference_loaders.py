@@ -0,0 +1,104 @@
+"""Request-scoped reference lookups shared by selectors.
+
+Departments, rosters, department links, target metrics and saved periods are
+read by many selectors on the same page. These helpers go through
+``config.request_loader`` so each distinct key is queried once per request.
+Returned lists are fresh copies; the model instances are shared within the
+request and must be treated as read-only.
+"""
+
+from collections import defaultdict
+
+from apps.accounts.models import Department, Member, MemberDepartment
+from apps.targets.models import Period, TARGET_STATUS_PLANNED, TargetMetric
+from config.request_loader import get_loader, register_loader
+
+
+SAVED_PERIODS_KEY = "saved"
+
+
+@register_loader("active_department_by_id", models=(Department,))
+def _load_active_departments_by_id(department_ids):
+    return {department.id: department for department in Department.objects.filter(is_active=True, id__in=department_ids)}
+
+
+@register_loader("active_department_by_code", models=(Department,))
+def _load_active_departments_by_code(codes):
+    return {department.code: department for department in Department.objects.filter(is_active=True, code__in=codes)}
+
+
+@register_loader("department_roster", models=(Department, Member, MemberDepartment), default=())
+def _load_department_rosters(department_ids):
+    rosters = defaultdict(list)
+    links = (
+        MemberDepartment.objects.filter(department_id__in=department_ids, member__is_active=True)
+        .select_related("member")
+        .order_by("member__name", "member_id")
+    )
+    for link in links:
+        rosters[link.department_id].append(link.member)
+    return {department_id: tuple(members) for department_id, members in rosters.items()}
+
+
+@register_loader("member_department_ids", models=(MemberDepartment,), default=frozenset())
+def _load_member_department_ids(member_ids):
+    department_ids = defaultdict(set)
+    for member_id, department_id in MemberDepartment.objects.filter(member_id__in=member_ids).values_list(
+        "member_id", "department_id"
+    ):
+        department_ids[member_id].add(department_id)
+    return {member_id: frozenset(ids) for member_id, ids in department_ids.items()}
+
+
+@register_loader("active_target_metrics", models=(TargetMetric,), default=())
+def _load_active_target_metrics(department_ids):
+    metrics = defaultdict(list)
+    for metric in TargetMetric.objects.filter(department_id__in=department_ids, is_active=True).order_by(
+        "display_order", "id"
+    ):
+        metrics[metric.department_id].append(metric)
+    return {department_id: tuple(items) for department_id, items in metrics.items()}
+
+
+@register_loader("saved_periods", models=(Period,), default=())
+def _load_saved_periods(keys):
+    periods = tuple(Period.objects.exclude(status=TARGET_STATUS_PLANNED).order_by("-start_date", "-id"))
+    return {key: periods for key in keys}
+
+
+def active_department(department_id):
+    """Return the active department with ``department_id``, or ``None``."""
+    return get_loader("active_department_by_id").load(int(department_id))
+
+
+def active_departments_by_codes(codes) -> list:
+    """Return the active departments among ``codes``, ordered by code."""
+    departments = get_loader("active_department_by_code").load_many(codes).values()
+    return sorted((department for department in departments if department is not None), key=lambda item: item.code)
+
+
+def department_roster(department, *, prime=()) -> list:
+    """Return the active members linked to ``department``, ordered by name.
+
+    Departments in ``prime`` are fetched in the same query, for callers that
+    will ask for them next.
+    """
+    loader = get_loader("department_roster")
+    loader.prime_keys(getattr(item, "id", item) for item in prime)
+    return list(loader.load(getattr(department, "id", department)))
+
+
+def member_department_ids(member) -> frozenset:
+    return get_loader("member_department_ids").load(getattr(member, "id", member))
+
+
+def active_target_metrics(department, *, prime=()) -> list:
+    """Return the active target metrics of ``department`` in display order."""
+    loader = get_loader("active_target_metrics")
+    loader.prime_keys(getattr(item, "id", item) for item in prime)
+    return list(loader.load(getattr(department, "id", department)))
+
+
+def saved_periods() -> list:
+    """Return every period that is not planned, newest first."""
+    return list(get_loader("saved_periods").load(SAVED_PERIODS_KEY))
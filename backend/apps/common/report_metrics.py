@@ -1,3 +1,5 @@
+from django.db.models import Q, Sum
+
 from apps.reports.models import DailyDepartmentReportLine
 from apps.dairymetrics.models import MetricAdjustment
 
@@ -120,6 +122,76 @@ def _add_adjustment_totals(*, totals, start_date, end_date, target_codes) -> Non
         totals[code]["refugee_count"] += int(adjustment["refugee_count"] or 0)
 
 
+_LINE_TOTAL_FIELDS = {
+    "count": ("count",),
+    "amount": ("amount",),
+    "cs_count": ("cs_count",),
+    "refugee_count": ("refugee_count",),
+}
+_ADJUSTMENT_TOTAL_FIELDS = {
+    "count": ("result_count", "return_postal_count", "return_qr_count"),
+    "amount": ("support_amount", "return_postal_amount", "return_qr_amount"),
+    "cs_count": ("cs_count",),
+    "refugee_count": ("refugee_count",),
+}
+
+
+def _sum_ranges(queryset, *, code_field, date_field, ranges, fields_by_total, totals) -> None:
+    annotations = {}
+    for key, (start_date, end_date) in ranges.items():
+        in_range = Q(**{f"{date_field}__range": (start_date, end_date)})
+        for total_name, fields in fields_by_total.items():
+            for field in fields:
+                annotations[f"{key}_{total_name}_{field}"] = Sum(field, filter=in_range)
+    rows = queryset.values(code_field).order_by().annotate(**annotations)
+    for row in rows:
+        code = row[code_field]
+        for key in ranges:
+            for total_name, fields in fields_by_total.items():
+                totals[key][code][total_name] += sum(int(row[f"{key}_{total_name}_{field}"] or 0) for field in fields)
+
+
+def collect_actual_totals_for_ranges(*, ranges, target_codes, include_adjustments=False):
+    """Return ``collect_actual_totals`` for several date ranges at once.
+
+    ``ranges`` maps a key to ``(start_date, end_date)``; the result maps the
+    same keys to per-code totals. Report lines and adjustments are each summed
+    in one conditional-aggregation query spanning every range.
+    """
+    totals = {
+        key: {code: {"count": 0, "amount": 0, "cs_count": 0, "refugee_count": 0} for code in target_codes}
+        for key in ranges
+    }
+    if not ranges or not target_codes:
+        return totals
+    overall_start = min(start_date for start_date, _end_date in ranges.values())
+    overall_end = max(end_date for _start_date, end_date in ranges.values())
+    _sum_ranges(
+        DailyDepartmentReportLine.objects.filter(
+            report__report_date__range=(overall_start, overall_end),
+            report__department__code__in=target_codes,
+        ),
+        code_field="report__department__code",
+        date_field="report__report_date",
+        ranges=ranges,
+        fields_by_total=_LINE_TOTAL_FIELDS,
+        totals=totals,
+    )
+    if include_adjustments:
+        _sum_ranges(
+            MetricAdjustment.objects.filter(
+                target_date__range=(overall_start, overall_end),
+                department__code__in=target_codes,
+            ),
+            code_field="department__code",
+            date_field="target_date",
+            ranges=ranges,
+            fields_by_total=_ADJUSTMENT_TOTAL_FIELDS,
+            totals=totals,
+        )
+    return totals
+
+
 def collect_adjustment_totals(*, start_date, end_date, target_codes):
     totals = {
         code: {"count": 0, "amount": 0, "cs_count": 0, "refugee_count": 0}
@@ -1,16 +1,20 @@
 from apps.targets.models import Period, TARGET_STATUS_ACTIVE, TARGET_STATUS_FINISHED, TARGET_STATUS_PLANNED
+from config.request_loader import invalidate_loaders
 
 
 def sync_period_statuses(*, target_date):
-    Period.objects.filter(start_date__lte=target_date, end_date__gte=target_date).exclude(
+    updated = Period.objects.filter(start_date__lte=target_date, end_date__gte=target_date).exclude(
         status=TARGET_STATUS_ACTIVE
     ).update(status=TARGET_STATUS_ACTIVE)
-    Period.objects.filter(end_date__lt=target_date).exclude(status=TARGET_STATUS_FINISHED).update(
+    updated += Period.objects.filter(end_date__lt=target_date).exclude(status=TARGET_STATUS_FINISHED).update(
         status=TARGET_STATUS_FINISHED
     )
-    Period.objects.filter(start_date__gt=target_date).exclude(status=TARGET_STATUS_PLANNED).update(
+    updated += Period.objects.filter(start_date__gt=target_date).exclude(status=TARGET_STATUS_PLANNED).update(
         status=TARGET_STATUS_PLANNED
     )
+    if updated:
+        # ``update`` sends no signals; drop the request's cached period list explicitly.
+        invalidate_loaders("saved_periods")
 
 
 def current_active_period(*, target_date):
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+from collections import Counter
+from contextlib import contextmanager
+
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from apps.accounts.models import Department, Member, MemberDepartment
+from config.query_profiler import sql_fingerprint
 
 
 class AppTestMixin:
@@ -65,3 +71,36 @@ class AppTestMixin:
 
     def login(self, user) -> None:
         self.client.force_login(user)
+
+
+class QueryBudgetMixin:
+    """Assert upper bounds on query counts and that they do not grow with data size."""
+
+    def _repeated_query_report(self, captured_queries, *, limit: int = 5) -> str:
+        fingerprints = Counter(sql_fingerprint(query["sql"]) for query in captured_queries)
+        lines = [f"  {count}x {sql[:300]}" for sql, count in fingerprints.most_common(limit) if count > 1]
+        return "\n".join(lines) or "  (no repeated queries)"
+
+    @contextmanager
+    def assertQueryBudget(self, budget: int, *, label: str = ""):
+        with CaptureQueriesContext(connection) as context:
+            yield context
+        executed = len(context.captured_queries)
+        if executed > budget:
+            self.fail(
+                f"{label or 'block'} ran {executed} queries (budget {budget}). Most repeated:\n"
+                f"{self._repeated_query_report(context.captured_queries)}"
+            )
+
+    def count_get_queries(self, url: str) -> int:
+        # The first request warms per-process caches (content types, sessions) so
+        # only the view's own queries are counted.
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(context.captured_queries)
+
+    def assertQueryCountsDoNotScale(self, small: dict[str, int], large: dict[str, int]) -> None:
+        grown = {name: (small[name], large[name]) for name in small if large[name] > small[name]}
+        self.assertFalse(grown, f"query counts grew with the dataset (small, large): {grown}")
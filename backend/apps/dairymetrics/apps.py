@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class DairymetricsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.dairymetrics"
+
+    def ready(self):
+        from apps.dairymetrics.services.data_versions import connect_data_version_signals
+        from apps.dairymetrics.services.live_board import connect_live_board_signals
+        from apps.dairymetrics.services.memo_search import connect_memo_search_signals
+        from apps.dairymetrics.services.notification_counters import connect_notification_counter_signals
+
+        connect_data_version_signals()
+        connect_live_board_signals()
+        connect_memo_search_signals()
+        connect_notification_counter_signals()
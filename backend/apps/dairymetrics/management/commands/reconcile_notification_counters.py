@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.dairymetrics.services.notification_counters import reconcile_notification_counters
+
+
+class Command(BaseCommand):
+    help = "Recount unread notification counters from reactions and transactions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--member-id",
+            action="append",
+            type=int,
+            default=[],
+            help="Limit to this member id (repeatable). Default: every member with a counter.",
+        )
+
+    def handle(self, *args, **options):
+        checked, corrected = reconcile_notification_counters(member_ids=options["member_id"])
+        self.stdout.write(self.style.SUCCESS(f"notification counters checked={checked}, corrected={corrected}"))
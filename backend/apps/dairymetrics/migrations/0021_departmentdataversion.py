@@ -0,0 +1,34 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0012_member_un_activity_code"),
+        ("dairymetrics", "0020_membermetrictransactionnotificationstate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DepartmentDataVersion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("version", models.PositiveBigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "department",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="data_version",
+                        to="accounts.department",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "部署データ版数",
+                "verbose_name_plural": "部署データ版数",
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0012_member_un_activity_code"),
+        ("dairymetrics", "0021_departmentdataversion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MemberNotificationCounter",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("transaction_reaction", "決済スタンプ"), ("today_transaction", "本日の新規決済")],
+                        max_length=32,
+                    ),
+                ),
+                ("unread_count", models.PositiveIntegerField(default=0)),
+                ("previews", models.JSONField(blank=True, default=list)),
+                ("counted_on", models.DateField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "member",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="notification_counters",
+                        to="accounts.member",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "通知カウンター",
+                "verbose_name_plural": "通知カウンター",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("member", "kind"), name="unique_member_notification_counter_kind"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,145 @@
+import logging
+
+from django.db import migrations, transaction
+
+
+logger = logging.getLogger(__name__)
+
+
+ENTRY_TABLE = "dairymetrics_memberdailymetricentry"
+SEARCH_TABLE = "dairymetrics_entry_memo_search"
+DOCUMENT = "{entry}.memo || char(10) || {entry}.location_name || char(10) || m.name || char(10) || d.code"
+
+SQLITE_FORWARD = [
+    f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(document, tokenize='trigram')",
+    f"""
+    CREATE TRIGGER {SEARCH_TABLE}_entry_insert AFTER INSERT ON {ENTRY_TABLE} WHEN new.memo <> '' BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, document)
+        SELECT new.id, {DOCUMENT.format(entry="new")}
+        FROM accounts_member m, accounts_department d
+        WHERE m.id = new.member_id AND d.id = new.department_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER {SEARCH_TABLE}_entry_update AFTER UPDATE OF memo, location_name, member_id, department_id
+    ON {ENTRY_TABLE} BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id;
+        INSERT INTO {SEARCH_TABLE}(rowid, document)
+        SELECT new.id, {DOCUMENT.format(entry="new")}
+        FROM accounts_member m, accounts_department d
+        WHERE new.memo <> '' AND m.id = new.member_id AND d.id = new.department_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER {SEARCH_TABLE}_entry_delete AFTER DELETE ON {ENTRY_TABLE} BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER {SEARCH_TABLE}_member_update AFTER UPDATE OF name ON accounts_member BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid IN (SELECT id FROM {ENTRY_TABLE} WHERE member_id = new.id);
+        INSERT INTO {SEARCH_TABLE}(rowid, document)
+        SELECT e.id, {DOCUMENT.format(entry="e")}
+        FROM {ENTRY_TABLE} e JOIN accounts_member m ON m.id = e.member_id JOIN accounts_department d ON d.id = e.department_id
+        WHERE e.member_id = new.id AND e.memo <> '';
+    END
+    """,
+    f"""
+    CREATE TRIGGER {SEARCH_TABLE}_department_update AFTER UPDATE OF code ON accounts_department BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid IN (SELECT id FROM {ENTRY_TABLE} WHERE department_id = new.id);
+        INSERT INTO {SEARCH_TABLE}(rowid, document)
+        SELECT e.id, {DOCUMENT.format(entry="e")}
+        FROM {ENTRY_TABLE} e JOIN accounts_member m ON m.id = e.member_id JOIN accounts_department d ON d.id = e.department_id
+        WHERE e.department_id = new.id AND e.memo <> '';
+    END
+    """,
+    f"""
+    INSERT INTO {SEARCH_TABLE}(rowid, document)
+    SELECT e.id, {DOCUMENT.format(entry="e")}
+    FROM {ENTRY_TABLE} e JOIN accounts_member m ON m.id = e.member_id JOIN accounts_department d ON d.id = e.department_id
+    WHERE e.memo <> ''
+    """,
+]
+SQLITE_REVERSE = [
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_department_update",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_member_update",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_entry_delete",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_entry_update",
+    f"DROP TRIGGER IF EXISTS {SEARCH_TABLE}_entry_insert",
+    f"DROP TABLE IF EXISTS {SEARCH_TABLE}",
+]
+
+# ``icontains`` compiles to ``UPPER(column) LIKE UPPER(%s)``; the indexes cover that expression.
+POSTGRESQL_FORWARD = [
+    f"CREATE INDEX IF NOT EXISTS dm_entry_memo_trgm ON {ENTRY_TABLE} USING gin (UPPER(memo) gin_trgm_ops)",
+    f"CREATE INDEX IF NOT EXISTS dm_entry_location_trgm ON {ENTRY_TABLE} USING gin (UPPER(location_name) gin_trgm_ops)",
+]
+POSTGRESQL_REVERSE = [
+    "DROP INDEX IF EXISTS dm_entry_location_trgm",
+    "DROP INDEX IF EXISTS dm_entry_memo_trgm",
+]
+
+
+def _sqlite_supports_trigram_fts(cursor) -> bool:
+    try:
+        cursor.execute("CREATE VIRTUAL TABLE temp.dm_fts_probe USING fts5(document, tokenize='trigram')")
+    except Exception:
+        return False
+    cursor.execute("DROP TABLE temp.dm_fts_probe")
+    return True
+
+
+def _postgresql_has_pg_trgm(connection, cursor) -> bool:
+    cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    if cursor.fetchone():
+        return True
+    cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    if not cursor.fetchone():
+        return False
+    # Creating an extension needs privileges the app user may lack; a failure
+    # must not abort the rest of the migration.
+    try:
+        with transaction.atomic(using=connection.alias):
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    except Exception:
+        return False
+    return True
+
+
+def create_memo_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            # FTS5 trigram needs SQLite 3.34+; without it the search falls back to LIKE.
+            statements = SQLITE_FORWARD if _sqlite_supports_trigram_fts(cursor) else []
+        elif connection.vendor == "postgresql":
+            if _postgresql_has_pg_trgm(connection, cursor):
+                statements = POSTGRESQL_FORWARD
+            else:
+                # Searches still work through unindexed icontains lookups.
+                logger.warning("memo_search pg_trgm_unavailable indexes=skipped")
+                statements = []
+        else:
+            statements = []
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def drop_memo_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    statements = {"sqlite": SQLITE_REVERSE, "postgresql": POSTGRESQL_REVERSE}.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0012_member_un_activity_code"),
+        ("dairymetrics", "0022_membernotificationcounter"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_memo_search_index, drop_memo_search_index),
+    ]
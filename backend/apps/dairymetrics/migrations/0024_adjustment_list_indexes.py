@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dairymetrics", "0023_memberdailymetricentry_memo_search"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="metricadjustment",
+            index=models.Index(fields=["target_date", "created_at", "id"], name="metric_adj_list_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="metricadjustment",
+            index=models.Index(
+                fields=["department", "target_date", "created_at", "id"],
+                name="metric_adj_dept_list_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="wvmetriccancellation",
+            index=models.Index(fields=["target_date", "created_at", "id"], name="wv_cancel_list_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="wvmetriccancellation",
+            index=models.Index(
+                fields=["department", "target_date", "created_at", "id"],
+                name="wv_cancel_dept_list_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("dairymetrics", "0024_adjustment_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="memberdailymetricentry",
+            index=models.Index(fields=["department", "entry_date"], name="metric_entry_dept_date_idx"),
+        ),
+    ]
@@ -46,6 +46,9 @@ class MemberDailyMetricEntry(models.Model):
                 name="unique_member_department_entry_date",
             )
         ]
+        indexes = [
+            models.Index(fields=["department", "entry_date"], name="metric_entry_dept_date_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.member.name} {self.department.code} {self.entry_date}"
@@ -574,6 +577,10 @@ class MetricAdjustment(models.Model):
 
     class Meta:
         ordering = ["-target_date", "-created_at"]
+        indexes = [
+            models.Index(fields=["target_date", "created_at", "id"], name="metric_adj_list_idx"),
+            models.Index(fields=["department", "target_date", "created_at", "id"], name="metric_adj_dept_list_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.member.name} {self.department.code} {self.target_date} {self.source_type}"
@@ -619,6 +626,10 @@ class WVMetricCancellation(models.Model):
 
     class Meta:
         ordering = ["-target_date", "-created_at"]
+        indexes = [
+            models.Index(fields=["target_date", "created_at", "id"], name="wv_cancel_list_idx"),
+            models.Index(fields=["department", "target_date", "created_at", "id"], name="wv_cancel_dept_list_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.member.name} WV cancel {self.target_date} {self.get_wv_result_type_display()}"
@@ -714,3 +725,54 @@ class MemberMonthMetricTarget(models.Model):
 
     def __str__(self) -> str:
         return f"{self.member.name} {self.department.code} {self.target_month:%Y-%m}"
+
+
+class DepartmentDataVersion(models.Model):
+    department = models.OneToOneField(
+        Department,
+        on_delete=models.CASCADE,
+        related_name="data_version",
+    )
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = "部署データ版数"
+        verbose_name_plural = "部署データ版数"
+
+    def __str__(self) -> str:
+        return f"{self.department.code} v{self.version}"
+
+
+class MemberNotificationCounter(models.Model):
+    KIND_TRANSACTION_REACTION = "transaction_reaction"
+    KIND_TODAY_TRANSACTION = "today_transaction"
+    KIND_CHOICES = [
+        (KIND_TRANSACTION_REACTION, "決済スタンプ"),
+        (KIND_TODAY_TRANSACTION, "本日の新規決済"),
+    ]
+    PREVIEW_LIMIT = 5
+
+    member = models.ForeignKey(
+        Member,
+        on_delete=models.CASCADE,
+        related_name="notification_counters",
+    )
+    kind = models.CharField(max_length=32, choices=KIND_CHOICES)
+    unread_count = models.PositiveIntegerField(default=0)
+    previews = models.JSONField(default=list, blank=True)
+    counted_on = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "通知カウンター"
+        verbose_name_plural = "通知カウンター"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["member", "kind"],
+                name="unique_member_notification_counter_kind",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.member.name} {self.get_kind_display()} {self.unread_count}"
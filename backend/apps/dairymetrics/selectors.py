@@ -5,8 +5,12 @@ from django.db.models import Sum
 from django.utils import timezone
 
 from apps.accounts.models import Department, Member
+from apps.common.date_series import DateSeries, column_sum, dense_dates, height_column
+from apps.common.reference_loaders import active_departments_by_codes, department_roster, saved_periods
 from apps.common.target_periods import current_active_period
 from apps.targets.models import Period, TARGET_STATUS_PLANNED
+from config.db_router import replica_reads
+from config.query_profiler import profiled
 
 from .models import (
     MemberDailyMetricEntry,
@@ -15,7 +19,6 @@ from .models import (
     MetricAdjustment,
 )
 from .services.final_actuals import (
-    ADJUSTMENT_METRIC_FIELDS,
     ENTRY_METRIC_FIELDS,
     aggregate_adjustment_totals,
     aggregate_entry_box_totals,
@@ -23,6 +26,7 @@ from .services.final_actuals import (
     merge_final_actual_totals,
     zero_final_actual_totals,
 )
+from .services.month_grid import build_month_grids
 
 RANKING_METRIC_SPECS = [
     {"key": "count_value", "label": "件数", "icon": "fa-check-to-slot"},
@@ -526,6 +530,7 @@ def _member_to_member_metric_specs(department):
     return specs
 
 
+@replica_reads
 def build_member_to_member_comparison(
     base_member,
     target_member,
@@ -716,6 +721,7 @@ def _build_admin_scope_ranking_metrics(department, start_date, end_date, *, toda
     return metrics
 
 
+@replica_reads
 def build_admin_ranking_overview(*, department_code="", scope="today", start_date=None, end_date=None, today=None):
     today_value = today or date.today()
     departments = list(Department.objects.filter(is_active=True, member_links__member__is_active=True).distinct().order_by("code"))
@@ -855,11 +861,11 @@ def _team_averages(rankings):
 
 
 def _normalize_trend_items(trend):
-    max_count = max((item["count_value"] for item in trend), default=0) or 1
-    max_amount = max((item["amount_value"] for item in trend), default=0) or 1
-    for item in trend:
-        item["count_height"] = max(14, round((item["count_value"] / max_count) * 100)) if item["count_value"] else 12
-        item["amount_height"] = max(14, round((item["amount_value"] / max_amount) * 100)) if item["amount_value"] else 12
+    count_heights = height_column([item["count_value"] for item in trend])
+    amount_heights = height_column([item["amount_value"] for item in trend])
+    for item, count_height, amount_height in zip(trend, count_heights, amount_heights):
+        item["count_height"] = count_height
+        item["amount_height"] = amount_height
     return trend
 
 
@@ -870,31 +876,23 @@ def _build_daily_trend(member, department, *, end_date):
         department=department,
         entry_date__range=(start_date, end_date),
     )
-    entry_map = {
-        row["entry_date"]: row
-        for row in entries.values("entry_date").annotate(
-            approach_count=Sum("approach_count"),
-            communication_count=Sum("communication_count"),
-            result_count=Sum("result_count"),
-            support_amount=Sum("support_amount"),
-            cs_count=Sum("cs_count"),
-            refugee_count=Sum("refugee_count"),
-        )
-    }
-    trend = []
-    for offset in range(7):
-        current_day = start_date + timedelta(days=offset)
-        totals = _zero_totals()
-        if current_day in entry_map:
-            for field in ENTRY_METRIC_FIELDS:
-                totals[field] += int(entry_map[current_day].get(field) or 0)
-        trend.append(
-            {
-                "label": current_day.strftime("%-m/%-d"),
-                "count_value": _count_value_for_department(department, totals),
-                "amount_value": int(totals["support_amount"]),
-            }
+    series = DateSeries(dense_dates(start_date, end_date)).load_rows(
+        entries.values("entry_date").annotate(**{field: Sum(field) for field in ENTRY_METRIC_FIELDS}),
+        date_key="entry_date",
+        fields={field: field for field in ENTRY_METRIC_FIELDS},
+    )
+    if department.code == "WV":
+        count_values = column_sum(series.column("cs_count"), series.column("refugee_count"))
+    else:
+        count_values = series.column("result_count")
+    trend = [
+        {"label": label, "count_value": count_value, "amount_value": amount_value}
+        for label, count_value, amount_value in zip(
+            series.labels("%-m/%-d"),
+            count_values,
+            series.column("support_amount"),
         )
+    ]
     return _normalize_trend_items(trend)
 
 
@@ -1004,6 +1002,7 @@ def _build_best_records(member, department, start_date, end_date, *, include_ret
     }
 
 
+@profiled("member_dashboard_card")
 def build_member_dashboard_card(
     member,
     department,
@@ -1032,9 +1031,7 @@ def build_member_dashboard_card(
     include_returns = scope_data["scope"] != "today"
     include_adjustments = scope_data["scope"] != "today"
     previous_start, previous_end = _previous_range(start_date, end_date)
-    department_members = list(
-        Member.objects.active().filter(department_links__department=department).distinct().order_by("name")
-    )
+    department_members = department_roster(department)
     today_entry = MemberDailyMetricEntry.objects.filter(
         member=member,
         department=department,
@@ -1092,7 +1089,7 @@ def build_member_dashboard_card(
             "id": period.id,
             "label": f"{period.start_date.strftime('%Y/%m/%d')} - {period.end_date.strftime('%Y/%m/%d')}",
         }
-        for period in Period.objects.exclude(status=TARGET_STATUS_PLANNED).order_by("-start_date", "-id")
+        for period in saved_periods()
     ]
     return {
         "department": department,
@@ -1178,6 +1175,7 @@ def build_member_dashboard_card(
     }
 
 
+@profiled("member_dashboard")
 def build_member_dashboard(member, *, today=None, department_code=None, scope="today", start_date=None, end_date=None, period_id=None):
     today = today or date.today()
     departments = list(
@@ -1286,7 +1284,7 @@ def build_member_daily_overview(member, *, department_code="", today=None):
     active_count = 0
     closed_count = 0
 
-    members = Member.objects.active().filter(department_links__department=selected_department).distinct().order_by("name")
+    members = department_roster(selected_department)
     for department_member in members:
         today_entry = (
             MemberDailyMetricEntry.objects.filter(
@@ -1354,98 +1352,38 @@ def build_member_daily_overview(member, *, department_code="", today=None):
     }
 
 
-def build_member_month_overview(member, *, target_month, department_code="", today=None):
-    today_value = today or date.today()
-    departments = list(
-        Department.objects.filter(is_active=True, member_links__member=member).distinct().order_by("code")
-    )
-    month_start = target_month.replace(day=1)
-    month_end = target_month.replace(day=monthrange(target_month.year, target_month.month)[1])
-    month_days = [
-        {
-            "date": month_start + timedelta(days=offset),
-            "day": month_start.day + offset,
-            "weekday_label": "月火水木金土日"[(month_start + timedelta(days=offset)).weekday()],
-        }
-        for offset in range((month_end - month_start).days + 1)
+def _month_day_cells(*, field, values, month_days, editable=True):
+    return [
+        _field_cell(field=field, value=value, entry_date=month_day["date"], editable=editable, is_empty=value == 0)
+        for month_day, value in zip(month_days, values)
     ]
-    if not departments:
-        return {
-            "departments": [],
-            "selected_department": None,
-            "month_days": month_days,
-            "field_rows": [],
-            "adjustment_rows": [],
-        }
 
-    default_department_code = _default_department_code_for_member(member, departments)
-    selected_department = next(
-        (department for department in departments if department.code == (department_code or default_department_code)),
-        departments[0],
-    )
-    month_entries = list(
-        MemberDailyMetricEntry.objects.filter(
-            member=member,
-            department=selected_department,
-            entry_date__range=(month_start, month_end),
-        )
-    )
-    month_adjustments = list(
-        MetricAdjustment.objects.filter(
-            member=member,
-            department=selected_department,
-            target_date__range=(month_start, month_end),
+
+def _month_location_cells(*, locations, month_days, editable=True):
+    return [
+        _field_cell(
+            field="location_name",
+            value=" / ".join(day_locations) or "-",
+            entry_date=month_day["date"],
+            editable=editable,
+            is_empty=not day_locations,
         )
-    )
+        for month_day, day_locations in zip(month_days, locations)
+    ]
 
-    entry_daily_totals_by_date = {}
-    adjustment_daily_totals_by_date = {}
-    location_names_by_date = {}
-    adjustment_location_names_by_date = {}
-    entry_totals = _zero_totals()
-    adjustment_totals = _zero_totals()
 
-    for entry in month_entries:
-        day_totals = entry_daily_totals_by_date.setdefault(entry.entry_date, _zero_totals())
-        for field in ENTRY_METRIC_FIELDS:
-            value = int(getattr(entry, field, 0) or 0)
-            day_totals[field] += value
-            entry_totals[field] += value
-        normalized_name = (entry.location_name or "").strip()
-        if normalized_name:
-            location_names_by_date.setdefault(entry.entry_date, [])
-            if normalized_name not in location_names_by_date[entry.entry_date]:
-                location_names_by_date[entry.entry_date].append(normalized_name)
-
-    for adjustment in month_adjustments:
-        day_totals = adjustment_daily_totals_by_date.setdefault(adjustment.target_date, _zero_totals())
-        for field in ADJUSTMENT_METRIC_FIELDS:
-            value = int(getattr(adjustment, field, 0) or 0)
-            day_totals[field] += value
-            adjustment_totals[field] += value
-        normalized_name = (adjustment.location_name or "").strip()
-        if normalized_name:
-            adjustment_location_names_by_date.setdefault(adjustment.target_date, [])
-            if normalized_name not in adjustment_location_names_by_date[adjustment.target_date]:
-                adjustment_location_names_by_date[adjustment.target_date].append(normalized_name)
-
-    field_active_day_count = sum(
-        1
-        for month_day in month_days
-        if any(int(entry_daily_totals_by_date.get(month_day["date"], {}).get(field) or 0) > 0 for field in ENTRY_METRIC_FIELDS)
-        or bool(location_names_by_date.get(month_day["date"]))
-    )
-    adjustment_active_day_count = sum(
-        1
-        for month_day in month_days
-        if any(int(adjustment_daily_totals_by_date.get(month_day["date"], {}).get(field) or 0) > 0 for field in ADJUSTMENT_METRIC_FIELDS)
-    )
+def _month_average(total, active_day_count):
+    return round(total / active_day_count, 1) if active_day_count else "-"
+
 
+def _month_field_metric_rows(*, department, grid, month_days, count_field, editable):
+    entry_totals = grid.entry_totals()
+    field_active_day_count = grid.field_active_day_count()
     field_metric_specs = [
         {"label": "AP", "field": "approach_count"},
         {"label": "CM", "field": "communication_count"},
     ]
-    if selected_department.code == "WV":
+    if department.code == "WV":
         field_metric_specs.extend(
             [
                 {"label": "CS", "field": "cs_count"},
@@ -1453,68 +1391,44 @@ def build_member_month_overview(member, *, target_month, department_code="", tod
             ]
         )
     else:
-        field_metric_specs.append({"label": _count_label_for_department(selected_department), "field": "count_value"})
+        field_metric_specs.append({"label": _count_label_for_department(department), "field": count_field})
     field_metric_specs.append({"label": "金額", "field": "support_amount"})
 
     field_metric_rows = []
     for spec in field_metric_specs:
         field = spec["field"]
         if field == "count_value":
-            monthly_total = _count_value_for_department(selected_department, entry_totals, include_returns=False)
-            monthly_average = round(monthly_total / field_active_day_count, 1) if field_active_day_count else "-"
-            cells = []
-            for month_day in month_days:
-                count_value = _count_value_for_department(
-                    selected_department,
-                    entry_daily_totals_by_date.get(month_day["date"], _zero_totals()),
-                    include_returns=False,
-                )
-                cells.append(_field_cell(field=field, value=count_value, entry_date=month_day["date"], editable=False, is_empty=count_value == 0))
-        elif field == "support_amount":
-            monthly_total = _display_amount_value(entry_totals, include_returns=False)
-            monthly_average = round(monthly_total / field_active_day_count, 1) if field_active_day_count else "-"
-            cells = []
-            for month_day in month_days:
-                amount_value = _display_amount_value(entry_daily_totals_by_date.get(month_day["date"], _zero_totals()), include_returns=False)
-                cells.append(_field_cell(field=field, value=amount_value, entry_date=month_day["date"], editable=False, is_empty=amount_value == 0))
+            monthly_total = _count_value_for_department(department, entry_totals, include_returns=False)
+            values = grid.entry_columns["result_count"]
         else:
             monthly_total = int(entry_totals[field])
-            monthly_average = round(int(entry_totals[field]) / field_active_day_count, 1) if field_active_day_count else "-"
-            cells = []
-            for month_day in month_days:
-                cell_value = int(entry_daily_totals_by_date.get(month_day["date"], {}).get(field) or 0)
-                cells.append(_field_cell(field=field, value=cell_value, entry_date=month_day["date"], editable=False, is_empty=cell_value == 0))
+            values = grid.entry_columns[field]
         field_metric_rows.append(
             {
                 "label": spec["label"],
                 "field": field,
-                "editable": False,
+                "editable": editable,
                 "monthly_total": monthly_total,
-                "monthly_average": monthly_average,
-                "cells": cells,
+                "monthly_average": _month_average(monthly_total, field_active_day_count),
+                "cells": _month_day_cells(field=field, values=values, month_days=month_days, editable=editable),
             }
         )
-
     field_metric_rows.append(
         {
             "label": "現場",
             "field": "location_name",
-            "editable": False,
+            "editable": editable,
             "monthly_total": "",
             "monthly_average": f"{field_active_day_count}日" if field_active_day_count else "-",
-            "cells": [
-                _field_cell(
-                    field="location_name",
-                    value=" / ".join(location_names_by_date.get(month_day["date"], [])) or "-",
-                    entry_date=month_day["date"],
-                    editable=False,
-                    is_empty=not location_names_by_date.get(month_day["date"]),
-                )
-                for month_day in month_days
-            ],
+            "cells": _month_location_cells(locations=grid.entry_locations, month_days=month_days, editable=editable),
         }
     )
+    return field_metric_rows
+
 
+def _month_adjustment_metric_rows(*, grid, month_days, editable):
+    adjustment_totals = grid.adjustment_totals()
+    adjustment_active_day_count = grid.adjustment_active_day_count()
     adjustment_metric_specs = [
         {"label": "郵送件数", "field": "return_postal_count"},
         {"label": "郵送金額", "field": "return_postal_amount"},
@@ -1525,59 +1439,35 @@ def build_member_month_overview(member, *, target_month, department_code="", tod
     for spec in adjustment_metric_specs:
         field = spec["field"]
         monthly_total = int(adjustment_totals[field])
-        monthly_average = round(int(adjustment_totals[field]) / adjustment_active_day_count, 1) if adjustment_active_day_count else "-"
-        cells = [
-            _field_cell(
-                field=field,
-                value=int(adjustment_daily_totals_by_date.get(month_day["date"], {}).get(field) or 0),
-                entry_date=month_day["date"],
-                editable=False,
-                is_empty=int(adjustment_daily_totals_by_date.get(month_day["date"], {}).get(field) or 0) == 0,
-            )
-            for month_day in month_days
-        ]
         adjustment_metric_rows.append(
             {
                 "label": spec["label"],
                 "field": field,
-                "editable": False,
+                "editable": editable,
                 "monthly_total": monthly_total,
-                "monthly_average": monthly_average,
-                "cells": cells,
+                "monthly_average": _month_average(monthly_total, adjustment_active_day_count),
+                "cells": _month_day_cells(
+                    field=field,
+                    values=grid.adjustment_columns[field],
+                    month_days=month_days,
+                    editable=editable,
+                ),
             }
         )
     adjustment_metric_rows.append(
         {
             "label": "現場",
             "field": "location_name",
-            "editable": False,
+            "editable": editable,
             "monthly_total": "",
             "monthly_average": f"{adjustment_active_day_count}日" if adjustment_active_day_count else "-",
-            "cells": [
-                _field_cell(
-                    field="location_name",
-                    value=" / ".join(adjustment_location_names_by_date.get(month_day["date"], [])) or "-",
-                    entry_date=month_day["date"],
-                    editable=False,
-                    is_empty=not adjustment_location_names_by_date.get(month_day["date"]),
-                )
-                for month_day in month_days
-            ],
+            "cells": _month_location_cells(locations=grid.adjustment_locations, month_days=month_days, editable=editable),
         }
     )
-
-    return {
-        "departments": departments,
-        "selected_department": selected_department,
-        "month_days": month_days,
-        "field_rows": [{"department": selected_department, "member": member, "metric_rows": field_metric_rows}],
-        "adjustment_rows": [{"department": selected_department, "member": member, "metric_rows": adjustment_metric_rows}],
-    }
+    return adjustment_metric_rows
 
 
-def build_admin_month_overview(*, target_month, department_code="", sort_key="activity_days", today=None):
-    today_value = today or date.today()
-    departments = list(Department.objects.filter(is_active=True, code__in=["UN", "WV"]).order_by("code"))
+def _month_days_for(target_month):
     month_start = target_month.replace(day=1)
     month_end = target_month.replace(day=monthrange(target_month.year, target_month.month)[1])
     month_days = [
@@ -1588,6 +1478,59 @@ def build_admin_month_overview(*, target_month, department_code="", sort_key="ac
         }
         for offset in range((month_end - month_start).days + 1)
     ]
+    return month_start, month_end, month_days
+
+
+@replica_reads
+def build_member_month_overview(member, *, target_month, department_code="", today=None):
+    departments = list(
+        Department.objects.filter(is_active=True, member_links__member=member).distinct().order_by("code")
+    )
+    month_start, month_end, month_days = _month_days_for(target_month)
+    if not departments:
+        return {
+            "departments": [],
+            "selected_department": None,
+            "month_days": month_days,
+            "field_rows": [],
+            "adjustment_rows": [],
+        }
+
+    default_department_code = _default_department_code_for_member(member, departments)
+    selected_department = next(
+        (department for department in departments if department.code == (department_code or default_department_code)),
+        departments[0],
+    )
+    grid = build_month_grids(
+        member_ids=[member.id],
+        department=selected_department,
+        month_start=month_start,
+        month_end=month_end,
+    )[member.id]
+
+    field_metric_rows = _month_field_metric_rows(
+        department=selected_department,
+        grid=grid,
+        month_days=month_days,
+        count_field="count_value",
+        editable=False,
+    )
+    adjustment_metric_rows = _month_adjustment_metric_rows(grid=grid, month_days=month_days, editable=False)
+    return {
+        "departments": departments,
+        "selected_department": selected_department,
+        "month_days": month_days,
+        "field_rows": [{"department": selected_department, "member": member, "metric_rows": field_metric_rows}],
+        "adjustment_rows": [{"department": selected_department, "member": member, "metric_rows": adjustment_metric_rows}],
+    }
+
+
+@replica_reads
+@profiled("admin_month_overview")
+def build_admin_month_overview(*, target_month, department_code="", sort_key="activity_days", today=None):
+    today_value = today or date.today()
+    departments = active_departments_by_codes(["UN", "WV"])
+    month_start, month_end, month_days = _month_days_for(target_month)
     selected_department = None
     if department_code:
         selected_department = next((department for department in departments if department.code == department_code), None)
@@ -1603,236 +1546,48 @@ def build_admin_month_overview(*, target_month, department_code="", sort_key="ac
         if selected_department and department.id != selected_department.id:
             continue
 
-        members = Member.objects.active().filter(department_links__department=department).distinct().order_by("name")
-        member_ids = list(members.values_list("id", flat=True))
-        month_entries = list(
-            MemberDailyMetricEntry.objects.filter(
-                member_id__in=member_ids,
-                department=department,
-                entry_date__range=(month_start, month_end),
-            ).select_related("member")
-        )
-        month_adjustments = list(
-            MetricAdjustment.objects.filter(
-                member_id__in=member_ids,
-                department=department,
-                target_date__range=(month_start, month_end),
-            ).select_related("member")
+        members = department_roster(department)
+        grids = build_month_grids(
+            member_ids=[member.id for member in members],
+            department=department,
+            month_start=month_start,
+            month_end=month_end,
+            today=today_value,
         )
-        entry_daily_totals_by_member = {}
-        adjustment_daily_totals_by_member = {}
-        location_names_by_member = {}
-        adjustment_location_names_by_member = {}
-        entry_monthly_totals_by_member = {member_id: _zero_totals() for member_id in member_ids}
-        adjustment_monthly_totals_by_member = {member_id: _zero_totals() for member_id in member_ids}
-        today_entries_by_member = {}
-
-        for entry in month_entries:
-            key = (entry.member_id, entry.entry_date)
-            day_totals = entry_daily_totals_by_member.setdefault(key, _zero_totals())
-            for field in ENTRY_METRIC_FIELDS:
-                value = int(getattr(entry, field, 0) or 0)
-                day_totals[field] += value
-                entry_monthly_totals_by_member[entry.member_id][field] += value
-            if entry.entry_date == today_value:
-                current = today_entries_by_member.get(entry.member_id)
-                if current is None or entry.updated_at > current.updated_at:
-                    today_entries_by_member[entry.member_id] = entry
-            normalized_name = (entry.location_name or "").strip()
-            if normalized_name:
-                location_names_by_member.setdefault(entry.member_id, {}).setdefault(entry.entry_date, [])
-                if normalized_name not in location_names_by_member[entry.member_id][entry.entry_date]:
-                    location_names_by_member[entry.member_id][entry.entry_date].append(normalized_name)
-
-        for adjustment in month_adjustments:
-            key = (adjustment.member_id, adjustment.target_date)
-            day_totals = adjustment_daily_totals_by_member.setdefault(key, _zero_totals())
-            for field in ADJUSTMENT_METRIC_FIELDS:
-                value = int(getattr(adjustment, field, 0) or 0)
-                day_totals[field] += value
-                adjustment_monthly_totals_by_member[adjustment.member_id][field] += value
-            normalized_name = (adjustment.location_name or "").strip()
-            if normalized_name:
-                adjustment_location_names_by_member.setdefault(adjustment.member_id, {}).setdefault(adjustment.target_date, [])
-                if normalized_name not in adjustment_location_names_by_member[adjustment.member_id][adjustment.target_date]:
-                    adjustment_location_names_by_member[adjustment.member_id][adjustment.target_date].append(normalized_name)
 
         for member in members:
-            today_entry = today_entries_by_member.get(member.id)
-            if today_entry:
-                if today_entry.activity_closed:
+            grid = grids[member.id]
+            if grid.today_entry:
+                if grid.today_entry["activity_closed"]:
                     closed_today_members.append(member)
-                    activity_status = "活動終了"
                 else:
                     active_today_members.append(member)
-                    activity_status = "活動中"
-            else:
-                activity_status = "未入力"
-
-            member_locations = location_names_by_member.get(member.id, {})
-            adjustment_member_locations = adjustment_location_names_by_member.get(member.id, {})
-            entry_totals = entry_monthly_totals_by_member.get(member.id, _zero_totals())
-            adjustment_totals = adjustment_monthly_totals_by_member.get(member.id, _zero_totals())
-
-            field_active_day_count = sum(
-                1
-                for month_day in month_days
-                if any(int(entry_daily_totals_by_member.get((member.id, month_day["date"]), {}).get(field) or 0) > 0 for field in ENTRY_METRIC_FIELDS)
-                or bool(member_locations.get(month_day["date"]))
-            )
-            adjustment_active_day_count = sum(
-                1
-                for month_day in month_days
-                if any(
-                    int(adjustment_daily_totals_by_member.get((member.id, month_day["date"]), {}).get(field) or 0) > 0
-                    for field in ADJUSTMENT_METRIC_FIELDS
-                )
-            )
 
-            field_metric_specs = [
-                {"label": "AP", "field": "approach_count"},
-                {"label": "CM", "field": "communication_count"},
-            ]
-            if department.code == "WV":
-                field_metric_specs.extend(
-                    [
-                        {"label": "CS", "field": "cs_count"},
-                        {"label": "難民", "field": "refugee_count"},
-                    ]
-                )
-            else:
-                field_metric_specs.append({"label": _count_label_for_department(department), "field": "result_count"})
-            field_metric_specs.append({"label": "金額", "field": "support_amount"})
-
-            field_metric_rows = []
-            for spec in field_metric_specs:
-                field = spec["field"]
-                if field == "support_amount":
-                    monthly_total = _display_amount_value(entry_totals, include_returns=False)
-                    monthly_average = round(monthly_total / field_active_day_count, 1) if field_active_day_count else "-"
-                    cells = []
-                    for month_day in month_days:
-                        amount_value = _display_amount_value(
-                            entry_daily_totals_by_member.get((member.id, month_day["date"]), _zero_totals()),
-                            include_returns=False,
-                        )
-                        cells.append(
-                            _field_cell(
-                                field=field,
-                                value=amount_value,
-                                entry_date=month_day["date"],
-                                is_empty=amount_value == 0,
-                            )
-                        )
-                else:
-                    monthly_total = int(entry_totals[field])
-                    monthly_average = round(int(entry_totals[field]) / field_active_day_count, 1) if field_active_day_count else "-"
-                    cells = []
-                    for month_day in month_days:
-                        cell_value = int(entry_daily_totals_by_member.get((member.id, month_day["date"]), {}).get(field) or 0)
-                        cells.append(
-                            _field_cell(
-                                field=field,
-                                value=cell_value,
-                                entry_date=month_day["date"],
-                                is_empty=cell_value == 0,
-                            )
-                        )
-                field_metric_rows.append(
-                    {
-                        "label": spec["label"],
-                        "field": field,
-                        "editable": True,
-                        "monthly_total": monthly_total,
-                        "monthly_average": monthly_average,
-                        "cells": cells,
-                    }
-                )
-            field_metric_rows.append(
-                {
-                    "label": "現場",
-                    "field": "location_name",
-                    "editable": True,
-                    "monthly_total": "",
-                    "monthly_average": f"{field_active_day_count}日" if field_active_day_count else "-",
-                    "cells": [
-                        _field_cell(
-                            field="location_name",
-                            value=" / ".join(member_locations.get(month_day["date"], [])) or "-",
-                            entry_date=month_day["date"],
-                            is_empty=not member_locations.get(month_day["date"]),
-                        )
-                        for month_day in month_days
-                    ],
-                }
-            )
+            sort_value = _monthly_sort_value(sort_key, department, grid.entry_totals(), grid.field_active_day_count())
             field_rows.append(
                 {
                     "department": department,
                     "member": member,
-                    "metric_rows": field_metric_rows,
-                    "active_day_count": field_active_day_count,
+                    "metric_rows": _month_field_metric_rows(
+                        department=department,
+                        grid=grid,
+                        month_days=month_days,
+                        count_field="result_count",
+                        editable=True,
+                    ),
+                    "active_day_count": grid.field_active_day_count(),
                     "day_count_label": "稼働",
-                    "sort_value": _monthly_sort_value(sort_key, department, entry_totals, field_active_day_count),
-                }
-            )
-
-            adjustment_metric_specs = [
-                {"label": "郵送件数", "field": "return_postal_count"},
-                {"label": "郵送金額", "field": "return_postal_amount"},
-                {"label": "QR件数", "field": "return_qr_count"},
-                {"label": "QR金額", "field": "return_qr_amount"},
-            ]
-            adjustment_metric_rows = []
-            for spec in adjustment_metric_specs:
-                field = spec["field"]
-                monthly_total = int(adjustment_totals[field])
-                monthly_average = round(int(adjustment_totals[field]) / adjustment_active_day_count, 1) if adjustment_active_day_count else "-"
-                cells = [
-                    _field_cell(
-                        field=field,
-                        value=int(adjustment_daily_totals_by_member.get((member.id, month_day["date"]), {}).get(field) or 0),
-                        entry_date=month_day["date"],
-                        is_empty=int(adjustment_daily_totals_by_member.get((member.id, month_day["date"]), {}).get(field) or 0) == 0,
-                    )
-                    for month_day in month_days
-                ]
-                adjustment_metric_rows.append(
-                    {
-                        "label": spec["label"],
-                        "field": field,
-                        "editable": True,
-                        "monthly_total": monthly_total,
-                        "monthly_average": monthly_average,
-                        "cells": cells,
-                    }
-                )
-            adjustment_metric_rows.append(
-                {
-                    "label": "現場",
-                    "field": "location_name",
-                    "editable": True,
-                    "monthly_total": "",
-                    "monthly_average": f"{adjustment_active_day_count}日" if adjustment_active_day_count else "-",
-                    "cells": [
-                        _field_cell(
-                            field="location_name",
-                            value=" / ".join(adjustment_member_locations.get(month_day["date"], [])) or "-",
-                            entry_date=month_day["date"],
-                            is_empty=not adjustment_member_locations.get(month_day["date"]),
-                        )
-                        for month_day in month_days
-                    ],
+                    "sort_value": sort_value,
                 }
             )
             adjustment_rows.append(
                 {
                     "department": department,
                     "member": member,
-                    "metric_rows": adjustment_metric_rows,
-                    "active_day_count": adjustment_active_day_count,
+                    "metric_rows": _month_adjustment_metric_rows(grid=grid, month_days=month_days, editable=True),
+                    "active_day_count": grid.adjustment_active_day_count(),
                     "day_count_label": "戻り",
-                    "sort_value": _monthly_sort_value(sort_key, department, entry_totals, field_active_day_count),
+                    "sort_value": sort_value,
                 }
             )
 
@@ -1861,8 +1616,9 @@ def build_admin_month_overview(*, target_month, department_code="", sort_key="ac
     }
 
 
+@replica_reads
 def build_admin_month_comparison(*, target_month, compare_month, department_code=""):
-    departments = list(Department.objects.filter(is_active=True, code__in=["UN", "WV"]).order_by("code"))
+    departments = active_departments_by_codes(["UN", "WV"])
     month_start = target_month.replace(day=1)
     month_end = target_month.replace(day=monthrange(target_month.year, target_month.month)[1])
     compare_month_start = compare_month.replace(day=1)
@@ -1881,7 +1637,7 @@ def build_admin_month_comparison(*, target_month, compare_month, department_code
         if selected_department and department.id != selected_department.id:
             continue
 
-        members = Member.objects.active().filter(department_links__department=department).distinct().order_by("name")
+        members = department_roster(department)
         department_current_totals = _zero_totals()
         department_previous_totals = _zero_totals()
 
@@ -1998,9 +1754,10 @@ def build_admin_month_comparison(*, target_month, compare_month, department_code
     }
 
 
+@profiled("admin_daily_overview")
 def build_admin_daily_overview(*, department_code="", today=None):
     today_value = today or date.today()
-    departments = list(Department.objects.filter(is_active=True, code__in=["UN", "WV"]).order_by("code"))
+    departments = active_departments_by_codes(["UN", "WV"])
     selected_department = None
     if department_code:
         selected_department = next((department for department in departments if department.code == department_code), None)
@@ -2017,7 +1774,7 @@ def build_admin_daily_overview(*, department_code="", today=None):
             continue
 
         department_today_totals = _zero_totals()
-        members = Member.objects.active().filter(department_links__department=department).distinct().order_by("name")
+        members = department_roster(department)
         for member in members:
             today_entry = (
                 MemberDailyMetricEntry.objects.filter(
@@ -1,6 +1,7 @@
 from django.utils import timezone
 
 from apps.dairymetrics.models import MemberDailyMetricEntry
+from apps.dairymetrics.services.data_versions import bump_all_data_versions
 
 
 def auto_close_stale_entries(*, today=None) -> int:
@@ -14,4 +15,7 @@ def auto_close_stale_entries(*, today=None) -> int:
         activity_closed=True,
         activity_closed_at=closed_at,
     )
+    if updated:
+        # Queryset updates skip post_save, so the closeout bumps versions itself.
+        bump_all_data_versions()
     return updated
@@ -0,0 +1,148 @@
+"""Per-department data-version counters for conditional GETs.
+
+Every write to entries, transactions, adjustments, cancellations, targets and
+daily reports bumps the counter of the affected department inside the writing transaction,
+so a reader never sees a new version before the data it stands for. Views
+derive ``ETag`` / ``Last-Modified`` from the counters (see
+``apps.common.conditional_get``) and answer 304 without running selectors.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+
+from apps.accounts.models import Department, Member, MemberDepartment
+from apps.dairymetrics.models import (
+    DepartmentDailyMetricSummary,
+    DepartmentDataVersion,
+    MemberDailyMetricEntry,
+    MemberMetricTransaction,
+    MemberMonthMetricTarget,
+    MemberPeriodMetricTarget,
+    MetricAdjustment,
+    WVMetricCancellation,
+)
+from apps.reports.models import DailyDepartmentReport
+from apps.targets.models import (
+    DepartmentMonthTarget,
+    DepartmentPeriodTarget,
+    MonthTargetMetricValue,
+    Period,
+    PeriodTargetMetricValue,
+    TargetMetric,
+)
+
+
+logger = logging.getLogger(__name__)
+
+DEPARTMENT_SCOPED_MODELS = (
+    MemberDailyMetricEntry,
+    DepartmentDailyMetricSummary,
+    MetricAdjustment,
+    WVMetricCancellation,
+    MemberPeriodMetricTarget,
+    MemberMonthMetricTarget,
+    DepartmentMonthTarget,
+    DepartmentPeriodTarget,
+    TargetMetric,
+    MonthTargetMetricValue,
+    PeriodTargetMetricValue,
+    MemberDepartment,
+    DailyDepartmentReport,
+)
+
+
+def _bump(queryset) -> int:
+    return queryset.update(version=F("version") + 1, updated_at=timezone.now())
+
+
+def _create_missing_versions(department_ids) -> None:
+    existing_ids = set(
+        DepartmentDataVersion.objects.filter(department_id__in=department_ids).values_list("department_id", flat=True)
+    )
+    now = timezone.now()
+    DepartmentDataVersion.objects.bulk_create(
+        [
+            DepartmentDataVersion(department_id=department_id, version=1, updated_at=now)
+            for department_id in set(department_ids) - existing_ids
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def bump_data_versions(department_ids) -> None:
+    """Advance the data version of each department in ``department_ids``."""
+    department_ids = {int(department_id) for department_id in department_ids if department_id}
+    if not department_ids:
+        return
+    if _bump(DepartmentDataVersion.objects.filter(department_id__in=department_ids)) < len(department_ids):
+        _create_missing_versions(department_ids)
+    logger.debug("data_version_bump department_ids=%s", sorted(department_ids))
+
+
+def bump_all_data_versions() -> None:
+    """Advance every department's version; for writes that are not department-scoped."""
+    department_ids = set(Department.objects.values_list("id", flat=True))
+    if _bump(DepartmentDataVersion.objects.all()) < len(department_ids):
+        _create_missing_versions(department_ids)
+    logger.debug("data_version_bump department_ids=all")
+
+
+def data_version_state(department_ids=None) -> tuple[str, object]:
+    """Return ``(token, last_modified)`` for the given departments (all when ``None``).
+
+    ``department_ids`` may be a list or a ``values_list`` queryset; either way
+    the state is read in a single query.
+    """
+    versions = DepartmentDataVersion.objects.order_by("department_id")
+    if department_ids is not None:
+        versions = versions.filter(department_id__in=department_ids)
+    rows = list(versions.values_list("department_id", "version", "updated_at"))
+    token = ",".join(f"{department_id}:{version}" for department_id, version, _updated_at in rows)
+    last_modified = max((updated_at for _department_id, _version, updated_at in rows), default=None)
+    return token, last_modified
+
+
+def _bump_for_department_scoped(sender, instance, **kwargs):
+    bump_data_versions([instance.department_id])
+
+
+def _bump_for_transaction(sender, instance, **kwargs):
+    entry = instance._state.fields_cache.get("entry")
+    if entry is not None:
+        bump_data_versions([entry.department_id])
+        return
+    bump_data_versions(
+        MemberDailyMetricEntry.objects.filter(pk=instance.entry_id).values_list("department_id", flat=True)
+    )
+
+
+def _bump_for_member(sender, instance, **kwargs):
+    # New members have no department links yet; deletes cascade to MemberDepartment.
+    if kwargs.get("created") or kwargs.get("signal") is post_delete:
+        return
+    _bump(DepartmentDataVersion.objects.filter(department__member_links__member_id=instance.pk))
+
+
+def _bump_for_department(sender, instance, **kwargs):
+    # Deleting a department deletes its version row, which already changes every token.
+    if kwargs.get("signal") is post_save:
+        bump_data_versions([instance.pk])
+
+
+def _bump_for_period(sender, instance, **kwargs):
+    bump_all_data_versions()
+
+
+def connect_data_version_signals() -> None:
+    for action, signal in (("save", post_save), ("delete", post_delete)):
+        for model in DEPARTMENT_SCOPED_MODELS:
+            signal.connect(_bump_for_department_scoped, sender=model, dispatch_uid=f"data_version_{action}_{model._meta.label}")
+        signal.connect(_bump_for_transaction, sender=MemberMetricTransaction, dispatch_uid=f"data_version_{action}_transaction")
+        signal.connect(_bump_for_member, sender=Member, dispatch_uid=f"data_version_{action}_member")
+        signal.connect(_bump_for_period, sender=Period, dispatch_uid=f"data_version_{action}_period")
+        signal.connect(_bump_for_department, sender=Department, dispatch_uid=f"data_version_{action}_department")
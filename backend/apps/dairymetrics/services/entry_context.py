@@ -7,6 +7,7 @@ from django.utils import timezone
 from apps.accounts.models import Department
 from apps.common.target_periods import current_active_period
 from apps.mail.models import MailRecipientGroup, MailSendHistory
+from apps.mail.retention import restore_archived_snapshots
 
 from apps.dairymetrics.forms import (
     DairymetricsV2CloseoutForm,
@@ -408,6 +409,8 @@ def build_transaction_entry_context(
                 reverse=True,
             )
             latest_histories_by_transaction_id[tx.id] = non_test_histories[0] if non_test_histories else None
+        # The latest history's body is shown for resends, so archived rows need their texts back.
+        restore_archived_snapshots(history for history in latest_histories_by_transaction_id.values() if history)
         for tx in transaction_objects:
             latest_history = latest_histories_by_transaction_id.get(tx.id)
             reaction_counts = {reaction_type: 0 for reaction_type, _label in transaction_reaction_choices}
@@ -512,7 +515,7 @@ def build_transaction_entry_context(
             status=MailSendHistory.STATUS_SENT,
             is_test=False,
         ).select_related("recipient_group", "transaction", "sender_member")
-        for history in sent_mail_qs:
+        for history in restore_archived_snapshots(sent_mail_qs):
             sent_mail_histories.append(
                 {
                     "id": history.id,
@@ -639,6 +642,7 @@ def build_transaction_entry_context(
         "transaction_reaction_choices": transaction_reaction_choices,
         "sent_mail_histories": sent_mail_histories,
         "department_activity_rows": department_activity_rows,
+        "live_board_enabled": bool(selected_department_obj) and entry_date == timezone.localdate(),
         "selected_department_name": getattr(selected_department_obj, "name", selected_department_code),
         "selected_department_id": selected_department_obj.id if selected_department_obj else "",
         "department_summary": department_summary,
@@ -181,6 +181,23 @@ def find_duplicate_transaction(*, entry, cleaned_data, exclude_id=None):
     return None
 
 
+def build_v2_department_activity_row(entry, *, department) -> dict:
+    return {
+        "member_name": entry.member.name,
+        "member_id": entry.member_id,
+        "status_label": "活動終了" if entry.activity_closed else "活動中",
+        "is_closed": bool(entry.activity_closed),
+        "updated_at": timezone.localtime(entry.updated_at),
+        "updated_label": timezone.localtime(entry.updated_at).strftime("%H:%M"),
+        "department_name": department.name,
+        "count_value": entry_total_count(entry),
+        "count_label": entry_count_breakdown_text(entry),
+        "amount_value": int(entry.support_amount or 0),
+        "target_amount_value": int(entry.daily_target_amount or 0),
+        "location_name": entry.location_name or "",
+    }
+
+
 def build_v2_department_activity_rows(*, department, entry_date):
     if not department:
         return {"active": [], "closed": []}
@@ -196,23 +213,7 @@ def build_v2_department_activity_rows(*, department, entry_date):
         .order_by("-updated_at", "member__name")
     )
     for today_entry in entries:
-        count_value = entry_total_count(today_entry)
-        rows.append(
-            {
-                "member_name": today_entry.member.name,
-                "member_id": today_entry.member_id,
-                "status_label": "活動終了" if today_entry.activity_closed else "活動中",
-                "is_closed": bool(today_entry.activity_closed),
-                "updated_at": timezone.localtime(today_entry.updated_at),
-                "updated_label": timezone.localtime(today_entry.updated_at).strftime("%H:%M"),
-                "department_name": department.name,
-                "count_value": count_value,
-                "count_label": entry_count_breakdown_text(today_entry),
-                "amount_value": int(today_entry.support_amount or 0),
-                "target_amount_value": int(today_entry.daily_target_amount or 0),
-                "location_name": today_entry.location_name or "",
-            }
-        )
+        rows.append(build_v2_department_activity_row(today_entry, department=department))
     return {
         "active": [row for row in rows if not row["is_closed"]],
         "closed": [row for row in rows if row["is_closed"]],
@@ -0,0 +1,194 @@
+"""Live activity board: push today's department activity to open pages.
+
+Entry and transaction writes publish a small delta on the in-process event
+bus once their transaction commits. Pages receive the deltas over
+server-sent events (ASGI) or interval polling (WSGI) and patch their board
+instead of reloading it.
+
+The bus only carries writes made in this process, so each process also
+reconciles against the department data version: when the version moves, one
+fresh snapshot per department is published to every local subscriber. Writes
+from other workers or instances therefore show up within
+``LIVE_BOARD_RECONCILE_SECONDS``, whatever the number of viewers.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import Department
+from apps.dairymetrics.models import MemberDailyMetricEntry, MemberMetricTransaction
+from apps.dairymetrics.services.data_versions import data_version_state
+from apps.dairymetrics.services.entry_v2 import build_v2_department_activity_row, build_v2_department_activity_rows
+from config.event_bus import bus
+
+
+logger = logging.getLogger(__name__)
+
+EVENT_SNAPSHOT = "snapshot"
+EVENT_ENTRY_OPENED = "entry_opened"
+EVENT_ENTRY_UPDATED = "entry_updated"
+EVENT_ENTRY_CLOSED = "entry_closed"
+EVENT_ENTRY_REMOVED = "entry_removed"
+EVENT_TRANSACTION_ADDED = "transaction_added"
+EVENT_TRANSACTION_REMOVED = "transaction_removed"
+
+
+def live_board_channel(department_id) -> str:
+    return f"live_board:{department_id}"
+
+
+def live_board_department_for_user(user, department_id):
+    """Return the active department when ``user`` may watch its board, else ``None``."""
+    if not getattr(user, "is_authenticated", False):
+        return None
+    departments = Department.objects.filter(is_active=True, pk=department_id)
+    if not user.is_staff:
+        member = getattr(user, "member_profile", None)
+        if member is None:
+            return None
+        departments = departments.filter(member_links__member=member)
+    return departments.distinct().first()
+
+
+def _live_row(row: dict, *, department_id) -> dict:
+    return {
+        **row,
+        "updated_at": row["updated_at"].isoformat(),
+        "detail_url": reverse("performance_member_insight", args=[row["member_id"], department_id]),
+    }
+
+
+def build_live_board_snapshot(*, department) -> dict:
+    """Return a ``snapshot`` event with today's board for ``department``.
+
+    The version is read before the rows, so a write racing the snapshot moves
+    the version past it and the next reconcile publishes a fresh snapshot.
+    """
+    version, _last_modified = data_version_state([department.id])
+    _reconciler.observe(department.id, version)
+    entry_date = timezone.localdate()
+    rows = build_v2_department_activity_rows(department=department, entry_date=entry_date)
+    return {
+        "type": EVENT_SNAPSHOT,
+        "department_id": department.id,
+        "entry_date": entry_date.isoformat(),
+        "rows": [_live_row(row, department_id=department.id) for row in [*rows["active"], *rows["closed"]]],
+    }
+
+
+class _LiveBoardReconciler:
+    """Publish a snapshot when a department's data version moves.
+
+    At most one check per department runs per interval in each process, so
+    the cost does not grow with the number of open pages.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions: dict[int, str] = {}
+        self._checked_at: dict[int, float] = {}
+
+    def observe(self, department_id: int, version: str) -> None:
+        with self._lock:
+            self._versions.setdefault(department_id, version)
+
+    def check(self, department) -> None:
+        interval = float(getattr(settings, "LIVE_BOARD_RECONCILE_SECONDS", 10))
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at.get(department.id, float("-inf")) < interval:
+                return
+            self._checked_at[department.id] = now
+        version, _last_modified = data_version_state([department.id])
+        with self._lock:
+            previous = self._versions.get(department.id)
+            self._versions[department.id] = version
+        if previous is None or previous == version:
+            return
+        logger.info("live_board reconcile department_id=%s version=%s", department.id, version)
+        snapshot = build_live_board_snapshot(department=department)
+        bus.publish(live_board_channel(department.id), snapshot)
+
+
+_reconciler = _LiveBoardReconciler()
+
+
+def reconcile_live_board(department) -> None:
+    _reconciler.check(department)
+
+
+def _publish(department_id, event: dict) -> None:
+    bus.publish(live_board_channel(department_id), {"department_id": department_id, **event})
+
+
+def _is_board_entry(entry) -> bool:
+    return entry.input_source == MemberDailyMetricEntry.SOURCE_MEMBER and entry.entry_date == timezone.localdate()
+
+
+def _publish_entry_saved(sender, instance, created=False, **kwargs):
+    if not _is_board_entry(instance):
+        return
+    if created:
+        event_type = EVENT_ENTRY_OPENED
+    elif instance.activity_closed:
+        event_type = EVENT_ENTRY_CLOSED
+    else:
+        event_type = EVENT_ENTRY_UPDATED
+
+    def publish():
+        row = build_v2_department_activity_row(instance, department=instance.department)
+        _publish(
+            instance.department_id,
+            {
+                "type": event_type,
+                "entry_date": instance.entry_date.isoformat(),
+                "member_id": instance.member_id,
+                "row": _live_row(row, department_id=instance.department_id),
+            },
+        )
+
+    transaction.on_commit(publish)
+
+
+def _publish_entry_deleted(sender, instance, **kwargs):
+    if not _is_board_entry(instance):
+        return
+    event = {"type": EVENT_ENTRY_REMOVED, "entry_date": instance.entry_date.isoformat(), "member_id": instance.member_id}
+    transaction.on_commit(lambda: _publish(instance.department_id, event))
+
+
+def _publish_transaction_change(sender, instance, created=False, **kwargs):
+    if kwargs.get("signal") is post_save and not created:
+        return
+    entry = instance._state.fields_cache.get("entry")
+    if entry is None:
+        entry = MemberDailyMetricEntry.objects.filter(pk=instance.entry_id).only(
+            "department_id", "member_id", "entry_date", "input_source"
+        ).first()
+    if entry is None or not _is_board_entry(entry):
+        return
+    event = {
+        "type": EVENT_TRANSACTION_ADDED if created else EVENT_TRANSACTION_REMOVED,
+        "entry_date": entry.entry_date.isoformat(),
+        "member_id": entry.member_id,
+        "support_amount": int(instance.support_amount or 0),
+    }
+    transaction.on_commit(lambda: _publish(entry.department_id, event))
+
+
+def connect_live_board_signals() -> None:
+    post_save.connect(_publish_entry_saved, sender=MemberDailyMetricEntry, dispatch_uid="live_board_entry_save")
+    post_delete.connect(_publish_entry_deleted, sender=MemberDailyMetricEntry, dispatch_uid="live_board_entry_delete")
+    post_save.connect(_publish_transaction_change, sender=MemberMetricTransaction, dispatch_uid="live_board_transaction_save")
+    post_delete.connect(
+        _publish_transaction_change, sender=MemberMetricTransaction, dispatch_uid="live_board_transaction_delete"
+    )
@@ -0,0 +1,164 @@
+"""Closeout memo search.
+
+A query matches an entry when it is a substring of its memo, location, member
+name or department code, as with the ``icontains`` filter this replaces.
+
+* SQLite: migration 0023 keeps an FTS5 trigram table in sync through triggers.
+  Queries of three or more characters match against it and can be ranked
+  with ``bm25``. Shorter queries have no trigram to look up and use ``LIKE``.
+* PostgreSQL: ``pg_trgm`` GIN indexes on ``UPPER(memo)`` and
+  ``UPPER(location_name)`` serve the ``icontains`` lookups. Member and
+  department matches are resolved first against their small tables. Ranking
+  uses trigram word similarity. Without the extension the same lookups
+  run unindexed and results keep the date ordering.
+
+SQLite rebuilds a table when a migration alters it, and that drops the
+table's triggers. The index is only used while all triggers are present;
+otherwise searches fall back to ``LIKE`` and a warning is logged. Re-running
+migration 0023 restores the index. Both checks are cached per database and
+cleared after every ``migrate``.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.signals import post_migrate
+from django.db.models.expressions import RawSQL
+from django.utils.functional import cached_property
+
+from apps.accounts.models import Department, Member
+from apps.dairymetrics.models import MemberDailyMetricEntry
+
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "dairymetrics_entry_memo_search"
+SEARCH_TRIGGER_COUNT = 5
+MIN_INDEXED_QUERY_LENGTH = 3
+DEFAULT_COUNT_LIMIT = 1000
+
+_index_state: dict[str, bool] = {}
+
+
+def _sqlite_index_ready(alias: str) -> bool:
+    if alias not in _index_state:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE (type = 'table' AND name = %s) OR (type = 'trigger' AND name LIKE %s)",
+                [SEARCH_TABLE, f"{SEARCH_TABLE}_%"],
+            )
+            ready = cursor.fetchone()[0] == SEARCH_TRIGGER_COUNT + 1
+        if not ready:
+            logger.warning("memo_search index_unavailable alias=%s fallback=like", alias)
+        _index_state[alias] = ready
+    return _index_state[alias]
+
+
+def _postgresql_trigram_ready(alias: str) -> bool:
+    if alias not in _index_state:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            ready = cursor.fetchone() is not None
+        if not ready:
+            logger.warning("memo_search index_unavailable alias=%s fallback=unindexed", alias)
+        _index_state[alias] = ready
+    return _index_state[alias]
+
+
+def _reset_index_state(**kwargs) -> None:
+    _index_state.clear()
+
+
+def connect_memo_search_signals() -> None:
+    post_migrate.connect(_reset_index_state, dispatch_uid="memo_search_reset_index_state")
+
+
+def _substring_filter(query: str) -> Q:
+    return (
+        Q(memo__icontains=query)
+        | Q(member__name__icontains=query)
+        | Q(department__code__icontains=query)
+        | Q(location_name__icontains=query)
+    )
+
+
+def _fts_phrase(query: str) -> str:
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _sqlite_search(entries, query: str, *, ranked: bool):
+    phrase = _fts_phrase(query)
+    entries = entries.filter(
+        id__in=RawSQL(f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s", [phrase])
+    )
+    if not ranked:
+        return entries
+    entry_table = MemberDailyMetricEntry._meta.db_table
+    rank = RawSQL(
+        f"SELECT bm25({SEARCH_TABLE}) FROM {SEARCH_TABLE} "
+        f'WHERE {SEARCH_TABLE} MATCH %s AND rowid = "{entry_table}"."id"',
+        [phrase],
+    )
+    # bm25 scores better matches lower.
+    return entries.annotate(search_rank=rank).order_by("search_rank", "-entry_date", "-id")
+
+
+def _postgresql_search(entries, query: str, *, ranked: bool):
+    entries = entries.filter(
+        Q(memo__icontains=query)
+        | Q(location_name__icontains=query)
+        | Q(member_id__in=Member.objects.filter(name__icontains=query).values("id"))
+        | Q(department_id__in=Department.objects.filter(code__icontains=query).values("id"))
+    )
+    if not ranked or not _postgresql_trigram_ready(entries.db):
+        return entries
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    return entries.annotate(search_rank=TrigramWordSimilarity(query, "memo")).order_by(
+        "-search_rank", "-entry_date", "-id"
+    )
+
+
+def search_closeout_entries(entries, query: str, *, ranked: bool = False):
+    """Filter ``entries`` to those matching ``query``.
+
+    With ``ranked`` the best matches come first where the database can score
+    them; otherwise the queryset keeps its ordering.
+    """
+    query = (query or "").strip()
+    if not query:
+        return entries
+    vendor = connections[entries.db].vendor
+    if vendor == "sqlite" and len(query) >= MIN_INDEXED_QUERY_LENGTH and _sqlite_index_ready(entries.db):
+        return _sqlite_search(entries, query, ranked=ranked)
+    if vendor == "postgresql":
+        return _postgresql_search(entries, query, ranked=ranked)
+    return entries.filter(_substring_filter(query))
+
+
+class BoundedCountPaginator(Paginator):
+    """Paginator whose count stops at ``count_limit``.
+
+    The count query scans at most ``count_limit + 1`` rows instead of every
+    match; ``count_is_bounded`` reports whether more rows exist.
+    """
+
+    def __init__(self, object_list, per_page, *, count_limit: int = DEFAULT_COUNT_LIMIT, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_limit = count_limit
+        self.count_is_bounded = False
+
+    @cached_property
+    def count(self):
+        counted = self.object_list[: self.count_limit + 1].count()
+        self.count_is_bounded = counted > self.count_limit
+        return min(counted, self.count_limit)
+
+    @property
+    def count_label(self) -> str:
+        count = self.count
+        return f"{count}+" if self.count_is_bounded else str(count)
@@ -10,6 +10,7 @@ from django.db.models import Count, Sum
 from django.utils import timezone
 
 from apps.accounts.models import Member
+from apps.common.reference_loaders import department_roster
 from apps.targets.models import (
     DepartmentMonthTarget,
     DepartmentPeriodTarget,
@@ -30,10 +31,16 @@ from apps.dairymetrics.models import (
 from apps.dairymetrics.services.final_actuals import (
     collect_department_final_actual_totals,
     collect_increase_adjustment_totals,
+    collect_increase_adjustment_totals_by_member_ids,
     collect_member_final_actual_totals,
+    collect_member_final_actual_totals_by_ids,
+    zero_final_actual_totals,
 )
 from apps.dairymetrics.services.metrics_v2_ranking import build_ranking_metric_map, ranking_metric_options_for_department
 from apps.common.target_periods import current_active_period
+from config.db_router import replica_reads
+from config.query_profiler import profiled
+from config.section_executor import SectionFailure, run_sections
 
 
 @dataclass(frozen=True)
@@ -144,6 +151,52 @@ def _daily_un_final_values(*, member, department, start_date: date, end_date: da
     return [daily_values[target_date] for target_date in sorted(daily_values)]
 
 
+def _daily_un_final_values_by_member_ids(*, member_ids, department, start_date: date, end_date: date) -> dict[int, list[dict]]:
+    """Same values as ``_daily_un_final_values`` for many members in two grouped queries."""
+    daily_values_by_member_id: dict[int, dict[date, dict]] = {member_id: {} for member_id in member_ids}
+    if not member_ids:
+        return {}
+
+    entries = (
+        MemberDailyMetricEntry.objects.filter(
+            member_id__in=member_ids,
+            department=department,
+            entry_date__range=(start_date, end_date),
+        )
+        .values("member_id", "entry_date")
+        .annotate(
+            support_amount=Sum("support_amount"),
+            result_count=Sum("result_count"),
+        )
+    )
+    for row in entries:
+        values = daily_values_by_member_id[row["member_id"]].setdefault(row["entry_date"], {"amount": 0, "count": 0})
+        values["amount"] += int(row.get("support_amount") or 0)
+        values["count"] += int(row.get("result_count") or 0)
+
+    adjustments = (
+        MetricAdjustment.objects.filter(
+            member_id__in=member_ids,
+            department=department,
+            target_date__range=(start_date, end_date),
+        )
+        .values("member_id", "target_date")
+        .annotate(
+            support_amount=Sum("support_amount"),
+            result_count=Sum("result_count"),
+        )
+    )
+    for row in adjustments:
+        values = daily_values_by_member_id[row["member_id"]].setdefault(row["target_date"], {"amount": 0, "count": 0})
+        values["amount"] += int(row.get("support_amount") or 0)
+        values["count"] += int(row.get("result_count") or 0)
+
+    return {
+        member_id: [daily_values[target_date] for target_date in sorted(daily_values)]
+        for member_id, daily_values in daily_values_by_member_id.items()
+    }
+
+
 def _effective_daily_values(*, daily_values: list[dict], active_days: int | None = None) -> list[dict]:
     effective_active_days = max(int(active_days or 0), len(daily_values))
     if effective_active_days <= len(daily_values):
@@ -220,6 +273,48 @@ def stability_scores_for_daily_values(
     }
 
 
+def batch_stability_scores(
+    daily_values_by_member_id: dict[int, list[dict]],
+    active_days_by_member_id: dict[int, int] | None = None,
+) -> dict[int, dict]:
+    """Score every member against one shared reference; same values as ``stability_scores_for_daily_values``."""
+    active_days_by_member_id = active_days_by_member_id or {}
+    reference_active_days = _reference_active_days(daily_values_by_member_id, active_days_by_member_id)
+    scores_by_member_id = {}
+    for member_id, daily_values in daily_values_by_member_id.items():
+        day_count = max(int(active_days_by_member_id.get(member_id, 0) or 0), len(daily_values))
+        if not day_count:
+            scores_by_member_id[member_id] = {"amount_stability_score": 0, "count_stability_score": 0}
+            continue
+        padding = [0] * (day_count - len(daily_values))
+        amount_values = [int(values.get("amount") or 0) for values in daily_values] + padding
+        count_values = [int(values.get("count") or 0) for values in daily_values] + padding
+        scores_by_member_id[member_id] = {
+            "amount_stability_score": _stability_score(
+                amount_values,
+                active_days=day_count,
+                reference_active_days=reference_active_days,
+            ),
+            "count_stability_score": _stability_score(
+                count_values,
+                active_days=day_count,
+                reference_active_days=reference_active_days,
+                active_day_factor_floor=0.7,
+            ),
+        }
+    return scores_by_member_id
+
+
+def build_un_stability_scores(*, member_ids, department, start_date: date, end_date: date, active_days_by_member_id) -> dict[int, dict]:
+    daily_values_by_member_id = _daily_un_final_values_by_member_ids(
+        member_ids=member_ids,
+        department=department,
+        start_date=start_date,
+        end_date=end_date,
+    )
+    return batch_stability_scores(daily_values_by_member_id, active_days_by_member_id)
+
+
 def _average_amount_per_decision_value(*, department_code: str, totals: dict, excluded_adjustment_totals: dict | None = None) -> float | None:
     excluded_adjustment_totals = excluded_adjustment_totals or {}
     amount = max(0, int(totals.get("support_amount") or 0) - int(excluded_adjustment_totals.get("support_amount") or 0))
@@ -387,19 +482,6 @@ def _active_work_count(*, department, start_date: date, end_date: date) -> int:
     ).count()
 
 
-def _increase_totals(*, member=None, department, start_date: date, end_date: date) -> dict:
-    totals = collect_increase_adjustment_totals(
-        member=member,
-        department=department,
-        start_date=start_date,
-        end_date=end_date,
-    )
-    return {
-        "count": _count_value(department.code, totals),
-        "amount": int(totals.get("support_amount") or 0),
-    }
-
-
 def _build_summary_cards(
     *,
     title_prefix: str,
@@ -680,23 +762,26 @@ def _build_month_totals_series(*, department, member=None, reference_month: date
     }
 
 
-def _member_metric_row(*, member, department, scope: MetricsV2Scope, stability_scores=None):
+def _member_metric_row(
+    *,
+    member,
+    department,
+    totals: dict,
+    base_totals: dict,
+    excluded_average_adjustment_totals: dict,
+    active_days: int,
+    stability_scores=None,
+):
     stability_scores = stability_scores or {}
-    totals = collect_member_final_actual_totals(member, department, scope.start_date, scope.end_date, include_adjustments=True)
-    base_totals = collect_member_final_actual_totals(member, department, scope.start_date, scope.end_date, include_adjustments=False)
-    excluded_average_adjustment_totals = collect_increase_adjustment_totals(
-        member=member,
-        department=department,
-        start_date=scope.start_date,
-        end_date=scope.end_date,
-    )
-    active_days = _active_day_count(member=member, department=department, start_date=scope.start_date, end_date=scope.end_date)
     decision_count = _count_value(department.code, totals)
     base_decision_count = _count_value(department.code, base_totals)
     base_approach_count = int(base_totals.get("approach_count") or 0)
     base_communication_count = int(base_totals.get("communication_count") or 0)
     support_amount = int(totals.get("support_amount") or 0)
-    increase_totals = _increase_totals(member=member, department=department, start_date=scope.start_date, end_date=scope.end_date)
+    increase_totals = {
+        "count": _count_value(department.code, excluded_average_adjustment_totals),
+        "amount": int(excluded_average_adjustment_totals.get("support_amount") or 0),
+    }
     return {
         "member": member,
         "metrics": {
@@ -726,12 +811,7 @@ def _member_metric_row(*, member, department, scope: MetricsV2Scope, stability_s
 
 
 def _ranking_members(*, department, scope: MetricsV2Scope):
-    active_member_ids = set(
-        Member.objects.active()
-        .filter(department_links__department=department)
-        .distinct()
-        .values_list("id", flat=True)
-    )
+    active_member_ids = {member.id for member in department_roster(department)}
     scoped_member_ids = set(
         MemberDailyMetricEntry.objects.filter(
             department=department,
@@ -756,42 +836,57 @@ def _ranking_members(*, department, scope: MetricsV2Scope):
 
 def _build_ranking_payload(*, department, scope: MetricsV2Scope):
     members = _ranking_members(department=department, scope=scope)
+    member_ids = [member.id for member in members]
+    totals_by_member_id = collect_member_final_actual_totals_by_ids(
+        member_ids=member_ids,
+        department=department,
+        start_date=scope.start_date,
+        end_date=scope.end_date,
+        include_adjustments=True,
+    )
+    base_totals_by_member_id = collect_member_final_actual_totals_by_ids(
+        member_ids=member_ids,
+        department=department,
+        start_date=scope.start_date,
+        end_date=scope.end_date,
+        include_adjustments=False,
+    )
+    excluded_average_adjustment_totals_by_member_id = collect_increase_adjustment_totals_by_member_ids(
+        member_ids=member_ids,
+        department=department,
+        start_date=scope.start_date,
+        end_date=scope.end_date,
+    )
+    active_day_rows = (
+        MemberDailyMetricEntry.objects.filter(
+            member_id__in=member_ids,
+            department=department,
+            entry_date__range=(scope.start_date, scope.end_date),
+        )
+        .values("member_id")
+        .annotate(active_days=Count("entry_date", distinct=True))
+    )
+    active_days_by_member_id = {row["member_id"]: int(row["active_days"] or 0) for row in active_day_rows}
     stability_scores_by_member_id = {}
     if department.code == "UN":
-        member_ids = [member.id for member in members]
-        active_day_rows = (
-            MemberDailyMetricEntry.objects.filter(
-                member_id__in=member_ids,
-                department=department,
-                entry_date__range=(scope.start_date, scope.end_date),
-            )
-            .values("member_id")
-            .annotate(active_days=Count("entry_date", distinct=True))
+        stability_scores_by_member_id = build_un_stability_scores(
+            member_ids=member_ids,
+            department=department,
+            start_date=scope.start_date,
+            end_date=scope.end_date,
+            active_days_by_member_id=active_days_by_member_id,
         )
-        active_days_by_member_id = {row["member_id"]: int(row["active_days"] or 0) for row in active_day_rows}
-        daily_values_by_member_id = {
-            member.id: _daily_un_final_values(
-                member=member,
-                department=department,
-                start_date=scope.start_date,
-                end_date=scope.end_date,
-            )
-            for member in members
-        }
-        reference_days = _reference_active_days(daily_values_by_member_id, active_days_by_member_id)
-        stability_scores_by_member_id = {
-            member_id: stability_scores_for_daily_values(
-                daily_values=daily_values,
-                reference_active_days=reference_days,
-                active_days=active_days_by_member_id.get(member_id, 0),
-            )
-            for member_id, daily_values in daily_values_by_member_id.items()
-        }
     rows = [
         _member_metric_row(
             member=member,
             department=department,
-            scope=scope,
+            totals=totals_by_member_id.get(member.id, zero_final_actual_totals()),
+            base_totals=base_totals_by_member_id.get(member.id, zero_final_actual_totals()),
+            excluded_average_adjustment_totals=excluded_average_adjustment_totals_by_member_id.get(
+                member.id,
+                zero_final_actual_totals(),
+            ),
+            active_days=active_days_by_member_id.get(member.id, 0),
             stability_scores=stability_scores_by_member_id.get(member.id, {}),
         )
         for member in members
@@ -811,77 +906,102 @@ def _build_ranking_payload(*, department, scope: MetricsV2Scope):
     }
 
 
-def build_metrics_v2_dashboard_payload(
-    *,
-    department,
-    scope: MetricsV2Scope,
-    member=None,
-) -> dict:
-    overall_totals = collect_department_final_actual_totals(department, scope.start_date, scope.end_date, include_adjustments=True)
-    overall_excluded_average_adjustment_totals = collect_increase_adjustment_totals(
-        department=department,
-        start_date=scope.start_date,
-        end_date=scope.end_date,
+def _build_overall_summary(*, department, scope: MetricsV2Scope) -> dict:
+    return _build_summary_cards(
+        title_prefix=f"{department.name} 全体",
+        department_code=department.code,
+        totals=collect_department_final_actual_totals(department, scope.start_date, scope.end_date, include_adjustments=True),
+        target_amount=_department_target_amount_for_scope(department=department, scope=scope),
+        active_days=_active_day_count(department=department, start_date=scope.start_date, end_date=scope.end_date),
+        average_member_count=_active_member_count(department=department, start_date=scope.start_date, end_date=scope.end_date),
+        average_work_count=_active_work_count(department=department, start_date=scope.start_date, end_date=scope.end_date),
+        excluded_average_adjustment_totals=collect_increase_adjustment_totals(
+            department=department,
+            start_date=scope.start_date,
+            end_date=scope.end_date,
+        ),
     )
-    overall_target_amount = _department_target_amount_for_scope(department=department, scope=scope)
-    overall_active_days = _active_day_count(department=department, start_date=scope.start_date, end_date=scope.end_date)
-    overall_active_work_count = _active_work_count(department=department, start_date=scope.start_date, end_date=scope.end_date)
-    overall_active_member_count = _active_member_count(department=department, start_date=scope.start_date, end_date=scope.end_date)
-
-    personal_totals = None
-    personal_excluded_average_adjustment_totals = None
-    personal_target_amount = 0
-    personal_active_days = 0
-    if member is not None:
-        personal_totals = collect_member_final_actual_totals(member, department, scope.start_date, scope.end_date, include_adjustments=True)
-        personal_excluded_average_adjustment_totals = collect_increase_adjustment_totals(
+
+
+def _build_personal_summary(*, department, scope: MetricsV2Scope, member) -> dict | None:
+    if member is None:
+        return None
+    return _build_summary_cards(
+        title_prefix=f"{member.name} さん",
+        department_code=department.code,
+        totals=collect_member_final_actual_totals(member, department, scope.start_date, scope.end_date, include_adjustments=True),
+        target_amount=_member_target_amount_for_scope(member=member, department=department, scope=scope),
+        active_days=_active_day_count(member=member, department=department, start_date=scope.start_date, end_date=scope.end_date),
+        excluded_average_adjustment_totals=collect_increase_adjustment_totals(
             member=member,
             department=department,
             start_date=scope.start_date,
             end_date=scope.end_date,
-        )
-        personal_target_amount = _member_target_amount_for_scope(member=member, department=department, scope=scope)
-        personal_active_days = _active_day_count(member=member, department=department, start_date=scope.start_date, end_date=scope.end_date)
+        ),
+    )
 
-    distribution_payload = build_metrics_v2_distribution_payload(department=department, scope=scope, member=member)
 
-    reference_month = scope.month_start or scope.end_date.replace(day=1)
-    available_periods = _recent_period_history_periods(target_date=scope.end_date)
+METRICS_V2_SUMMARY_PARTS = ("overall_summary", "personal_summary")
+# Lazily loaded page sections and the payload parts each one is built from.
+METRICS_V2_LAZY_SECTIONS = {
+    "history": ("month_history", "period_history"),
+    "ranking": ("ranking",),
+    "distribution": ("distribution",),
+}
 
+
+def _metrics_v2_part_builders(*, department, scope: MetricsV2Scope, member) -> dict:
+    reference_month = scope.month_start or scope.end_date.replace(day=1)
     return {
-        "scope": scope,
-        "overall_summary": _build_summary_cards(
-            title_prefix=f"{department.name} 全体",
-            department_code=department.code,
-            totals=overall_totals,
-            target_amount=overall_target_amount,
-            active_days=overall_active_days,
-            average_member_count=overall_active_member_count,
-            average_work_count=overall_active_work_count,
-            excluded_average_adjustment_totals=overall_excluded_average_adjustment_totals,
-        ),
-        "personal_summary": (
-            _build_summary_cards(
-                title_prefix=f"{member.name} さん",
-                department_code=department.code,
-                totals=personal_totals,
-                target_amount=personal_target_amount,
-                active_days=personal_active_days,
-                excluded_average_adjustment_totals=personal_excluded_average_adjustment_totals,
-            )
-            if member is not None and personal_totals is not None
-            else None
-        ),
-        "month_history": _build_month_totals_series(
+        "overall_summary": lambda: _build_overall_summary(department=department, scope=scope),
+        "personal_summary": lambda: _build_personal_summary(department=department, scope=scope, member=member),
+        "month_history": lambda: _build_month_totals_series(
             department=department,
             member=member,
             reference_month=reference_month,
         ),
-        "period_history": _build_period_totals_series(
+        "period_history": lambda: _build_period_totals_series(
             department=department,
             member=member,
-            periods=available_periods,
+            periods=_recent_period_history_periods(target_date=scope.end_date),
         ),
-        **distribution_payload,
-        "ranking": _build_ranking_payload(department=department, scope=scope),
+        "distribution": lambda: build_metrics_v2_distribution_payload(department=department, scope=scope, member=member),
+        "ranking": lambda: _build_ranking_payload(department=department, scope=scope),
     }
+
+
+@replica_reads
+def build_metrics_v2_payload_parts(parts, *, department, scope: MetricsV2Scope, member=None) -> dict:
+    """Build the named payload parts; independent parts run on the section executor.
+
+    Parts that timed out or failed are left out and listed in ``section_errors``.
+    """
+    builders = _metrics_v2_part_builders(department=department, scope=scope, member=member)
+    values, _timings = run_sections({name: builders[name] for name in parts}, label="metrics_v2")
+    payload = {}
+    section_errors = {}
+    for name in parts:
+        if isinstance(values[name], SectionFailure):
+            section_errors[name] = values[name].status
+        elif name == "distribution":
+            payload.update(values[name])
+        else:
+            payload[name] = values[name]
+    if section_errors:
+        payload["section_errors"] = section_errors
+    return payload
+
+
+def build_metrics_v2_section_payload(section: str, *, department, scope: MetricsV2Scope, member=None) -> dict:
+    return build_metrics_v2_payload_parts(METRICS_V2_LAZY_SECTIONS[section], department=department, scope=scope, member=member)
+
+
+@profiled("metrics_v2_payload")
+def build_metrics_v2_dashboard_payload(
+    *,
+    department,
+    scope: MetricsV2Scope,
+    member=None,
+) -> dict:
+    parts = [*METRICS_V2_SUMMARY_PARTS, *(part for section_parts in METRICS_V2_LAZY_SECTIONS.values() for part in section_parts)]
+    return {"scope": scope, **build_metrics_v2_payload_parts(parts, department=department, scope=scope, member=member)}
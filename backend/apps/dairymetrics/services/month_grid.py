@@ -0,0 +1,104 @@
+"""Members × days × metrics grids for the monthly overview screens.
+
+Entries and adjustments are read as ``values()`` rows and scattered once into
+per-member day columns; active-day counts, monthly totals and sort keys are
+then column reductions instead of ``month_days × fields`` dict lookups per
+member.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from apps.dairymetrics.models import MemberDailyMetricEntry, MetricAdjustment
+from apps.dairymetrics.services.final_actuals import (
+    ADJUSTMENT_METRIC_FIELDS,
+    ENTRY_METRIC_FIELDS,
+    zero_final_actual_totals,
+)
+
+
+def _active_day_flags(columns: dict[str, list[int]], *, locations: list[list[str]] | None = None) -> list[bool]:
+    flags = [any(value > 0 for value in day_values) for day_values in zip(*columns.values())]
+    if locations is not None:
+        flags = [flag or bool(day_locations) for flag, day_locations in zip(flags, locations)]
+    return flags
+
+
+@dataclass
+class MemberMonthGrid:
+    day_count: int
+    entry_columns: dict[str, list[int]] = field(default_factory=dict)
+    adjustment_columns: dict[str, list[int]] = field(default_factory=dict)
+    entry_locations: list[list[str]] = field(default_factory=list)
+    adjustment_locations: list[list[str]] = field(default_factory=list)
+    today_entry: dict | None = None
+
+    def __post_init__(self):
+        for name in ENTRY_METRIC_FIELDS:
+            self.entry_columns.setdefault(name, [0] * self.day_count)
+        for name in ADJUSTMENT_METRIC_FIELDS:
+            self.adjustment_columns.setdefault(name, [0] * self.day_count)
+        if not self.entry_locations:
+            self.entry_locations = [[] for _ in range(self.day_count)]
+        if not self.adjustment_locations:
+            self.adjustment_locations = [[] for _ in range(self.day_count)]
+
+    def entry_totals(self) -> dict:
+        totals = zero_final_actual_totals()
+        for name, values in self.entry_columns.items():
+            totals[name] = sum(values)
+        return totals
+
+    def adjustment_totals(self) -> dict:
+        totals = zero_final_actual_totals()
+        for name, values in self.adjustment_columns.items():
+            totals[name] = sum(values)
+        return totals
+
+    def field_active_day_count(self) -> int:
+        return sum(_active_day_flags(self.entry_columns, locations=self.entry_locations))
+
+    def adjustment_active_day_count(self) -> int:
+        return sum(_active_day_flags(self.adjustment_columns))
+
+
+def _add_location(locations: list[list[str]], index: int, name: str) -> None:
+    normalized_name = (name or "").strip()
+    if normalized_name and normalized_name not in locations[index]:
+        locations[index].append(normalized_name)
+
+
+def build_month_grids(*, member_ids, department, month_start, month_end, today=None) -> dict[int, MemberMonthGrid]:
+    """Return one grid per member id for ``department`` between ``month_start`` and ``month_end``."""
+    day_count = (month_end - month_start).days + 1
+    grids = {member_id: MemberMonthGrid(day_count=day_count) for member_id in member_ids}
+    if not grids:
+        return grids
+
+    entry_rows = MemberDailyMetricEntry.objects.filter(
+        member_id__in=member_ids,
+        department=department,
+        entry_date__range=(month_start, month_end),
+    ).values("member_id", "entry_date", "location_name", "activity_closed", "updated_at", *ENTRY_METRIC_FIELDS)
+    for row in entry_rows:
+        grid = grids[row["member_id"]]
+        index = (row["entry_date"] - month_start).days
+        for name in ENTRY_METRIC_FIELDS:
+            grid.entry_columns[name][index] += int(row[name] or 0)
+        _add_location(grid.entry_locations, index, row["location_name"])
+        if row["entry_date"] == today and (grid.today_entry is None or row["updated_at"] > grid.today_entry["updated_at"]):
+            grid.today_entry = row
+
+    adjustment_rows = MetricAdjustment.objects.filter(
+        member_id__in=member_ids,
+        department=department,
+        target_date__range=(month_start, month_end),
+    ).values("member_id", "target_date", "location_name", *ADJUSTMENT_METRIC_FIELDS)
+    for row in adjustment_rows:
+        grid = grids[row["member_id"]]
+        index = (row["target_date"] - month_start).days
+        for name in ADJUSTMENT_METRIC_FIELDS:
+            grid.adjustment_columns[name][index] += int(row[name] or 0)
+        _add_location(grid.adjustment_locations, index, row["location_name"])
+    return grids
@@ -0,0 +1,329 @@
+"""Per-member unread notification counters.
+
+Badges on the entry pages read one ``MemberNotificationCounter`` row per kind
+instead of counting reactions or transactions through their joins. Writes keep
+the rows current inside the writing transaction:
+
+* a reaction to a member's transaction increments the owner's reaction counter
+  with an ``F()`` update and rebuilds its previews (capped at ``PREVIEW_LIMIT``)
+  from the unread reactions, as does an edit of a reacted transaction, so the
+  previews never outlive the rows they describe;
+* a transaction entered today increments the today counter of every other
+  member of the department;
+* ``mark_*_seen`` resets the counter together with the ``last_seen_at`` state.
+
+Rows are created lazily from the source tables on first read, so a member who
+never opens the page costs nothing on writes. Changes the signals cannot
+follow exactly (deleted reactions, department membership changes) drop the
+affected row, and it is rebuilt on the next read. ``reconcile_notification_counters``
+recounts every row from the source tables and is exposed as a management
+command of the same name.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import date
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+from apps.accounts.models import Member, MemberDepartment
+from apps.dairymetrics.models import (
+    MemberDailyMetricEntry,
+    MemberMetricTransaction,
+    MemberMetricTransactionNotificationState,
+    MemberMetricTransactionReaction,
+    MemberMetricTransactionReactionNotificationState,
+    MemberNotificationCounter,
+)
+from apps.dairymetrics.services.entry_context import member_departments
+
+
+logger = logging.getLogger(__name__)
+
+KIND_TRANSACTION_REACTION = MemberNotificationCounter.KIND_TRANSACTION_REACTION
+KIND_TODAY_TRANSACTION = MemberNotificationCounter.KIND_TODAY_TRANSACTION
+PREVIEW_LIMIT = MemberNotificationCounter.PREVIEW_LIMIT
+
+_STATE_MODELS = {
+    KIND_TRANSACTION_REACTION: MemberMetricTransactionReactionNotificationState,
+    KIND_TODAY_TRANSACTION: MemberMetricTransactionNotificationState,
+}
+
+
+def _last_seen_at(member_id, kind):
+    return (
+        _STATE_MODELS[kind].objects.filter(member_id=member_id).values_list("last_seen_at", flat=True).first()
+    )
+
+
+def _unread_reactions(member_id):
+    queryset = MemberMetricTransactionReaction.objects.filter(
+        transaction__entry__member_id=member_id,
+    ).exclude(member_id=member_id)
+    last_seen_at = _last_seen_at(member_id, KIND_TRANSACTION_REACTION)
+    if last_seen_at:
+        queryset = queryset.filter(updated_at__gt=last_seen_at)
+    return queryset
+
+
+def unread_reaction_queryset(member: Member):
+    return _unread_reactions(member.id)
+
+
+def unread_today_transaction_queryset(member: Member, *, today):
+    department_ids = list(member_departments(member).values_list("id", flat=True))
+    queryset = MemberMetricTransaction.objects.filter(
+        entry__entry_date=today,
+        entry__department_id__in=department_ids,
+    ).exclude(entry__member=member)
+    last_seen_at = _last_seen_at(member.id, KIND_TODAY_TRANSACTION)
+    if last_seen_at:
+        queryset = queryset.filter(created_at__gt=last_seen_at)
+    return queryset
+
+
+def reaction_preview(reaction) -> dict:
+    transaction_obj = reaction.transaction
+    entry = transaction_obj.entry
+    return {
+        "reaction_id": reaction.id,
+        "member_name": reaction.member.name,
+        "reaction_type": reaction.reaction_type,
+        "department_code": entry.department.code,
+        "entry_date": entry.entry_date.isoformat(),
+        "amount": int(transaction_obj.support_amount or 0),
+        "location": transaction_obj.location,
+    }
+
+
+def _reaction_previews(queryset) -> list[dict]:
+    reactions = queryset.select_related(
+        "member",
+        "transaction",
+        "transaction__entry",
+        "transaction__entry__department",
+    ).order_by("-updated_at", "-id")[:PREVIEW_LIMIT]
+    return [reaction_preview(reaction) for reaction in reactions]
+
+
+def _source_state(member: Member, kind: str, *, today: date) -> dict:
+    if kind == KIND_TRANSACTION_REACTION:
+        queryset = unread_reaction_queryset(member)
+        return {
+            "unread_count": queryset.count(),
+            "previews": _reaction_previews(queryset),
+            "counted_on": None,
+        }
+    return {
+        "unread_count": unread_today_transaction_queryset(member, today=today).count(),
+        "previews": [],
+        "counted_on": today,
+    }
+
+
+def recount_notification_counter(member: Member, kind: str, *, today: date | None = None) -> MemberNotificationCounter:
+    """Rebuild ``member``'s ``kind`` counter from the source tables."""
+    today = today or timezone.localdate()
+    counter, _created = MemberNotificationCounter.objects.update_or_create(
+        member=member,
+        kind=kind,
+        defaults=_source_state(member, kind, today=today),
+    )
+    return counter
+
+
+def notification_counter(member: Member, kind: str, *, today: date | None = None) -> MemberNotificationCounter:
+    """Return ``member``'s ``kind`` counter, building it on first use."""
+    counter = MemberNotificationCounter.objects.filter(member=member, kind=kind).first()
+    if counter is not None:
+        return counter
+    today = today or timezone.localdate()
+    try:
+        with transaction.atomic():
+            return MemberNotificationCounter.objects.create(
+                member=member,
+                kind=kind,
+                **_source_state(member, kind, today=today),
+            )
+    except IntegrityError:
+        # A concurrent request built the row first.
+        return MemberNotificationCounter.objects.get(member=member, kind=kind)
+
+
+def reset_notification_counter(member: Member, kind: str, *, today: date | None = None) -> None:
+    today = today or timezone.localdate()
+    counted_on = today if kind == KIND_TODAY_TRANSACTION else None
+    MemberNotificationCounter.objects.update_or_create(
+        member=member,
+        kind=kind,
+        defaults={"unread_count": 0, "previews": [], "counted_on": counted_on},
+    )
+
+
+def reconcile_notification_counters(*, member_ids=None, today: date | None = None) -> tuple[int, int]:
+    """Recount existing counters from the source tables; return ``(checked, corrected)``."""
+    today = today or timezone.localdate()
+    counters = MemberNotificationCounter.objects.select_related("member").order_by("member_id", "kind")
+    if member_ids:
+        counters = counters.filter(member_id__in=member_ids)
+    checked = corrected = 0
+    for counter in counters.iterator():
+        checked += 1
+        state = _source_state(counter.member, counter.kind, today=today)
+        if all(getattr(counter, field) == value for field, value in state.items()):
+            continue
+        logger.info(
+            "notification_counter reconcile member_id=%s kind=%s unread_count=%s->%s",
+            counter.member_id,
+            counter.kind,
+            counter.unread_count,
+            state["unread_count"],
+        )
+        for field, value in state.items():
+            setattr(counter, field, value)
+        counter.save(update_fields=[*state, "updated_at"])
+        corrected += 1
+    return checked, corrected
+
+
+def _remember_reaction_updated_at(sender, instance, **kwargs):
+    # ``updated_at`` is ``auto_now``: it still holds the stored value until the save runs.
+    instance._notification_previous_updated_at = instance.updated_at if instance.pk else None
+
+
+def _count_reaction(sender, instance, created=False, **kwargs):
+    reaction = (
+        MemberMetricTransactionReaction.objects.filter(pk=instance.pk)
+        .values("member_id", "transaction__entry__member_id")
+        .first()
+    )
+    if reaction is None:
+        return
+    owner_id = reaction["transaction__entry__member_id"]
+    if owner_id == reaction["member_id"]:
+        return
+    counter = MemberNotificationCounter.objects.filter(member_id=owner_id, kind=KIND_TRANSACTION_REACTION)
+    previous_updated_at = None if created else getattr(instance, "_notification_previous_updated_at", None)
+    last_seen_at = _last_seen_at(owner_id, KIND_TRANSACTION_REACTION)
+    already_unread = previous_updated_at is not None and (last_seen_at is None or previous_updated_at > last_seen_at)
+    changes = {"previews": _reaction_previews(_unread_reactions(owner_id)), "updated_at": timezone.now()}
+    if not already_unread:
+        changes["unread_count"] = F("unread_count") + 1
+    counter.update(**changes)
+
+
+def _refresh_reaction_previews(sender, instance, created=False, **kwargs):
+    # Previews copy the transaction's amount and location; an edit rebuilds them.
+    if created:
+        return
+    owner_id = (
+        MemberDailyMetricEntry.objects.filter(pk=instance.entry_id).values_list("member_id", flat=True).first()
+    )
+    if owner_id is None or not instance.reactions.exclude(member_id=owner_id).exists():
+        return
+    MemberNotificationCounter.objects.filter(member_id=owner_id, kind=KIND_TRANSACTION_REACTION).update(
+        previews=_reaction_previews(_unread_reactions(owner_id)),
+        updated_at=timezone.now(),
+    )
+
+
+def _drop_reaction_counter(sender, instance, **kwargs):
+    owner_id = (
+        MemberMetricTransaction.objects.filter(pk=instance.transaction_id).values_list("entry__member_id", flat=True).first()
+    )
+    if owner_id is not None:
+        MemberNotificationCounter.objects.filter(member_id=owner_id, kind=KIND_TRANSACTION_REACTION).delete()
+
+
+def _today_entry(transaction_obj):
+    entry = transaction_obj._state.fields_cache.get("entry")
+    if entry is None:
+        entry = (
+            MemberDailyMetricEntry.objects.filter(pk=transaction_obj.entry_id)
+            .only("department_id", "member_id", "entry_date")
+            .first()
+        )
+    if entry is None or entry.entry_date != timezone.localdate():
+        return None
+    return entry
+
+
+def _department_colleague_counters(entry):
+    return MemberNotificationCounter.objects.filter(
+        kind=KIND_TODAY_TRANSACTION,
+        member__department_links__department_id=entry.department_id,
+        member__department_links__department__is_active=True,
+    ).exclude(member_id=entry.member_id)
+
+
+def _count_today_transaction(sender, instance, created=False, **kwargs):
+    if not created:
+        return
+    entry = _today_entry(instance)
+    if entry is None:
+        return
+    today = entry.entry_date
+    _department_colleague_counters(entry).update(
+        unread_count=Case(When(counted_on=today, then=F("unread_count") + 1), default=Value(1)),
+        counted_on=today,
+        updated_at=timezone.now(),
+    )
+
+
+def _uncount_today_transaction(sender, instance, **kwargs):
+    entry = _today_entry(instance)
+    if entry is None:
+        return
+    state = "member__metric_transaction_notification_state"
+    _department_colleague_counters(entry).filter(
+        Q(**{f"{state}__isnull": True})
+        | Q(**{f"{state}__last_seen_at__isnull": True})
+        | Q(**{f"{state}__last_seen_at__lt": instance.created_at}),
+        counted_on=entry.entry_date,
+        unread_count__gt=0,
+    ).update(unread_count=F("unread_count") - 1, updated_at=timezone.now())
+
+
+def _drop_today_counter(sender, instance, **kwargs):
+    MemberNotificationCounter.objects.filter(member_id=instance.member_id, kind=KIND_TODAY_TRANSACTION).delete()
+
+
+def connect_notification_counter_signals() -> None:
+    pre_save.connect(
+        _remember_reaction_updated_at,
+        sender=MemberMetricTransactionReaction,
+        dispatch_uid="notification_counter_reaction_pre_save",
+    )
+    post_save.connect(
+        _count_reaction,
+        sender=MemberMetricTransactionReaction,
+        dispatch_uid="notification_counter_reaction_save",
+    )
+    post_delete.connect(
+        _drop_reaction_counter,
+        sender=MemberMetricTransactionReaction,
+        dispatch_uid="notification_counter_reaction_delete",
+    )
+    post_save.connect(
+        _count_today_transaction,
+        sender=MemberMetricTransaction,
+        dispatch_uid="notification_counter_transaction_save",
+    )
+    post_save.connect(
+        _refresh_reaction_previews,
+        sender=MemberMetricTransaction,
+        dispatch_uid="notification_counter_transaction_preview_save",
+    )
+    post_delete.connect(
+        _uncount_today_transaction,
+        sender=MemberMetricTransaction,
+        dispatch_uid="notification_counter_transaction_delete",
+    )
+    post_save.connect(_drop_today_counter, sender=MemberDepartment, dispatch_uid="notification_counter_membership_save")
+    post_delete.connect(
+        _drop_today_counter, sender=MemberDepartment, dispatch_uid="notification_counter_membership_delete"
+    )
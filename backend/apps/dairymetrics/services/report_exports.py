@@ -4,6 +4,7 @@ from config.ai_safety import AI_SAFETY_SYSTEM_RULES, ai_safety_prompt_block
 
 from apps.dairymetrics.models import MemberDailyMetricEntry
 from apps.mail.models import MailSendHistory
+from apps.mail.retention import restore_archived_snapshots
 
 
 def _mail_rows(*, department, scope) -> list[dict]:
@@ -23,7 +24,7 @@ def _mail_rows(*, department, scope) -> list[dict]:
         .order_by("activity_date", "created_at", "id")
     )
     rows = []
-    for history in histories:
+    for history in restore_archived_snapshots(histories):
         transaction = history.transaction
         entry = transaction.entry if transaction and transaction.entry_id else None
         rows.append(
@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from django.db.models import Count, Sum
 
+from config.db_router import replica_reads
+from config.query_profiler import profiled
+
 from apps.dairymetrics.models import MemberDailyMetricEntry, MemberMetricTransaction, MetricAdjustment
 from apps.dairymetrics.services.final_actuals import (
     ENTRY_METRIC_FIELDS,
@@ -15,19 +18,17 @@ from apps.dairymetrics.services.metrics_v2 import (
     _average_amount_per_decision_value,
     _count_value,
     _department_target_amount_for_scope,
-    _daily_un_final_values,
     _format_count_stability_score,
     _format_number,
     _format_percentage,
     _percentage,
-    _reference_active_days,
     _return_amount_value,
     _return_count_value,
     _ranking_members,
     _safe_average,
     _wv_count_breakdown_text,
     build_metrics_v2_distribution_payload,
-    stability_scores_for_daily_values,
+    build_un_stability_scores,
 )
 
 
@@ -80,7 +81,7 @@ def _report_totals_with_returns(*, department_code: str, totals: dict) -> dict:
     return report_totals
 
 
-def _daily_report_rows(*, department, scope):
+def _daily_report_rows(*, department, scope, include_transactions: bool = True):
     daily_totals = {}
     transactions_by_date = {}
 
@@ -100,29 +101,30 @@ def _daily_report_rows(*, department, scope):
         for field in ENTRY_METRIC_FIELDS:
             totals[field] = int(row.get(f"sum_{field}") or 0)
 
-    transactions = (
-        MemberMetricTransaction.objects.filter(
-            entry__department=department,
-            entry__entry_date__range=(scope.start_date, scope.end_date),
-        )
-        .select_related("entry", "entry__member")
-        .order_by("-entry__entry_date", "created_at", "id")
-    )
-    for transaction in transactions:
-        entry_date = transaction.entry.entry_date
-        transaction_type = transaction.get_wv_result_type_display() if department.code == "WV" and transaction.wv_result_type else "決済"
-        transactions_by_date.setdefault(entry_date, []).append(
-            {
-                "member_name": transaction.entry.member.name,
-                "amount_text": _format_number(int(transaction.support_amount or 0), "円"),
-                "type_text": transaction_type,
-                "age_text": transaction.get_age_band_display(),
-                "gender_text": transaction.get_gender_display(),
-                "nationality_text": transaction.get_nationality_type_display(),
-                "location_text": transaction.location or transaction.entry.location_name or "-",
-                "comment": transaction.comment,
-            }
+    if include_transactions:
+        transactions = (
+            MemberMetricTransaction.objects.filter(
+                entry__department=department,
+                entry__entry_date__range=(scope.start_date, scope.end_date),
+            )
+            .select_related("entry", "entry__member")
+            .order_by("-entry__entry_date", "created_at", "id")
         )
+        for transaction in transactions:
+            entry_date = transaction.entry.entry_date
+            transaction_type = transaction.get_wv_result_type_display() if department.code == "WV" and transaction.wv_result_type else "決済"
+            transactions_by_date.setdefault(entry_date, []).append(
+                {
+                    "member_name": transaction.entry.member.name,
+                    "amount_text": _format_number(int(transaction.support_amount or 0), "円"),
+                    "type_text": transaction_type,
+                    "age_text": transaction.get_age_band_display(),
+                    "gender_text": transaction.get_gender_display(),
+                    "nationality_text": transaction.get_nationality_type_display(),
+                    "location_text": transaction.location or transaction.entry.location_name or "-",
+                    "comment": transaction.comment,
+                }
+            )
 
     rows = []
     for entry_date, totals in sorted(daily_totals.items(), reverse=True):
@@ -182,24 +184,13 @@ def _member_report_rows(*, department, scope):
     active_days_by_member_id = {row["member_id"]: int(row["active_days"] or 0) for row in active_day_rows}
     stability_scores_by_member_id = {}
     if department.code == "UN":
-        daily_values_by_member_id = {
-            member.id: _daily_un_final_values(
-                member=member,
-                department=department,
-                start_date=scope.start_date,
-                end_date=scope.end_date,
-            )
-            for member in members
-        }
-        reference_days = _reference_active_days(daily_values_by_member_id, active_days_by_member_id)
-        stability_scores_by_member_id = {
-            member_id: stability_scores_for_daily_values(
-                daily_values=daily_values,
-                reference_active_days=reference_days,
-                active_days=active_days_by_member_id.get(member_id, 0),
-            )
-            for member_id, daily_values in daily_values_by_member_id.items()
-        }
+        stability_scores_by_member_id = build_un_stability_scores(
+            member_ids=member_ids,
+            department=department,
+            start_date=scope.start_date,
+            end_date=scope.end_date,
+            active_days_by_member_id=active_days_by_member_id,
+        )
 
     rows = []
     for member in members:
@@ -301,7 +292,32 @@ def _analysis_chart_payload(*, department, scope) -> dict:
     return build_metrics_v2_distribution_payload(department=department, scope=scope)
 
 
-def build_metrics_scope_report(*, department, scope):
+METRICS_REPORT_LAZY_SECTIONS = ("daily", "members", "distribution")
+
+
+@replica_reads
+def build_metrics_report_section(section: str, *, department, scope) -> dict:
+    """Build one lazily loaded report section (daily table, member table or distribution)."""
+    if section == "daily":
+        return {"daily_rows": _daily_report_rows(department=department, scope=scope)}
+    if section == "members":
+        return {"member_rows": _member_report_rows(department=department, scope=scope)}
+    if section == "distribution":
+        analysis_chart_payload = _analysis_chart_payload(department=department, scope=scope)
+        return {"analysis_chart_payload": analysis_chart_payload, **analysis_chart_payload}
+    raise ValueError(f"unknown report section: {section}")
+
+
+@replica_reads
+@profiled("metrics_report_summary")
+def build_metrics_report_summary(*, department, scope, daily_rows=None) -> dict:
+    """Build the report shell: summary, target and adjustment cards plus the adjustment list.
+
+    Highest/lowest days only need daily totals, so without ``daily_rows`` the
+    per-day transaction lists are not loaded.
+    """
+    if daily_rows is None:
+        daily_rows = _daily_report_rows(department=department, scope=scope, include_transactions=False)
     final_totals = collect_department_final_actual_totals(
         department,
         scope.start_date,
@@ -345,12 +361,9 @@ def build_metrics_scope_report(*, department, scope):
         .distinct()
         .count()
     )
-    daily_rows = _daily_report_rows(department=department, scope=scope)
     highest_amount_day = max(daily_rows, key=lambda row: row["amount_value"], default=None)
     lowest_amount_day = min(daily_rows, key=lambda row: row["amount_value"], default=None)
 
-    analysis_chart_payload = _analysis_chart_payload(department=department, scope=scope)
-
     return {
         "department": department,
         "scope": scope,
@@ -419,9 +432,17 @@ def build_metrics_scope_report(*, department, scope):
             {"label": "戻り件数", "value": _format_number(return_count)},
             {"label": "戻り金額", "value": _format_number(return_amount, "円")},
         ],
-        "daily_rows": daily_rows,
-        "member_rows": _member_report_rows(department=department, scope=scope),
         "adjustment_rows": _adjustment_report_rows(department=department, scope=scope),
-        "analysis_chart_payload": analysis_chart_payload,
-        **analysis_chart_payload,
     }
+
+
+@replica_reads
+@profiled("metrics_scope_report")
+def build_metrics_scope_report(*, department, scope):
+    daily_rows = _daily_report_rows(department=department, scope=scope)
+    report = build_metrics_report_summary(department=department, scope=scope, daily_rows=daily_rows)
+    report["daily_rows"] = daily_rows
+    for section in METRICS_REPORT_LAZY_SECTIONS:
+        if section != "daily":
+            report.update(build_metrics_report_section(section, department=department, scope=scope))
+    return report
@@ -2,23 +2,8 @@ from django.utils import timezone
 
 from apps.accounts.models import Member
 
-from ..models import (
-    MemberMetricTransaction,
-    MemberMetricTransactionNotificationState,
-)
-from .entry_context import member_departments
-
-
-def _today_transaction_queryset(member: Member, *, today, unread_only: bool = False):
-    state = getattr(member, "metric_transaction_notification_state", None)
-    department_ids = list(member_departments(member).values_list("id", flat=True))
-    queryset = MemberMetricTransaction.objects.filter(
-        entry__entry_date=today,
-        entry__department_id__in=department_ids,
-    ).exclude(entry__member=member)
-    if unread_only and state and state.last_seen_at:
-        queryset = queryset.filter(created_at__gt=state.last_seen_at)
-    return queryset
+from ..models import MemberMetricTransactionNotificationState
+from .notification_counters import KIND_TODAY_TRANSACTION, notification_counter, reset_notification_counter
 
 
 def unread_today_transaction_notification(*, member: Member, url: str = "", today=None) -> dict:
@@ -26,9 +11,11 @@ def unread_today_transaction_notification(*, member: Member, url: str = "", toda
         return {"count": 0, "url": url, "items": []}
 
     today = today or timezone.localdate()
-    queryset = _today_transaction_queryset(member, today=today, unread_only=True)
+    counter = notification_counter(member, KIND_TODAY_TRANSACTION, today=today)
+    # A counter last touched on an earlier day has nothing unread for today.
+    count = counter.unread_count if counter.counted_on == today else 0
     return {
-        "count": queryset.count(),
+        "count": count,
         "url": url,
         "items": [],
     }
@@ -41,3 +28,4 @@ def mark_today_transaction_notifications_seen(*, member: Member) -> None:
         member=member,
         defaults={"last_seen_at": timezone.now()},
     )
+    reset_notification_counter(member, KIND_TODAY_TRANSACTION)
@@ -8,7 +8,10 @@ urlpatterns = [
     path("entry-v2-transaction/personal-setup-fields/", views.entry_v2_personal_setup_fields, name="dairymetrics_entry_v2_personal_setup_fields"),
     path("entry-v2-transaction/reaction/", views.transaction_reaction_update, name="dairymetrics_transaction_reaction_update"),
     path("entry-v2-transaction/", views.entry_form_v2_transaction, name="dairymetrics_entry_v2_transaction_demo"),
+    path("live/<int:department_id>/stream/", views.live_board_stream, name="dairymetrics_live_board_stream"),
+    path("live/<int:department_id>/poll/", views.live_board_poll, name="dairymetrics_live_board_poll"),
     path("metrics-v2/", views.metrics_v2, name="dairymetrics_metrics_v2_demo"),
+    path("metrics-v2/sections/<slug:section>/", views.metrics_v2_section, name="dairymetrics_metrics_v2_section"),
     path("metrics-report/", views.metrics_report, name="dairymetrics_metrics_report"),
-    path("metrics-report/export/", views.metrics_report_export, name="dairymetrics_metrics_report_export"),
+    path("metrics-report/sections/<slug:section>/", views.metrics_report_section, name="dairymetrics_metrics_report_section"),
 ]
@@ -52,7 +52,8 @@ from .services.transaction_notifications import (
     unread_today_transaction_notification,
 )
 from .view_helpers import login_redirect_url
-from .views_metrics import metrics_report, metrics_report_export, metrics_v2
+from .views_live import live_board_poll, live_board_stream
+from .views_metrics import metrics_report, metrics_report_section, metrics_v2, metrics_v2_section
 from .views_transaction_partials import render_department_target_form_partial, render_personal_setup_form_partial
 
 
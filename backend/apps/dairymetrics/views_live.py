@@ -0,0 +1,87 @@
+import json
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+
+from config.event_bus import bus
+
+from .auth import require_dairymetrics_member
+from .services.live_board import (
+    build_live_board_snapshot,
+    live_board_channel,
+    live_board_department_for_user,
+    reconcile_live_board,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@require_dairymetrics_member
+def live_board_poll(request: HttpRequest, department_id: int) -> HttpResponse:
+    """Polling fallback: return board events after ``cursor`` without waiting.
+
+    The client schedules the next poll itself and backs off while the board is
+    quiet, so a poll never holds a WSGI thread or a database connection open.
+    """
+    department = live_board_department_for_user(request.user, department_id)
+    if department is None:
+        raise Http404()
+    channel = live_board_channel(department.id)
+    reconcile_live_board(department)
+    events = bus.events_since(channel, request.GET.get("cursor", ""))
+    if events is None:
+        cursor = bus.cursor()
+        events = [build_live_board_snapshot(department=department)]
+    else:
+        cursor = bus.cursor(events[-1]["id"]) if events else request.GET.get("cursor", "")
+    return JsonResponse(
+        {
+            "cursor": cursor,
+            "events": events,
+            "poll_interval_ms": int(float(settings.LIVE_BOARD_POLL_INTERVAL_SECONDS) * 1000),
+            "poll_max_interval_ms": int(float(settings.LIVE_BOARD_POLL_MAX_INTERVAL_SECONDS) * 1000),
+        }
+    )
+
+
+def _sse_message(event: dict) -> str:
+    data = f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+    return f"id: {bus.cursor(event['id'])}\n{data}" if "id" in event else data
+
+
+async def _live_board_events(department):
+    channel = live_board_channel(department.id)
+    reconcile_seconds = float(settings.LIVE_BOARD_RECONCILE_SECONDS)
+    deadline = time.monotonic() + float(settings.LIVE_BOARD_STREAM_MAX_SECONDS)
+    async with bus.asubscribe(channel) as subscription:
+        yield "retry: 5000\n\n"
+        yield _sse_message(await sync_to_async(build_live_board_snapshot)(department=department))
+        while time.monotonic() < deadline:
+            event = await subscription.get(timeout=reconcile_seconds)
+            if event is not None:
+                yield _sse_message(event)
+                continue
+            await sync_to_async(reconcile_live_board)(department)
+            yield ": keep-alive\n\n"
+    # Ending the response makes EventSource reconnect, so no request outlives the platform timeout.
+    logger.debug("live_board stream_end department_id=%s", department.id)
+
+
+async def live_board_stream(request: HttpRequest, department_id: int) -> HttpResponse:
+    """Server-sent events for the live board. Only served by the ASGI application."""
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI a stream would pin a worker thread; 204 tells EventSource to stop and use polling.
+        return HttpResponse(status=204)
+    user = await request.auser()
+    department = await sync_to_async(live_board_department_for_user)(user, department_id)
+    if department is None:
+        raise Http404()
+    response = StreamingHttpResponse(_live_board_events(department), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -1,18 +1,28 @@
-from urllib.parse import urlencode
-
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.dateparse import parse_date
 
+from apps.common.conditional_get import conditional_on_data_version
 from apps.common.target_periods import period_options_active_first
 
 from .auth import get_member_profile, require_dairymetrics_member
 from .services.entry_context import parse_month_input, resolve_metrics_v2_department
-from .services.metrics_v2 import build_metrics_v2_dashboard_payload, resolve_metrics_v2_scope
-from .services.report_exports import build_report_ai_text, build_report_export_payload
-from .services.reports import build_metrics_scope_report
+from .services.metrics_v2 import (
+    METRICS_V2_LAZY_SECTIONS,
+    METRICS_V2_SUMMARY_PARTS,
+    build_metrics_v2_payload_parts,
+    build_metrics_v2_section_payload,
+    resolve_metrics_v2_scope,
+)
+from .services.metrics_v2_ranking import ranking_metric_options_for_department
+from .services.reports import (
+    METRICS_REPORT_LAZY_SECTIONS,
+    build_metrics_report_section,
+    build_metrics_report_summary,
+)
 from .view_helpers import login_redirect_url, member_directory_queryset, requested_or_current_period
 
 
@@ -37,12 +47,19 @@ def _shared_navigation_context(*, request, viewer_member, selected_department, s
     }
 
 
-@require_dairymetrics_member
-def metrics_v2(request: HttpRequest) -> HttpResponse:
+def _section_urls(request, url_name, sections) -> dict:
+    query = request.GET.urlencode()
+    return {
+        section: f"{reverse(url_name, args=[section])}{'?' + query if query else ''}"
+        for section in sections
+    }
+
+
+def _metrics_v2_request_state(request):
     viewer_member = get_member_profile(request.user)
     departments, selected_department = resolve_metrics_v2_department(request=request, member=viewer_member)
     if not selected_department:
-        return redirect(login_redirect_url(request.user))
+        return None
     selected_member = None
     raw_member_id = (request.GET.get("member") or "").strip()
     if request.user.is_staff and raw_member_id.isdigit():
@@ -56,7 +73,6 @@ def metrics_v2(request: HttpRequest) -> HttpResponse:
     today = timezone.localdate()
     requested_scope = (request.GET.get("scope") or "recent").strip()
     requested_month = parse_month_input(request.GET.get("month") or "")
-    available_periods = period_options_active_first(target_date=today, limit=18)
     requested_period = None
     if requested_scope == "period":
         requested_period = requested_or_current_period(request, today=today)
@@ -71,23 +87,44 @@ def metrics_v2(request: HttpRequest) -> HttpResponse:
         requested_start_date=requested_start_date,
         requested_end_date=requested_end_date,
     )
-    payload = build_metrics_v2_dashboard_payload(
-        department=selected_department,
-        scope=scope,
-        member=selected_member if request.user.is_staff else viewer_member,
-    )
-    ranking_metric_map = payload.get("ranking", {}).get("metric_map", {})
-    for metric_payload in ranking_metric_map.values():
-        detail_urls = []
-        for row in metric_payload.get("rows", []):
-            detail_url = reverse(
-                "performance_member_insight",
-                args=[row["member_id"], selected_department.id],
-            )
-            row["detail_url"] = detail_url
-            detail_urls.append(detail_url)
-        metric_payload["detail_urls"] = detail_urls
-    payload_json = {**payload, "scope": {"scope": scope.scope, "label": scope.label}}
+    return {
+        "today": today,
+        "viewer_member": viewer_member,
+        "departments": departments,
+        "selected_department": selected_department,
+        "selected_member": selected_member,
+        "payload_member": selected_member if request.user.is_staff else viewer_member,
+        "scope": scope,
+    }
+
+
+METRICS_SECTION_ERROR_MESSAGE = "一部の集計を読み込めませんでした。再読み込みしてください。"
+
+
+@require_dairymetrics_member
+@conditional_on_data_version()
+def metrics_v2(request: HttpRequest) -> HttpResponse:
+    state = _metrics_v2_request_state(request)
+    if state is None:
+        return redirect(login_redirect_url(request.user))
+    today = state["today"]
+    viewer_member = state["viewer_member"]
+    selected_department = state["selected_department"]
+    selected_member = state["selected_member"]
+    scope = state["scope"]
+    payload = {
+        "scope": scope,
+        **build_metrics_v2_payload_parts(
+            METRICS_V2_SUMMARY_PARTS,
+            department=selected_department,
+            scope=scope,
+            member=state["payload_member"],
+        ),
+    }
+    payload_json = {
+        "scope": {"scope": scope.scope, "label": scope.label},
+        "section_urls": _section_urls(request, "dairymetrics_metrics_v2_section", METRICS_V2_LAZY_SECTIONS),
+    }
     if request.user.is_staff:
         metrics_page_subtitle = (
             f"{selected_member.name}さん / {selected_department.name} の分析"
@@ -101,17 +138,19 @@ def metrics_v2(request: HttpRequest) -> HttpResponse:
         "member": viewer_member,
         "selected_member": selected_member,
         "selected_department": selected_department,
-        "departments": departments,
+        "departments": state["departments"],
         "scope": scope,
         "scope_value": scope.scope,
         "month_value": (scope.month_start or today.replace(day=1)).strftime("%Y-%m"),
         "start_date_value": scope.start_date.strftime("%Y-%m-%d"),
         "end_date_value": scope.end_date.strftime("%Y-%m-%d"),
-        "period_options": available_periods,
+        "period_options": period_options_active_first(target_date=today, limit=18),
         "selected_period_id": scope.period.id if scope.period else "",
+        "ranking_options": ranking_metric_options_for_department(selected_department.code),
         "metrics_v2_payload": payload,
         "metrics_v2_payload_json": payload_json,
         "metrics_page_subtitle": metrics_page_subtitle,
+        "metrics_section_error_message": METRICS_SECTION_ERROR_MESSAGE if payload.get("section_errors") else "",
         **_shared_navigation_context(
             request=request,
             viewer_member=viewer_member,
@@ -119,10 +158,49 @@ def metrics_v2(request: HttpRequest) -> HttpResponse:
             selected_member=selected_member,
         ),
     }
-    return render(request, "dairymetrics/metrics_v2.html", context)
+    # A page with a missing summary must not be revalidated as current.
+    status = 503 if payload.get("section_errors") else 200
+    return render(request, "dairymetrics/metrics_v2.html", context, status=status)
 
 
-def metrics_report_data(request):
+@require_dairymetrics_member
+@conditional_on_data_version()
+def metrics_v2_section(request: HttpRequest, section: str) -> HttpResponse:
+    if section not in METRICS_V2_LAZY_SECTIONS:
+        raise Http404("Unknown metrics section.")
+    state = _metrics_v2_request_state(request)
+    if state is None:
+        raise Http404("Department not found.")
+    selected_department = state["selected_department"]
+    payload = build_metrics_v2_section_payload(
+        section,
+        department=selected_department,
+        scope=state["scope"],
+        member=state["payload_member"],
+    )
+    if payload.get("section_errors"):
+        return JsonResponse({"section": section, "error": METRICS_SECTION_ERROR_MESSAGE}, status=503)
+    if section == "ranking":
+        for metric_payload in payload["ranking"]["metric_map"].values():
+            detail_urls = []
+            for row in metric_payload.get("rows", []):
+                detail_url = reverse(
+                    "performance_member_insight",
+                    args=[row["member_id"], selected_department.id],
+                )
+                row["detail_url"] = detail_url
+                detail_urls.append(detail_url)
+            metric_payload["detail_urls"] = detail_urls
+    if section == "distribution":
+        payload["html"] = render_to_string(
+            "dairymetrics/partials/metrics_distribution_cards.html",
+            {"distribution_cards": payload["distribution_cards"]},
+            request=request,
+        )
+    return JsonResponse({"section": section, **payload})
+
+
+def _metrics_report_request_state(request):
     viewer_member = get_member_profile(request.user)
     departments, selected_department = resolve_metrics_v2_department(request=request, member=viewer_member)
     if not selected_department:
@@ -133,7 +211,6 @@ def metrics_report_data(request):
     if requested_scope not in {"month", "period"}:
         requested_scope = "month"
     requested_month = parse_month_input(request.GET.get("month") or "")
-    period_options = period_options_active_first(target_date=today)
     requested_period = None
     if requested_scope == "period":
         requested_period = requested_or_current_period(request, today=today)
@@ -146,28 +223,40 @@ def metrics_report_data(request):
     )
     if requested_scope == "period" and scope.scope != "period":
         scope = resolve_metrics_v2_scope(today=today, scope="month", requested_month=requested_month)
+    return {
+        "today": today,
+        "viewer_member": viewer_member,
+        "departments": departments,
+        "selected_department": selected_department,
+        "scope": scope,
+    }
 
-    report = build_metrics_scope_report(department=selected_department, scope=scope)
-    export_query = urlencode(
-        {
-            "department": selected_department.code,
-            "scope": scope.scope,
-            "month": (scope.month_start or today.replace(day=1)).strftime("%Y-%m"),
-            "period_id": scope.period.id if scope.period else "",
-        }
-    )
+
+REPORT_EXPORT_FORMATS = (("txt", "AI用テキスト"), ("json", "JSON"))
+
+
+def metrics_report_data(request):
+    state = _metrics_report_request_state(request)
+    if state is None:
+        return None
+    today = state["today"]
+    viewer_member = state["viewer_member"]
+    selected_department = state["selected_department"]
+    scope = state["scope"]
+
+    report = build_metrics_report_summary(department=selected_department, scope=scope)
     return {
         "is_admin": request.user.is_staff,
         "member": viewer_member,
-        "departments": departments,
+        "departments": state["departments"],
         "selected_department": selected_department,
         "scope": scope,
         "scope_value": scope.scope,
         "month_value": (scope.month_start or today.replace(day=1)).strftime("%Y-%m"),
-        "period_options": period_options,
+        "period_options": period_options_active_first(target_date=today),
         "selected_period_id": scope.period.id if scope.period else "",
         "report": report,
-        "report_export_query": export_query,
+        "report_export_formats": REPORT_EXPORT_FORMATS,
         "metrics_report_page_subtitle": f"{selected_department.name} / {scope.label}",
         **_shared_navigation_context(
             request=request,
@@ -178,40 +267,43 @@ def metrics_report_data(request):
 
 
 @require_dairymetrics_member
+@conditional_on_data_version()
 def metrics_report(request: HttpRequest) -> HttpResponse:
     context = metrics_report_data(request)
     if context is None:
         return redirect(login_redirect_url(request.user))
+    context["metrics_report_payload_json"] = {
+        "section_urls": _section_urls(request, "dairymetrics_metrics_report_section", METRICS_REPORT_LAZY_SECTIONS),
+    }
     return render(request, "dairymetrics/metrics_report.html", context)
 
 
-@require_dairymetrics_member
-def metrics_report_export(request: HttpRequest) -> HttpResponse:
-    context = metrics_report_data(request)
-    if context is None:
-        return redirect(login_redirect_url(request.user))
+METRICS_REPORT_SECTION_TEMPLATES = {
+    "daily": "dairymetrics/partials/metrics_report_daily_section.html",
+    "members": "dairymetrics/partials/metrics_report_member_section.html",
+    "distribution": "dairymetrics/partials/metrics_distribution_cards.html",
+}
 
-    payload = build_report_export_payload(
-        department=context["selected_department"],
-        scope=context["scope"],
-        report=context["report"],
-    )
-    export_format = (request.GET.get("format") or "txt").strip().lower()
-    filename_base = (
-        f"metrics-report-{context['selected_department'].code}-"
-        f"{context['scope'].start_date:%Y%m%d}-{context['scope'].end_date:%Y%m%d}"
-    )
-    if export_format == "json":
-        response = JsonResponse(
-            payload,
-            json_dumps_params={"ensure_ascii": False, "indent": 2},
-        )
-        response["Content-Disposition"] = f'attachment; filename="{filename_base}.json"'
-        return response
 
-    response = HttpResponse(
-        build_report_ai_text(payload),
-        content_type="text/plain; charset=utf-8",
+@require_dairymetrics_member
+@conditional_on_data_version()
+def metrics_report_section(request: HttpRequest, section: str) -> HttpResponse:
+    if section not in METRICS_REPORT_LAZY_SECTIONS:
+        raise Http404("Unknown report section.")
+    state = _metrics_report_request_state(request)
+    if state is None:
+        raise Http404("Department not found.")
+    report = build_metrics_report_section(section, department=state["selected_department"], scope=state["scope"])
+    html = render_to_string(
+        METRICS_REPORT_SECTION_TEMPLATES[section],
+        {
+            "report": report,
+            "distribution_cards": report.get("distribution_cards", []),
+            "selected_department": state["selected_department"],
+        },
+        request=request,
     )
-    response["Content-Disposition"] = f'attachment; filename="{filename_base}.txt"'
-    return response
+    data = {"section": section, "html": html}
+    if section == "distribution":
+        data["average_amount_comparison"] = report["average_amount_comparison"]
+    return JsonResponse(data)
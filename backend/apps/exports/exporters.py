@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zipfile
+from dataclasses import dataclass
+
+from django.utils import timezone
+
+from apps.accounts.models import Department
+from apps.dairymetrics.services.entry_context import parse_month_input
+from apps.dairymetrics.services.metrics_v2 import resolve_metrics_v2_scope
+from apps.dairymetrics.services.report_exports import build_report_ai_text, build_report_export_payload
+from apps.dairymetrics.services.reports import build_metrics_scope_report
+from apps.mail.models import MailSendHistory
+from apps.mail.retention import restore_archived_snapshots
+from apps.targets.models import Period, TARGET_STATUS_PLANNED
+from apps.testimony.services.legacy_csv import write_legacy_articles_csv, write_legacy_products_csv
+from config.db_router import replica_reads
+
+from .models import ExportJob
+
+
+class ExportParamsError(ValueError):
+    pass
+
+
+@dataclass
+class ExportArtifact:
+    filename: str
+    content_type: str
+    content: bytes
+
+
+MAIL_HISTORY_CSV_HEADER = [
+    "activity_date",
+    "department",
+    "sender_member",
+    "recipient_group",
+    "subject",
+    "recipients",
+    "status",
+    "is_test",
+    "is_resend",
+    "sent_at",
+    "error_code",
+    "error_message",
+]
+
+
+def _metrics_report_scope(params: dict):
+    today = timezone.localdate()
+    scope_value = params.get("scope") or "month"
+    if scope_value not in {"month", "period"}:
+        scope_value = "month"
+    requested_month = parse_month_input(params.get("month") or "")
+    requested_period = None
+    raw_period_id = str(params.get("period_id") or "").strip()
+    if scope_value == "period" and raw_period_id.isdigit():
+        requested_period = Period.objects.exclude(status=TARGET_STATUS_PLANNED).filter(pk=int(raw_period_id)).first()
+    scope = resolve_metrics_v2_scope(
+        today=today,
+        scope=scope_value,
+        requested_month=requested_month,
+        requested_period=requested_period,
+    )
+    if scope_value == "period" and scope.scope != "period":
+        scope = resolve_metrics_v2_scope(today=today, scope="month", requested_month=requested_month)
+    return scope
+
+
+@replica_reads
+def export_metrics_report(params: dict, progress) -> ExportArtifact:
+    department = Department.objects.filter(code=params.get("department") or "", is_active=True).first()
+    if department is None:
+        raise ExportParamsError("部署が見つかりません。")
+    export_format = (params.get("format") or "txt").strip().lower()
+    scope = _metrics_report_scope(params)
+
+    progress(0, 3, "集計中")
+    report = build_metrics_scope_report(department=department, scope=scope)
+    progress(1, 3, "明細を収集中")
+    payload = build_report_export_payload(department=department, scope=scope, report=report)
+    progress(2, 3, "ファイルを作成中")
+
+    filename_base = f"metrics-report-{department.code}-{scope.start_date:%Y%m%d}-{scope.end_date:%Y%m%d}"
+    if export_format == "json":
+        return ExportArtifact(
+            filename=f"{filename_base}.json",
+            content_type="application/json",
+            content=json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8"),
+        )
+    return ExportArtifact(
+        filename=f"{filename_base}.txt",
+        content_type="text/plain; charset=utf-8",
+        content=build_report_ai_text(payload).encode("utf-8"),
+    )
+
+
+def export_testimony_articles(params: dict, progress) -> ExportArtifact:
+    products = io.StringIO()
+    write_legacy_products_csv(products)
+    articles = io.StringIO()
+    write_legacy_articles_csv(articles, progress=lambda done, total: progress(done, total, "記事を書き出し中"))
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("products.csv", products.getvalue().encode("utf-8"))
+        archive.writestr("articles.csv", articles.getvalue().encode("utf-8"))
+    return ExportArtifact(
+        filename=f"testimony-legacy-{timezone.localdate():%Y%m%d}.zip",
+        content_type="application/zip",
+        content=buffer.getvalue(),
+    )
+
+
+def _iter_with_archived_snapshots(histories, *, chunk_size):
+    chunk = []
+    for history in histories.iterator(chunk_size=chunk_size):
+        chunk.append(history)
+        if len(chunk) == chunk_size:
+            yield from restore_archived_snapshots(chunk)
+            chunk = []
+    yield from restore_archived_snapshots(chunk)
+
+
+def export_mail_history(params: dict, progress) -> ExportArtifact:
+    histories = MailSendHistory.objects.select_related("department", "sender_member", "recipient_group")
+    status_filter = (params.get("status") or "").strip()
+    if status_filter:
+        histories = histories.filter(status=status_filter)
+    total = histories.count()
+
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(MAIL_HISTORY_CSV_HEADER)
+    written = 0
+    for history in _iter_with_archived_snapshots(histories, chunk_size=500):
+        writer.writerow(
+            [
+                history.activity_date.isoformat(),
+                history.department.code if history.department else "",
+                history.sender_member.name if history.sender_member else "",
+                history.recipient_group.name if history.recipient_group else "",
+                history.subject_snapshot,
+                history.sent_to_snapshot,
+                history.status,
+                int(history.is_test),
+                int(history.is_resend),
+                history.sent_at.isoformat() if history.sent_at else "",
+                history.error_code,
+                history.error_message,
+            ]
+        )
+        written += 1
+        if written % 500 == 0:
+            progress(written, total, "履歴を書き出し中")
+    progress(written, total, "履歴を書き出し中")
+    return ExportArtifact(
+        filename=f"mail-history-{timezone.localdate():%Y%m%d}.csv",
+        content_type="text/csv; charset=utf-8",
+        # A BOM keeps Excel from misreading the Japanese subject lines.
+        content=output.getvalue().encode("utf-8-sig"),
+    )
+
+
+EXPORTERS = {
+    ExportJob.KIND_METRICS_REPORT: export_metrics_report,
+    ExportJob.KIND_TESTIMONY_ARTICLES: export_testimony_articles,
+    ExportJob.KIND_MAIL_HISTORY: export_mail_history,
+}
@@ -0,0 +1,20 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from apps.exports.services import run_pending_export_jobs
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Run queued export jobs and store their artifacts."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=0, help="Maximum number of jobs to run. 0 means all pending jobs.")
+
+    def handle(self, *args, **options):
+        processed = run_pending_export_jobs(limit=options["limit"] or None)
+        logger.info("export_job_runner complete processed=%s", processed)
+        self.stdout.write(f"Export jobs processed: {processed}")
@@ -0,0 +1,41 @@
+# Generated by Django 6.0.3 on 2026-10-18 23:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('metrics_report', '振り返りレポート'), ('testimony_articles', '証記事CSV'), ('mail_history', 'メール送信履歴CSV')], max_length=32)),
+                ('status', models.CharField(choices=[('pending', '待機中'), ('running', '作成中'), ('succeeded', '完了'), ('failed', '失敗')], default='pending', max_length=16)),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('progress_done', models.PositiveIntegerField(default=0)),
+                ('progress_total', models.PositiveIntegerField(default=0)),
+                ('progress_message', models.CharField(blank=True, max_length=255)),
+                ('artifact', models.FileField(blank=True, upload_to='exports/%Y/%m/')),
+                ('artifact_name', models.CharField(blank=True, max_length=255)),
+                ('content_type', models.CharField(blank=True, max_length=128)),
+                ('error_message', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='exports_job_status_created')],
+            },
+        ),
+    ]
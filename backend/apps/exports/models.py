@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.db import models
+
+
+class ExportJob(models.Model):
+    KIND_METRICS_REPORT = "metrics_report"
+    KIND_TESTIMONY_ARTICLES = "testimony_articles"
+    KIND_MAIL_HISTORY = "mail_history"
+    KIND_CHOICES = [
+        (KIND_METRICS_REPORT, "振り返りレポート"),
+        (KIND_TESTIMONY_ARTICLES, "証記事CSV"),
+        (KIND_MAIL_HISTORY, "メール送信履歴CSV"),
+    ]
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_SUCCEEDED = "succeeded"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "待機中"),
+        (STATUS_RUNNING, "作成中"),
+        (STATUS_SUCCEEDED, "完了"),
+        (STATUS_FAILED, "失敗"),
+    ]
+    FINISHED_STATUSES = {STATUS_SUCCEEDED, STATUS_FAILED}
+
+    kind = models.CharField(max_length=32, choices=KIND_CHOICES)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    params = models.JSONField(default=dict, blank=True)
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="export_jobs",
+    )
+    progress_done = models.PositiveIntegerField(default=0)
+    progress_total = models.PositiveIntegerField(default=0)
+    progress_message = models.CharField(max_length=255, blank=True)
+    artifact = models.FileField(upload_to="exports/%Y/%m/", blank=True)
+    artifact_name = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=128, blank=True)
+    error_message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed on every progress update; a running job whose heartbeat stops is reclaimed.
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="exports_job_status_created"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()} #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in self.FINISHED_STATUSES
+
+    @property
+    def progress_percent(self) -> int:
+        if self.status == self.STATUS_SUCCEEDED:
+            return 100
+        if not self.progress_total:
+            return 0
+        return min(99, int(self.progress_done * 100 / self.progress_total))
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.urls import reverse
+from django.utils import timezone
+
+from .exporters import EXPORTERS, ExportParamsError
+from .models import ExportJob
+
+
+logger = logging.getLogger(__name__)
+
+RUNNER_THREAD = "thread"
+RUNNER_COMMAND = "command"
+
+INTERRUPTED_MESSAGE = "作成が中断されました。もう一度お試しください。"
+RECOVERY_INTERVAL_SECONDS = 60
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_last_recovery = float("-inf")
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, int(getattr(settings, "EXPORT_JOB_THREADS", 1))),
+                thread_name_prefix="export-job",
+            )
+        return _executor
+
+
+def _run_export_job_in_thread(job_id: int) -> None:
+    close_old_connections()
+    try:
+        run_export_job(job_id)
+    except Exception:
+        logger.exception("export_job thread_error job_id=%s", job_id)
+    finally:
+        close_old_connections()
+
+
+def _submit_export_jobs(job_ids) -> None:
+    for job_id in job_ids:
+        _get_executor().submit(_run_export_job_in_thread, job_id)
+
+
+def enqueue_export_job(*, kind: str, params: dict | None = None, requested_by=None) -> ExportJob:
+    if kind not in EXPORTERS:
+        raise ExportParamsError(f"unknown export kind: {kind}")
+    job = ExportJob.objects.create(
+        kind=kind,
+        params=params or {},
+        requested_by=requested_by if requested_by and requested_by.is_authenticated else None,
+    )
+    logger.info("export_job queued job_id=%s kind=%s", job.pk, kind)
+    if getattr(settings, "EXPORT_JOB_RUNNER", RUNNER_THREAD) == RUNNER_THREAD:
+        # The worker thread uses its own DB connection, so it must not start
+        # before the row above is visible outside this transaction.
+        transaction.on_commit(lambda: _submit_export_jobs([job.pk]))
+    return job
+
+
+def _progress_updater(job: ExportJob):
+    def update(done: int, total: int, message: str = "") -> None:
+        _current_attempt(job).update(
+            progress_done=max(0, int(done)),
+            progress_total=max(0, int(total)),
+            progress_message=message[:255],
+            heartbeat_at=timezone.now(),
+        )
+
+    return update
+
+
+def _current_attempt(job: ExportJob):
+    # A job reclaimed after its heartbeat stopped belongs to a newer attempt;
+    # the old runner must not overwrite it.
+    return ExportJob.objects.filter(pk=job.pk, status=ExportJob.STATUS_RUNNING, attempts=job.attempts)
+
+
+def _mark_export_job_failed(job: ExportJob, message: str) -> ExportJob:
+    _current_attempt(job).update(
+        status=ExportJob.STATUS_FAILED,
+        error_message=message,
+        finished_at=timezone.now(),
+    )
+    job.refresh_from_db()
+    return job
+
+
+def run_export_job(job_id: int) -> ExportJob | None:
+    now = timezone.now()
+    claimed = ExportJob.objects.filter(pk=job_id, status=ExportJob.STATUS_PENDING).update(
+        status=ExportJob.STATUS_RUNNING,
+        started_at=now,
+        heartbeat_at=now,
+        attempts=F("attempts") + 1,
+    )
+    if not claimed:
+        return None
+    job = ExportJob.objects.get(pk=job_id)
+    exporter = EXPORTERS[job.kind]
+    try:
+        artifact = exporter(job.params, _progress_updater(job))
+    except ExportParamsError as exc:
+        logger.warning("export_job invalid_params job_id=%s kind=%s reason=%s", job.pk, job.kind, exc)
+        return _mark_export_job_failed(job, str(exc))
+    except Exception as exc:
+        logger.exception("export_job failed job_id=%s kind=%s", job.pk, job.kind)
+        return _mark_export_job_failed(job, str(exc) or exc.__class__.__name__)
+
+    artifact_name = job.artifact.storage.save(
+        job.artifact.field.generate_filename(job, artifact.filename),
+        ContentFile(artifact.content),
+    )
+    finished = _current_attempt(job).update(
+        artifact=artifact_name,
+        artifact_name=artifact.filename,
+        content_type=artifact.content_type,
+        status=ExportJob.STATUS_SUCCEEDED,
+        progress_done=Greatest(F("progress_total"), 1),
+        progress_total=Greatest(F("progress_total"), 1),
+        progress_message="",
+        finished_at=timezone.now(),
+    )
+    if not finished:
+        job.artifact.storage.delete(artifact_name)
+        logger.warning("export_job superseded job_id=%s attempt=%s", job.pk, job.attempts)
+        return None
+    job.refresh_from_db()
+    logger.info("export_job succeeded job_id=%s kind=%s size=%s", job.pk, job.kind, len(artifact.content))
+    return job
+
+
+def recover_stale_export_jobs() -> list[int]:
+    """Reclaim running jobs whose runner stopped sending heartbeats.
+
+    An instance shut down or restarted mid-export leaves its job RUNNING
+    forever. Such a job goes back to the queue until it has been tried
+    ``EXPORT_JOB_MAX_ATTEMPTS`` times, then fails. Returns the re-queued ids.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=float(getattr(settings, "EXPORT_JOB_STALE_SECONDS", 900)))
+    max_attempts = int(getattr(settings, "EXPORT_JOB_MAX_ATTEMPTS", 2))
+    stale = ExportJob.objects.filter(status=ExportJob.STATUS_RUNNING).filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+    )
+    failed = stale.filter(attempts__gte=max_attempts).update(
+        status=ExportJob.STATUS_FAILED,
+        error_message=INTERRUPTED_MESSAGE,
+        finished_at=now,
+    )
+    requeued = list(stale.filter(attempts__lt=max_attempts).values_list("id", flat=True))
+    if requeued:
+        stale.filter(id__in=requeued).update(
+            status=ExportJob.STATUS_PENDING,
+            progress_message="",
+        )
+    if failed or requeued:
+        logger.warning("export_job recovered requeued=%s failed=%s", len(requeued), failed)
+    return requeued
+
+
+def reclaim_stale_export_jobs() -> None:
+    """Run ``recover_stale_export_jobs`` at most once a minute per process, resubmitting to the thread pool."""
+    global _last_recovery
+    with _executor_lock:
+        now = time.monotonic()
+        if now - _last_recovery < RECOVERY_INTERVAL_SECONDS:
+            return
+        _last_recovery = now
+    requeued = recover_stale_export_jobs()
+    if requeued and getattr(settings, "EXPORT_JOB_RUNNER", RUNNER_THREAD) == RUNNER_THREAD:
+        _submit_export_jobs(requeued)
+
+
+def run_pending_export_jobs(*, limit: int | None = None) -> int:
+    recover_stale_export_jobs()
+    job_ids = ExportJob.objects.filter(status=ExportJob.STATUS_PENDING).order_by("created_at", "id").values_list("id", flat=True)
+    if limit:
+        job_ids = job_ids[:limit]
+    processed = 0
+    for job_id in list(job_ids):
+        if run_export_job(job_id) is not None:
+            processed += 1
+    return processed
+
+
+def export_job_payload(job: ExportJob) -> dict:
+    return {
+        "id": job.pk,
+        "kind": job.kind,
+        "kind_label": job.get_kind_display(),
+        "status": job.status,
+        "status_label": job.get_status_display(),
+        "is_finished": job.is_finished,
+        "progress_percent": job.progress_percent,
+        "progress_message": job.progress_message,
+        "error_message": job.error_message,
+        "download_url": reverse("export_job_download", args=[job.pk]) if job.status == ExportJob.STATUS_SUCCEEDED else "",
+    }
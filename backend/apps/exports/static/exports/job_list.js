@@ -0,0 +1,47 @@
+(() => {
+  const POLL_INTERVAL_MS = 3000;
+
+  const renderRow = (row, job) => {
+    const status = row.querySelector("[data-export-job-status]");
+    const download = row.querySelector("[data-export-job-download]");
+    if (status) {
+      status.textContent = job.is_finished ? job.status_label : `${job.status_label} ${job.progress_percent}%`;
+      if (job.error_message) {
+        const error = document.createElement("div");
+        error.className = "muted";
+        error.textContent = job.error_message;
+        status.appendChild(error);
+      }
+    }
+    if (download && job.download_url) {
+      const link = document.createElement("a");
+      link.className = "ui-button ui-button--secondary";
+      link.href = job.download_url;
+      link.textContent = "ダウンロード";
+      download.replaceChildren(link);
+    }
+  };
+
+  const poll = async () => {
+    const rows = Array.from(document.querySelectorAll("[data-export-job-pending]"));
+    if (!rows.length) return;
+    await Promise.all(
+      rows.map(async (row) => {
+        try {
+          const response = await fetch(row.dataset.statusUrl, { headers: { Accept: "application/json" } });
+          if (!response.ok) return;
+          const job = await response.json();
+          renderRow(row, job);
+          if (job.is_finished) row.removeAttribute("data-export-job-pending");
+        } catch (error) {
+          // Keep polling; a transient network error should not stop progress updates.
+        }
+      }),
+    );
+    if (document.querySelector("[data-export-job-pending]")) {
+      window.setTimeout(poll, POLL_INTERVAL_MS);
+    }
+  };
+
+  window.setTimeout(poll, POLL_INTERVAL_MS);
+})();
@@ -0,0 +1,240 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from datetime import timedelta
+from io import BytesIO, StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.common.test_helpers import AppTestMixin
+from apps.mail.models import MailSendHistory
+from apps.testimony.models import Article, Product
+
+from .models import ExportJob
+from .services import INTERRUPTED_MESSAGE, enqueue_export_job, recover_stale_export_jobs, run_export_job
+
+
+class ExportJobTests(AppTestMixin, TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, EXPORT_JOB_RUNNER="command")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = self.create_user("export-admin", is_staff=True)
+        self.login(self.user)
+        self.department = self.create_department("UN")
+
+    def test_anonymous_user_is_redirected(self):
+        self.client.logout()
+        response = self.client.get(reverse("export_job_list"))
+        self.assertRedirects(response, reverse("home"), fetch_redirect_response=False)
+
+    def test_mail_history_job_runs_from_command_and_downloads_csv(self):
+        MailSendHistory.objects.create(
+            department=self.department,
+            subject_snapshot="決済報告 テスト",
+            sent_to_snapshot="alice@example.com",
+            status=MailSendHistory.STATUS_SENT,
+            sent_at=timezone.now(),
+        )
+        response = self.client.post(reverse("export_job_create"), {"kind": "mail_history", "status": "sent"})
+        self.assertRedirects(response, reverse("export_job_list"))
+        job = ExportJob.objects.get()
+        self.assertEqual(job.status, ExportJob.STATUS_PENDING)
+        self.assertEqual(job.params, {"status": "sent"})
+
+        output = StringIO()
+        call_command("run_export_jobs", stdout=output)
+        self.assertIn("Export jobs processed: 1", output.getvalue())
+
+        status = self.client.get(reverse("export_job_status", args=[job.pk])).json()
+        self.assertEqual(status["status"], ExportJob.STATUS_SUCCEEDED)
+        self.assertEqual(status["progress_percent"], 100)
+        download = self.client.get(status["download_url"])
+        self.assertEqual(download.status_code, 200)
+        content = b"".join(download.streaming_content).decode("utf-8-sig")
+        self.assertIn("決済報告 テスト", content)
+        self.assertIn("alice@example.com", content)
+
+    def test_testimony_job_bundles_products_and_articles(self):
+        product = Product.objects.create(name="商材A", legacy_product_id=7)
+        Article.objects.create(
+            title="記事A",
+            body="本文",
+            author="証者",
+            product=product,
+            created_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        job = enqueue_export_job(kind=ExportJob.KIND_TESTIMONY_ARTICLES, requested_by=self.user)
+        run_export_job(job.pk)
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, ExportJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.progress_done, 1)
+        with job.artifact.open("rb") as fp:
+            archive = zipfile.ZipFile(BytesIO(fp.read()))
+        self.assertEqual(sorted(archive.namelist()), ["articles.csv", "products.csv"])
+        self.assertIn("記事A", archive.read("articles.csv").decode("utf-8"))
+
+    def test_metrics_report_job_builds_ai_text(self):
+        job = enqueue_export_job(
+            kind=ExportJob.KIND_METRICS_REPORT,
+            params={"department": "UN", "scope": "month", "month": "2026-03", "format": "txt"},
+        )
+        run_export_job(job.pk)
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, ExportJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.artifact_name, "metrics-report-UN-20260301-20260331.txt")
+        with job.artifact.open("rb") as fp:
+            self.assertIn("対象期間: 2026-03-01 - 2026-03-31", fp.read().decode("utf-8"))
+
+    def test_failed_job_records_error_and_is_not_rerun(self):
+        job = enqueue_export_job(kind=ExportJob.KIND_METRICS_REPORT, params={"department": "XX"})
+        run_export_job(job.pk)
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, ExportJob.STATUS_FAILED)
+        self.assertEqual(job.error_message, "部署が見つかりません。")
+        self.assertIsNone(run_export_job(job.pk))
+        self.assertEqual(self.client.get(reverse("export_job_download", args=[job.pk])).status_code, 404)
+
+    def test_thread_runner_submits_after_commit(self):
+        with override_settings(EXPORT_JOB_RUNNER="thread"), patch("apps.exports.services._get_executor") as get_executor:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                job = enqueue_export_job(kind=ExportJob.KIND_MAIL_HISTORY)
+            get_executor.assert_not_called()
+            for callback in callbacks:
+                callback()
+        get_executor.return_value.submit.assert_called_once()
+        self.assertEqual(get_executor.return_value.submit.call_args.args[1], job.pk)
+
+    def _stale_running_job(self, *, attempts: int) -> ExportJob:
+        long_ago = timezone.now() - timedelta(hours=1)
+        job = enqueue_export_job(kind=ExportJob.KIND_MAIL_HISTORY)
+        ExportJob.objects.filter(pk=job.pk).update(
+            status=ExportJob.STATUS_RUNNING,
+            started_at=long_ago,
+            heartbeat_at=long_ago,
+            attempts=attempts,
+        )
+        return job
+
+    def test_stale_running_job_is_requeued_then_failed_after_max_attempts(self):
+        job = self._stale_running_job(attempts=1)
+        fresh = enqueue_export_job(kind=ExportJob.KIND_MAIL_HISTORY)
+        ExportJob.objects.filter(pk=fresh.pk).update(
+            status=ExportJob.STATUS_RUNNING, started_at=timezone.now(), heartbeat_at=timezone.now(), attempts=1
+        )
+
+        with override_settings(EXPORT_JOB_MAX_ATTEMPTS=2):
+            self.assertEqual(recover_stale_export_jobs(), [job.pk])
+            job.refresh_from_db()
+            self.assertEqual(job.status, ExportJob.STATUS_PENDING)
+            self.assertEqual(ExportJob.objects.get(pk=fresh.pk).status, ExportJob.STATUS_RUNNING)
+
+            ExportJob.objects.filter(pk=job.pk).update(
+                status=ExportJob.STATUS_RUNNING, heartbeat_at=timezone.now() - timedelta(hours=1), attempts=2
+            )
+            self.assertEqual(recover_stale_export_jobs(), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.STATUS_FAILED)
+        self.assertEqual(job.error_message, INTERRUPTED_MESSAGE)
+
+    def test_run_export_jobs_command_picks_up_interrupted_jobs(self):
+        job = self._stale_running_job(attempts=1)
+        output = StringIO()
+        call_command("run_export_jobs", stdout=output)
+        self.assertIn("Export jobs processed: 1", output.getvalue())
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.STATUS_SUCCEEDED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_superseded_attempt_does_not_overwrite_the_job(self):
+        job = enqueue_export_job(kind=ExportJob.KIND_MAIL_HISTORY)
+
+        def reclaimed_mid_export(params, progress):
+            # Another runner reclaims the job while this one is still exporting.
+            ExportJob.objects.filter(pk=job.pk).update(attempts=5)
+            progress(1, 1, "書き出し中")
+            raise RuntimeError("boom")
+
+        with patch.dict("apps.exports.services.EXPORTERS", {ExportJob.KIND_MAIL_HISTORY: reclaimed_mid_export}):
+            run_export_job(job.pk)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ExportJob.STATUS_RUNNING)
+        self.assertEqual(job.progress_message, "")
+        self.assertEqual(job.error_message, "")
+
+    def test_thread_runner_resubmits_reclaimed_jobs(self):
+        job = self._stale_running_job(attempts=1)
+        with (
+            override_settings(EXPORT_JOB_RUNNER="thread"),
+            patch("apps.exports.services._last_recovery", float("-inf")),
+            patch("apps.exports.services._get_executor") as get_executor,
+        ):
+            self.client.get(reverse("export_job_status", args=[job.pk]))
+            self.client.get(reverse("export_job_status", args=[job.pk]))
+        get_executor.return_value.submit.assert_called_once()
+        self.assertEqual(get_executor.return_value.submit.call_args.args[1], job.pk)
+
+
+    def test_members_export_their_own_department_reports_and_see_only_their_jobs(self):
+        other_department = self.create_department("WV")
+        member_user, _member = self.create_member_user(username="export-member", name="Member", department=self.department)
+        admin_job = enqueue_export_job(kind=ExportJob.KIND_MAIL_HISTORY, requested_by=self.user)
+        self.login(member_user)
+
+        for kind, department in (
+            (ExportJob.KIND_METRICS_REPORT, self.department.code),
+            (ExportJob.KIND_METRICS_REPORT, other_department.code),
+            (ExportJob.KIND_MAIL_HISTORY, ""),
+        ):
+            response = self.client.post(reverse("export_job_create"), {"kind": kind, "department": department})
+            self.assertRedirects(response, reverse("export_job_list"))
+
+        member_job = ExportJob.objects.get(requested_by=member_user)
+        self.assertEqual(member_job.params["department"], self.department.code)
+        response = self.client.get(reverse("export_job_list"))
+        self.assertEqual([job.pk for job in response.context["jobs"]], [member_job.pk])
+        self.assertNotContains(response, "メール送信履歴CSV")
+        self.assertEqual(self.client.get(reverse("export_job_status", args=[admin_job.pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("export_job_status", args=[member_job.pk])).status_code, 200)
+
+class ProductionStorageSettingsTests(TestCase):
+    def _import_prod_settings(self, **env):
+        environ = {
+            key: value
+            for key, value in os.environ.items()
+            if key not in {"GS_BUCKET_NAME", "EXPORT_JOB_RUNNER", "DJANGO_SETTINGS_MODULE"}
+        }
+        environ.update({"SECRET_KEY": "x" * 50, "ALLOWED_HOSTS": "example.com", **env})
+        return subprocess.run(
+            [sys.executable, "-c", "import config.settings.prod as s; print(s.STORAGES['default']['BACKEND'])"],
+            cwd=settings.BASE_DIR,
+            env=environ,
+            capture_output=True,
+            text=True,
+        )
+
+    def test_production_falls_back_to_local_storage_with_a_warning(self):
+        result = self._import_prod_settings()
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "django.core.files.storage.FileSystemStorage")
+        self.assertIn("export_storage local_fallback", result.stderr)
+
+    def test_production_uses_cloud_storage_when_bucket_is_set(self):
+        result = self._import_prod_settings(GS_BUCKET_NAME="exports-bucket")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "storages.backends.gcloud.GoogleCloudStorage")
+        self.assertNotIn("local_fallback", result.stderr)
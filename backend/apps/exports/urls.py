@@ -0,0 +1,10 @@
+from django.urls import path
+
+from .views import export_job_create, export_job_download, export_job_list, export_job_status
+
+urlpatterns = [
+    path("", export_job_list, name="export_job_list"),
+    path("create/", export_job_create, name="export_job_create"),
+    path("<int:job_id>/status/", export_job_status, name="export_job_status"),
+    path("<int:job_id>/download/", export_job_download, name="export_job_download"),
+]
@@ -0,0 +1,86 @@
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_POST
+
+from apps.accounts.auth import ROLE_ADMIN, ROLE_REPORT, require_roles
+from apps.accounts.models import Department
+from apps.dairymetrics.auth import get_member_profile
+from apps.dairymetrics.services.entry_context import member_departments
+from apps.mail.models import MailSendHistory
+
+from .models import ExportJob
+from .services import enqueue_export_job, export_job_payload, reclaim_stale_export_jobs
+
+
+EXPORT_PARAM_KEYS = {
+    ExportJob.KIND_METRICS_REPORT: ("department", "scope", "month", "period_id", "format"),
+    ExportJob.KIND_TESTIMONY_ARTICLES: (),
+    ExportJob.KIND_MAIL_HISTORY: ("status",),
+}
+
+
+# Members may export the metrics report of their own departments; every other
+# kind, and every other user's jobs, stay with administrators.
+MEMBER_EXPORT_KINDS = {ExportJob.KIND_METRICS_REPORT}
+
+
+def _visible_jobs(request: HttpRequest):
+    jobs = ExportJob.objects.all()
+    if not request.user.is_staff:
+        jobs = jobs.filter(requested_by_id=request.user.pk)
+    return jobs
+
+
+def _member_may_export(request: HttpRequest, kind: str, params: dict) -> bool:
+    if kind not in MEMBER_EXPORT_KINDS:
+        return False
+    member = get_member_profile(request.user)
+    return bool(member) and member_departments(member).filter(code=params.get("department") or "").exists()
+
+
+@require_roles(ROLE_ADMIN, ROLE_REPORT)
+def export_job_list(request: HttpRequest) -> HttpResponse:
+    reclaim_stale_export_jobs()
+    jobs = list(_visible_jobs(request).select_related("requested_by")[:30])
+    context = {
+        "jobs": jobs,
+        "is_admin": request.user.is_staff,
+        "has_unfinished_jobs": any(not job.is_finished for job in jobs),
+        "departments": Department.objects.filter(is_active=True).order_by("code"),
+        "mail_status_choices": MailSendHistory.STATUS_CHOICES,
+    }
+    return render(request, "exports/job_list.html", context)
+
+
+@require_roles(ROLE_ADMIN, ROLE_REPORT)
+@require_POST
+def export_job_create(request: HttpRequest) -> HttpResponse:
+    kind = (request.POST.get("kind") or "").strip()
+    if kind not in EXPORT_PARAM_KEYS:
+        return redirect("export_job_list")
+    params = {key: (request.POST.get(key) or "").strip() for key in EXPORT_PARAM_KEYS[kind]}
+    if not request.user.is_staff and not _member_may_export(request, kind, params):
+        return redirect("export_job_list")
+    enqueue_export_job(kind=kind, params=params, requested_by=request.user)
+    return redirect("export_job_list")
+
+
+@require_roles(ROLE_ADMIN, ROLE_REPORT)
+def export_job_status(request: HttpRequest, job_id: int) -> JsonResponse:
+    reclaim_stale_export_jobs()
+    job = get_object_or_404(_visible_jobs(request), pk=job_id)
+    return JsonResponse(export_job_payload(job))
+
+
+@require_roles(ROLE_ADMIN, ROLE_REPORT)
+def export_job_download(request: HttpRequest, job_id: int) -> HttpResponse:
+    job = get_object_or_404(_visible_jobs(request), pk=job_id, status=ExportJob.STATUS_SUCCEEDED)
+    if not job.artifact or not default_storage.exists(job.artifact.name):
+        raise Http404("artifact not found")
+    return FileResponse(
+        default_storage.open(job.artifact.name, "rb"),
+        as_attachment=True,
+        filename=job.artifact_name or job.artifact.name.rsplit("/", 1)[-1],
+        content_type=job.content_type or "application/octet-stream",
+    )
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.mail.retention import DEFAULT_BATCH_SIZE, archivable_histories, archive_mail_history, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = "Compress the body, recipients and errors of mail histories older than the retention period."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=settings.MAIL_HISTORY_RETENTION_MONTHS,
+            help="Keep this many whole months (plus the current one) uncompressed.",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per transaction.")
+        parser.add_argument("--dry-run", action="store_true", help="Show the number of rows to archive without changing them.")
+
+    def handle(self, *args, **options):
+        if options["months"] < 1:
+            raise CommandError("--months must be at least 1.")
+        before = retention_cutoff(months=options["months"])
+        if options["dry_run"]:
+            count = archivable_histories(before=before).count()
+            self.stdout.write(f"mail histories before {before}: {count} to archive")
+            return
+        result = archive_mail_history(before=before, batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"mail histories before {before}: archived={result.archived} "
+                f"raw_bytes={result.raw_bytes} compressed_bytes={result.compressed_bytes}"
+            )
+        )
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mail", "0004_maildepartmentrouting"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="mailsendhistory",
+            index=models.Index(fields=["sent_at", "id"], name="mail_hist_sent_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="mailsendhistory",
+            index=models.Index(fields=["status", "sent_at", "id"], name="mail_hist_status_sent_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="mailsendhistory",
+            index=models.Index(fields=["department", "sent_at", "id"], name="mail_hist_dept_sent_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="mailsendhistory",
+            index=models.Index(fields=["department", "status", "sent_at", "id"], name="mail_hist_dept_status_idx"),
+        ),
+    ]
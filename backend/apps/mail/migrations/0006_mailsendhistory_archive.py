@@ -0,0 +1,35 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mail", "0005_mailsendhistory_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mailsendhistory",
+            name="archived_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name="MailSendHistoryArchive",
+            fields=[
+                (
+                    "history",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="archive",
+                        serialize=False,
+                        to="mail.mailsendhistory",
+                    ),
+                ),
+                ("payload", models.BinaryField()),
+                ("raw_size", models.PositiveIntegerField(default=0)),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
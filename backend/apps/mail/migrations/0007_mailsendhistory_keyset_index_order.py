@@ -0,0 +1,45 @@
+from django.db import migrations
+
+from apps.common.keyset import KeysetIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mail", "0006_mailsendhistory_archive"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="mailsendhistory",
+            name="mail_hist_sent_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="mailsendhistory",
+            name="mail_hist_status_sent_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="mailsendhistory",
+            name="mail_hist_dept_sent_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="mailsendhistory",
+            name="mail_hist_dept_status_idx",
+        ),
+        migrations.AddIndex(
+            model_name="mailsendhistory",
+            index=KeysetIndex(fields=["-sent_at", "-id"], name="mail_hist_sent_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="mailsendhistory",
+            index=KeysetIndex(fields=["status", "-sent_at", "-id"], name="mail_hist_status_sent_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="mailsendhistory",
+            index=KeysetIndex(fields=["department", "-sent_at", "-id"], name="mail_hist_dept_sent_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="mailsendhistory",
+            index=KeysetIndex(fields=["department", "status", "-sent_at", "-id"], name="mail_hist_dept_status_idx"),
+        ),
+    ]
@@ -1,7 +1,11 @@
+import json
+import zlib
+
 from django.db import models
 from django.utils import timezone
 
 from apps.accounts.models import Department, Member
+from apps.common.keyset import KeysetIndex
 
 
 class MailIntegrationSetting(models.Model):
@@ -143,13 +147,70 @@ class MailSendHistory(models.Model):
     sent_at = models.DateTimeField(null=True, blank=True)
     last_attempt_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set while the snapshot texts live compressed in MailSendHistoryArchive.
+    archived_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ["-activity_date", "-sent_at", "-created_at", "-id"]
+        # Keyset pages of the history list, one per filter combination.
+        indexes = [
+            KeysetIndex(fields=["-sent_at", "-id"], name="mail_hist_sent_idx"),
+            KeysetIndex(fields=["status", "-sent_at", "-id"], name="mail_hist_status_sent_idx"),
+            KeysetIndex(fields=["department", "-sent_at", "-id"], name="mail_hist_dept_sent_idx"),
+            KeysetIndex(fields=["department", "status", "-sent_at", "-id"], name="mail_hist_dept_status_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.activity_date} {self.subject_snapshot}"
 
+    def save(self, *args, **kwargs):
+        if self.pk and self.archived_at and any(getattr(self, field) for field in ARCHIVED_SNAPSHOT_FIELDS):
+            # Rewritten after archival (a resend or a failure record): bring the
+            # row back to the hot table, keeping archived texts that were not replaced.
+            archive = MailSendHistoryArchive.objects.filter(history_id=self.pk).first()
+            if archive:
+                for field, value in archive.snapshots().items():
+                    if not getattr(self, field):
+                        setattr(self, field, value)
+                archive.delete()
+            self.archived_at = None
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *ARCHIVED_SNAPSHOT_FIELDS, "archived_at"}
+        super().save(*args, **kwargs)
+
+
+ARCHIVED_SNAPSHOT_FIELDS = ("body_snapshot", "sent_to_snapshot", "error_message")
+
+
+class MailSendHistoryArchive(models.Model):
+    """zlib-compressed snapshot texts of an archived ``MailSendHistory``.
+
+    The history row itself stays, with its metadata, status and relations
+    intact, so counts and per-transaction mail status are unaffected.
+    """
+
+    history = models.OneToOneField(
+        MailSendHistory,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="archive",
+    )
+    payload = models.BinaryField()
+    raw_size = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    @staticmethod
+    def compress(history: MailSendHistory) -> tuple[bytes, int]:
+        raw = json.dumps({field: getattr(history, field) for field in ARCHIVED_SNAPSHOT_FIELDS}, ensure_ascii=False).encode("utf-8")
+        return zlib.compress(raw, 9), len(raw)
+
+    def snapshots(self) -> dict[str, str]:
+        return json.loads(zlib.decompress(bytes(self.payload)).decode("utf-8"))
+
+    def __str__(self) -> str:
+        return f"archive of {self.history_id}"
+
 
 class MailDepartmentRouting(models.Model):
     department = models.OneToOneField(
@@ -0,0 +1,89 @@
+"""Mail history retention.
+
+Rows whose activity date falls before the retention cutoff keep their
+metadata in ``MailSendHistory`` but move their snapshot texts (body,
+recipients, error message) into ``MailSendHistoryArchive`` as one
+zlib-compressed payload. Readers that show those texts pass the histories
+through ``restore_archived_snapshots``.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import date
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ARCHIVED_SNAPSHOT_FIELDS, MailSendHistory, MailSendHistoryArchive
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+@dataclass
+class ArchiveResult:
+    archived: int = 0
+    raw_bytes: int = 0
+    compressed_bytes: int = 0
+
+
+def retention_cutoff(*, months: int, today: date | None = None) -> date:
+    """Return the first day of the month ``months`` months before ``today``'s month."""
+    today = today or timezone.localdate()
+    month_index = today.year * 12 + (today.month - 1) - months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def archivable_histories(*, before: date):
+    return MailSendHistory.objects.filter(activity_date__lt=before, archived_at__isnull=True)
+
+
+def archive_mail_history(*, before: date, batch_size: int = DEFAULT_BATCH_SIZE) -> ArchiveResult:
+    """Archive the snapshot texts of every history dated before ``before``."""
+    result = ArchiveResult()
+    while True:
+        with transaction.atomic():
+            batch = list(
+                archivable_histories(before=before)
+                .select_for_update(skip_locked=True)
+                .only("id", *ARCHIVED_SNAPSHOT_FIELDS)
+                .order_by("id")[:batch_size]
+            )
+            if not batch:
+                break
+            archives = []
+            for history in batch:
+                payload, raw_size = MailSendHistoryArchive.compress(history)
+                archives.append(MailSendHistoryArchive(history_id=history.id, payload=payload, raw_size=raw_size))
+                result.raw_bytes += raw_size
+                result.compressed_bytes += len(payload)
+            MailSendHistoryArchive.objects.bulk_create(archives)
+            MailSendHistory.objects.filter(id__in=[history.id for history in batch]).update(
+                archived_at=timezone.now(),
+                **{field: "" for field in ARCHIVED_SNAPSHOT_FIELDS},
+            )
+            result.archived += len(batch)
+    logger.info(
+        "mail_history_archive before=%s archived=%s raw_bytes=%s compressed_bytes=%s",
+        before,
+        result.archived,
+        result.raw_bytes,
+        result.compressed_bytes,
+    )
+    return result
+
+
+def restore_archived_snapshots(histories):
+    """Fill the snapshot texts of archived ``histories`` in place (one query) and return them."""
+    histories = list(histories)
+    archived = {history.id: history for history in histories if history.archived_at}
+    if archived:
+        for archive in MailSendHistoryArchive.objects.filter(history_id__in=list(archived)):
+            history = archived[archive.history_id]
+            for field, value in archive.snapshots().items():
+                setattr(history, field, value)
+    return histories
@@ -1,4 +1,10 @@
+from datetime import date, timedelta
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -9,7 +15,14 @@ from apps.common.test_helpers import AppTestMixin
 
 from apps.dairymetrics.models import MemberDailyMetricEntry, MemberMetricTransaction
 
-from .models import MailDepartmentRouting, MailIntegrationSetting, MailRecipientGroup, MailSendHistory
+from .models import (
+    MailDepartmentRouting,
+    MailIntegrationSetting,
+    MailRecipientGroup,
+    MailSendHistory,
+    MailSendHistoryArchive,
+)
+from .retention import archive_mail_history, restore_archived_snapshots, retention_cutoff
 from .services import (
     MailSendError,
     record_transaction_mail_failure,
@@ -197,6 +210,77 @@ class MailManagementTests(AppTestMixin, TestCase):
         self.assertContains(response, 'class="ui-tab is-active" aria-current="page" href="/mail/history/"', html=False)
         self.assertContains(response, "まだ送信履歴はありません。")
 
+    def test_mail_history_pages_by_sent_at_cursor(self):
+        base = timezone.now()
+        for index in range(45):
+            MailSendHistory.objects.create(
+                department=self.department if index % 3 else self.other_department,
+                subject_snapshot=f"件名{index:02d}",
+                status=MailSendHistory.STATUS_SENT,
+                # Pairs of rows share a timestamp so the id tie-break is exercised.
+                sent_at=base - timedelta(minutes=index // 2),
+            )
+        draft = MailSendHistory.objects.create(subject_snapshot="下書き", status=MailSendHistory.STATUS_DRAFT)
+
+        seen = []
+        params = {}
+        while True:
+            response = self.client.get(reverse("mail_history"), params)
+            page = response.context["page"]
+            seen.extend(page.items)
+            if not page.has_next:
+                break
+            params = {"after": page.next_cursor}
+
+        expected = list(MailSendHistory.objects.exclude(id=draft.id).order_by("-sent_at", "-id")) + [draft]
+        self.assertEqual(seen, expected)
+        self.assertEqual(response.context["total_count"], 46)
+
+        previous = self.client.get(reverse("mail_history"), {"before": page.previous_cursor}).context["page"]
+        self.assertEqual(previous.items, expected[20:40])
+        self.assertTrue(previous.has_previous)
+
+        response = self.client.get(reverse("mail_history"), {"department": "WV", "status": MailSendHistory.STATUS_SENT})
+        self.assertEqual(len(response.context["histories"]), 15)
+        self.assertContains(response, "15件")
+
+    def test_mail_history_pins_unsent_and_failed_mails_above_the_first_page(self):
+        base = timezone.now()
+        for index in range(25):
+            MailSendHistory.objects.create(
+                subject_snapshot=f"件名{index:02d}",
+                status=MailSendHistory.STATUS_SENT,
+                sent_at=base - timedelta(minutes=index),
+            )
+        failed = MailSendHistory.objects.create(
+            subject_snapshot="失敗した件名",
+            status=MailSendHistory.STATUS_FAILED,
+            error_message="quota exceeded",
+        )
+        draft = MailSendHistory.objects.create(subject_snapshot="下書き", status=MailSendHistory.STATUS_DRAFT)
+
+        response = self.client.get(reverse("mail_history"))
+        self.assertEqual(response.context["unsent_histories"], [draft, failed])
+        self.assertNotIn(failed, response.context["histories"])
+        self.assertContains(response, "未送信・失敗")
+        self.assertContains(response, "quota exceeded")
+
+        failed_only = self.client.get(reverse("mail_history"), {"status": MailSendHistory.STATUS_FAILED})
+        self.assertEqual(failed_only.context["histories"], [failed])
+
+        next_page = self.client.get(reverse("mail_history"), {"after": response.context["page"].next_cursor})
+        self.assertEqual(next_page.context["unsent_histories"], [])
+        sent_only = self.client.get(reverse("mail_history"), {"status": MailSendHistory.STATUS_SENT})
+        self.assertNotContains(sent_only, "未送信・失敗")
+
+    def test_mail_history_ignores_malformed_cursors(self):
+        MailSendHistory.objects.create(subject_snapshot="件名", status=MailSendHistory.STATUS_SENT, sent_at=timezone.now())
+
+        for cursor in ("garbage", "not-a-date~3", "~x"):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse("mail_history"), {"after": cursor})
+                self.assertEqual(len(response.context["histories"]), 1)
+
     @patch("apps.mail.services._send_via_gmail", return_value="gmail-message-1")
     def test_mail_settings_test_send_creates_sent_history(self, mocked_send):
         MailIntegrationSetting.objects.create(
@@ -523,3 +607,108 @@ class MailManagementTests(AppTestMixin, TestCase):
         self.assertEqual(history.error_message, "gmail timeout")
         self.assertIsNone(history.sent_at)
         self.assertIsNotNone(history.last_attempt_at)
+
+
+class MailHistoryRetentionTests(AppTestMixin, TestCase):
+    def setUp(self):
+        self.department = self.create_department("UN")
+        self.member = self.create_member(name="Alice", email="alice@example.com", department=self.department)
+        self.today = date(2026, 10, 19)
+
+    def _history(self, activity_date, **kwargs):
+        return MailSendHistory.objects.create(
+            department=self.department,
+            activity_date=activity_date,
+            subject_snapshot="件名",
+            body_snapshot="本文" * 200,
+            sent_to_snapshot="Alice <alice@example.com>",
+            status=MailSendHistory.STATUS_SENT,
+            **kwargs,
+        )
+
+    def test_cutoff_keeps_whole_months(self):
+        self.assertEqual(retention_cutoff(months=6, today=self.today), date(2026, 4, 1))
+        self.assertEqual(retention_cutoff(months=12, today=date(2026, 1, 31)), date(2025, 1, 1))
+
+    def test_archive_compresses_old_texts_and_restores_them_on_read(self):
+        old = self._history(date(2026, 3, 31))
+        recent = self._history(date(2026, 4, 1))
+
+        result = archive_mail_history(before=retention_cutoff(months=6, today=self.today), batch_size=1)
+
+        self.assertEqual(result.archived, 1)
+        self.assertLess(result.compressed_bytes, result.raw_bytes)
+        old.refresh_from_db()
+        self.assertIsNotNone(old.archived_at)
+        self.assertEqual((old.body_snapshot, old.sent_to_snapshot), ("", ""))
+        self.assertEqual(MailSendHistory.objects.count(), 2)
+
+        with self.assertNumQueries(2):
+            restored = restore_archived_snapshots(MailSendHistory.objects.order_by("activity_date"))
+        self.assertEqual([history.body_snapshot for history in restored], [recent.body_snapshot] * 2)
+        self.assertEqual(restored[0].sent_to_snapshot, "Alice <alice@example.com>")
+
+        self.assertEqual(archive_mail_history(before=date(2026, 4, 1)).archived, 0)
+
+    def test_history_page_renders_archived_recipients(self):
+        self._history(date(2026, 1, 5), sent_at=timezone.now())
+        archive_mail_history(before=date(2026, 4, 1))
+        self.login(self.create_user("mail-admin", is_staff=True))
+
+        response = self.client.get(reverse("mail_history"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Alice &lt;alice@example.com&gt;")
+
+    def test_rewriting_an_archived_history_returns_it_to_the_hot_table(self):
+        history = self._history(date(2026, 1, 5))
+        archive_mail_history(before=date(2026, 4, 1))
+        history.refresh_from_db()
+
+        history.status = MailSendHistory.STATUS_FAILED
+        history.error_message = "送信に失敗しました。"
+        history.save(update_fields=["status", "error_message"])
+
+        history.refresh_from_db()
+        self.assertIsNone(history.archived_at)
+        self.assertEqual(history.body_snapshot, "本文" * 200)
+        self.assertEqual(history.error_message, "送信に失敗しました。")
+        self.assertFalse(MailSendHistoryArchive.objects.exists())
+
+    def test_command_reports_and_archives(self):
+        self._history(date(2000, 1, 1))
+        output = StringIO()
+
+        call_command("archive_mail_history", "--dry-run", stdout=output)
+        self.assertIn("1 to archive", output.getvalue())
+        self.assertFalse(MailSendHistoryArchive.objects.exists())
+
+        call_command("archive_mail_history", "--months", "3", stdout=output)
+        self.assertIn("archived=1", output.getvalue())
+        self.assertEqual(MailSendHistoryArchive.objects.count(), 1)
+
+
+class MailHistoryIndexTests(TestCase):
+    def _index(self, name):
+        return next(index for index in MailSendHistory._meta.indexes if index.name == name)
+
+    def test_keyset_indexes_match_the_descending_nulls_last_order(self):
+        index = self._index("mail_hist_status_sent_idx")
+        # Only builds the statement, so the editor is never entered.
+        editor = connection.SchemaEditorClass(connection, collect_sql=True)
+        self.assertIn('"sent_at" DESC, "id" DESC', str(index.create_sql(MailSendHistory, editor)))
+        with patch.object(connection, "vendor", "postgresql"):
+            postgres_sql = str(index.create_sql(MailSendHistory, editor))
+        self.assertIn('("status", "sent_at" DESC NULLS LAST, "id" DESC)', postgres_sql)
+
+    def test_history_page_reads_the_index_without_sorting(self):
+        queryset = MailSendHistory.objects.filter(status=MailSendHistory.STATUS_SENT).order_by(
+            F("sent_at").desc(nulls_last=True),
+            F("id").desc(),
+        )[:21]
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn("mail_hist_status_sent_idx", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
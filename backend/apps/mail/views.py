@@ -1,9 +1,11 @@
-from django.core.paginator import Paginator
+from urllib.parse import urlencode
+
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
 from apps.accounts.auth import ROLE_ADMIN, require_roles
 from apps.accounts.models import Department, Member
+from apps.common.keyset import bounded_count, keyset_paginate
 
 from .forms import (
     MailDepartmentRoutingForm,
@@ -12,9 +14,14 @@ from .forms import (
     MailRecipientGroupForm,
 )
 from .models import MailDepartmentRouting, MailIntegrationSetting, MailRecipientGroup, MailSendHistory
+from .retention import restore_archived_snapshots
 from .services import active_group_members, send_test_mail
 
 
+MAIL_HISTORY_PER_PAGE = 20
+MAIL_HISTORY_UNSENT_LIMIT = 10
+
+
 def _routing_departments():
     return {
         department.code: department
@@ -283,14 +290,39 @@ def mail_history(request: HttpRequest) -> HttpResponse:
     status_filter = request.GET.get("status", "").strip()
     if status_filter:
         histories = histories.filter(status=status_filter)
-    paginator = Paginator(histories, 20)
-    page_obj = paginator.get_page(request.GET.get("page") or 1)
+    departments = list(Department.objects.filter(is_active=True).order_by("code"))
+    department_filter = request.GET.get("department", "").strip()
+    if department_filter:
+        histories = histories.filter(department__code=department_filter)
+    page = keyset_paginate(
+        histories,
+        field="sent_at",
+        per_page=MAIL_HISTORY_PER_PAGE,
+        after=request.GET.get("after", ""),
+        before=request.GET.get("before", ""),
+    )
+    total_count, total_is_bounded = bounded_count(histories)
+    # Unsent rows have no sent_at and sort after every sent mail; pin the
+    # newest of them above the first page so failures are not buried.
+    unsent_histories = []
+    is_first_page = not request.GET.get("after") and not request.GET.get("before")
+    if is_first_page and status_filter != MailSendHistory.STATUS_SENT:
+        unsent_histories = restore_archived_snapshots(
+            histories.exclude(status=MailSendHistory.STATUS_SENT).order_by("-created_at", "-id")[:MAIL_HISTORY_UNSENT_LIMIT]
+        )
+    filter_query = urlencode({key: value for key, value in (("status", status_filter), ("department", department_filter)) if value})
     context = {
-        "page_obj": page_obj,
-        "paginator": paginator,
-        "histories": page_obj.object_list,
+        "page": page,
+        "histories": restore_archived_snapshots(page.items),
+        "unsent_histories": unsent_histories,
+        "unsent_limit": MAIL_HISTORY_UNSENT_LIMIT,
+        "total_count": total_count,
+        "total_is_bounded": total_is_bounded,
+        "filter_query": filter_query,
         "status_filter": status_filter,
         "status_choices": MailSendHistory.STATUS_CHOICES,
+        "department_filter": department_filter,
+        "departments": departments,
     }
     return render(request, "mail/history.html", context)
 
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+
+from django.db import connection
+from django.test import RequestFactory
+
+from apps.common.benchmark_dataset import BenchmarkDataset
+from apps.dairymetrics.selectors import build_admin_month_overview, build_member_dashboard
+from apps.dairymetrics.services.metrics_v2 import build_metrics_v2_dashboard_payload, resolve_metrics_v2_scope
+from apps.dairymetrics.services.reports import build_metrics_scope_report
+from apps.performance.services.admin_entries import build_admin_entry_management_page
+from apps.performance.services.dashboard_snapshots import build_performance_dashboard_snapshot
+from apps.talks.selectors.posts import build_talks_index_context
+from config.query_profiler import RequestProfile
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    runs: int
+    wall_ms_min: float
+    wall_ms_median: float
+    queries: int
+    db_ms: float
+    duplicate_fingerprints: int
+
+
+def _month_scope(dataset: BenchmarkDataset):
+    return resolve_metrics_v2_scope(today=dataset.end_date, scope="month", requested_month=dataset.end_date.replace(day=1))
+
+
+def _talks_request(dataset: BenchmarkDataset):
+    request = RequestFactory().get("/talks/")
+    request.user = dataset.admin_user
+    return request
+
+
+def _admin_entries_year(dataset: BenchmarkDataset, member):
+    cleaned_data = {
+        "department": None,
+        "member": member,
+        "date_from": dataset.end_date - timedelta(days=364),
+        "date_to": dataset.end_date,
+    }
+    page = build_admin_entry_management_page(cleaned_data=cleaned_data, page_number=1, next_url="/")
+    return page["summary_rows"]
+
+
+def benchmark_cases(dataset: BenchmarkDataset) -> list[tuple[str, object]]:
+    un = dataset.departments["UN"]
+    wv = dataset.departments["WV"]
+    un_member = dataset.members_for("UN")[0]
+    target_month = dataset.end_date.replace(day=1)
+    return [
+        (
+            "build_member_dashboard",
+            lambda: build_member_dashboard(un_member, today=dataset.end_date, department_code="UN", scope="month"),
+        ),
+        (
+            "build_admin_month_overview",
+            lambda: build_admin_month_overview(target_month=target_month, department_code="UN", today=dataset.end_date),
+        ),
+        (
+            "build_metrics_v2_dashboard_payload[UN]",
+            lambda: build_metrics_v2_dashboard_payload(department=un, scope=_month_scope(dataset)),
+        ),
+        (
+            "build_metrics_v2_dashboard_payload[WV]",
+            lambda: build_metrics_v2_dashboard_payload(department=wv, scope=_month_scope(dataset)),
+        ),
+        (
+            "build_metrics_scope_report",
+            lambda: build_metrics_scope_report(department=un, scope=_month_scope(dataset)),
+        ),
+        (
+            "build_performance_dashboard_snapshot",
+            lambda: build_performance_dashboard_snapshot(department=un, target_month=target_month),
+        ),
+        (
+            "build_admin_entry_management_page[year]",
+            lambda: _admin_entries_year(dataset, member=None),
+        ),
+        (
+            "build_admin_entry_management_page[year,member]",
+            lambda: _admin_entries_year(dataset, member=un_member),
+        ),
+        (
+            "build_talks_index_context",
+            lambda: build_talks_index_context(_talks_request(dataset), talks_member=None, talks_is_admin=True),
+        ),
+    ]
+
+
+def run_benchmark(name: str, func, *, repeat: int = 3) -> BenchmarkResult:
+    timings = []
+    profile = None
+    for _ in range(max(1, repeat)):
+        profile = RequestProfile()
+        with connection.execute_wrapper(profile):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+    return BenchmarkResult(
+        name=name,
+        runs=len(timings),
+        wall_ms_min=round(min(timings), 2),
+        wall_ms_median=round(statistics.median(timings), 2),
+        queries=profile.query_count,
+        db_ms=round(profile.db_time * 1000, 2),
+        duplicate_fingerprints=len(profile.duplicates(3)),
+    )
+
+
+def run_benchmarks(dataset: BenchmarkDataset, *, repeat: int = 3, only: set[str] | None = None) -> list[dict]:
+    results = []
+    for name, func in benchmark_cases(dataset):
+        if only and name not in only:
+            continue
+        results.append(asdict(run_benchmark(name, func, repeat=repeat)))
+    return results
+
+
+def compare_results(current: list[dict], previous: list[dict]) -> list[dict]:
+    previous_by_name = {row["name"]: row for row in previous}
+    rows = []
+    for row in current:
+        before = previous_by_name.get(row["name"])
+        if not before:
+            continue
+        rows.append(
+            {
+                "name": row["name"],
+                "wall_ms_median": (before["wall_ms_median"], row["wall_ms_median"]),
+                "queries": (before["queries"], row["queries"]),
+                "speedup": round(before["wall_ms_median"] / row["wall_ms_median"], 2) if row["wall_ms_median"] else None,
+            }
+        )
+    return rows
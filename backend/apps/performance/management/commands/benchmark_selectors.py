@@ -0,0 +1,85 @@
+import json
+import logging
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import setup_databases, teardown_databases
+from django.utils import timezone
+
+from apps.common.benchmark_dataset import seed_benchmark_dataset
+from apps.performance.benchmarks import compare_results, run_benchmarks
+
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Seed a synthetic dataset and time the heavy dashboard/report selectors."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--members", type=int, default=200, help="Number of synthetic members (split across UN/WV).")
+        parser.add_argument("--days", type=int, default=730, help="Days of history ending today.")
+        parser.add_argument("--seed", type=int, default=1, help="Random seed for the dataset.")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per selector.")
+        parser.add_argument("--only", action="append", default=[], help="Run only the named selector. Repeatable.")
+        parser.add_argument("--output", default="", help="Write results as JSON to this path.")
+        parser.add_argument("--compare", default="", help="Compare against a previous JSON result file.")
+        parser.add_argument(
+            "--use-current-database",
+            action="store_true",
+            help="Seed into the configured database instead of a throwaway test database.",
+        )
+        parser.add_argument("--keepdb", action="store_true", help="Keep the throwaway test database after the run.")
+
+    def handle(self, *args, **options):
+        previous = None
+        if options["compare"]:
+            compare_path = Path(options["compare"])
+            if not compare_path.exists():
+                raise CommandError(f"Compare file not found: {compare_path}")
+            previous = json.loads(compare_path.read_text(encoding="utf-8"))
+
+        old_config = None
+        if not options["use_current_database"]:
+            old_config = setup_databases(verbosity=0, interactive=False, keepdb=options["keepdb"], aliases={"default"})
+        try:
+            dataset = seed_benchmark_dataset(members=options["members"], days=options["days"], seed=options["seed"])
+            self.stdout.write(f"Dataset: {dataset.counts}")
+            results = run_benchmarks(dataset, repeat=options["repeat"], only=set(options["only"]) or None)
+        finally:
+            if old_config is not None:
+                teardown_databases(old_config, verbosity=0, keepdb=options["keepdb"])
+
+        for row in results:
+            self.stdout.write(
+                f"{row['name']}: median={row['wall_ms_median']}ms min={row['wall_ms_min']}ms "
+                f"queries={row['queries']} db={row['db_ms']}ms duplicates={row['duplicate_fingerprints']}"
+            )
+            logger.info("selector_benchmark name=%s median_ms=%s queries=%s", row["name"], row["wall_ms_median"], row["queries"])
+
+        if previous is not None:
+            for row in compare_results(results, previous["results"]):
+                before_ms, after_ms = row["wall_ms_median"]
+                before_queries, after_queries = row["queries"]
+                self.stdout.write(
+                    f"compare {row['name']}: {before_ms}ms -> {after_ms}ms (x{row['speedup']}), "
+                    f"queries {before_queries} -> {after_queries}"
+                )
+
+        if options["output"]:
+            payload = {
+                "generated_at": timezone.now().isoformat(),
+                "dataset": {
+                    "members": options["members"],
+                    "days": options["days"],
+                    "seed": options["seed"],
+                    "start_date": dataset.start_date.isoformat(),
+                    "end_date": dataset.end_date.isoformat(),
+                    "counts": dataset.counts,
+                },
+                "results": results,
+            }
+            output_path = Path(options["output"])
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Benchmark results written: {output_path}"))
@@ -1,6 +1,11 @@
-from django.db.models import Q
+from datetime import date
+
+from django.db import connections
+from django.db.models import CharField, F, PositiveIntegerField, Q, Value
 from django.urls import reverse
+from django.utils.dateparse import parse_datetime
 
+from apps.common.keyset import CURSOR_SEPARATOR, KeysetPage
 from apps.dairymetrics.models import MetricAdjustment, WVMetricCancellation
 
 
@@ -95,63 +100,169 @@ def _filtered_cancellations_list_queryset(cleaned_data):
     return queryset
 
 
-def _adjustment_list_row(adjustment):
-    if adjustment.department.code == "WV":
-        amount = adjustment.support_amount
-        detail_text = f"CS {adjustment.cs_count} / 難民 {adjustment.refugee_count}"
-    elif adjustment.source_type == MetricAdjustment.SOURCE_POSTAL:
-        amount = adjustment.return_postal_amount
+RECORD_ADJUSTMENT = "adjustment"
+RECORD_CANCELLATION = "cancellation"
+ADJUSTMENT_LIST_PER_PAGE = 20
+HALF_ORDERING = ("-row_date", "-row_created_at", "-row_id")
+_SOURCE_LABELS = dict(MetricAdjustment.SOURCE_CHOICES)
+
+
+def _list_projection(queryset, **columns):
+    """Project ``queryset`` onto the column layout shared by both halves of the union.
+
+    Every column is an annotation added in the same order, so both SELECT lists line up.
+    """
+    return queryset.order_by().annotate(**columns).values(*columns)
+
+
+def _adjustment_list_values(queryset):
+    return _list_projection(
+        queryset,
+        row_id=F("id"),
+        record_type=Value(RECORD_ADJUSTMENT, output_field=CharField()),
+        row_date=F("target_date"),
+        row_created_at=F("created_at"),
+        member_name=F("member__name"),
+        department_code=F("department__code"),
+        row_source_type=F("source_type"),
+        row_location_name=F("location_name"),
+        row_cs_count=F("cs_count"),
+        row_refugee_count=F("refugee_count"),
+        row_support_amount=F("support_amount"),
+        row_postal_amount=F("return_postal_amount"),
+        row_qr_amount=F("return_qr_amount"),
+    )
+
+
+def _cancellation_list_values(queryset):
+    return _list_projection(
+        queryset,
+        row_id=F("id"),
+        record_type=Value(RECORD_CANCELLATION, output_field=CharField()),
+        row_date=F("target_date"),
+        row_created_at=F("created_at"),
+        member_name=F("member__name"),
+        department_code=F("department__code"),
+        row_source_type=Value("", output_field=CharField()),
+        row_location_name=F("location_name"),
+        row_cs_count=F("cs_count"),
+        row_refugee_count=F("refugee_count"),
+        row_support_amount=F("support_amount"),
+        row_postal_amount=Value(0, output_field=PositiveIntegerField()),
+        row_qr_amount=Value(0, output_field=PositiveIntegerField()),
+    )
+
+
+def encode_adjustment_list_cursor(row) -> str:
+    return CURSOR_SEPARATOR.join(
+        [row["row_date"].isoformat(), row["row_created_at"].isoformat(), row["record_type"], str(row["row_id"])]
+    )
+
+
+def decode_adjustment_list_cursor(raw: str) -> tuple | None:
+    parts = (raw or "").split(CURSOR_SEPARATOR)
+    if len(parts) != 4:
+        return None
+    date_text, created_text, record_type, pk = parts
+    if record_type not in (RECORD_ADJUSTMENT, RECORD_CANCELLATION) or not pk.isdigit():
+        return None
+    try:
+        target_date = date.fromisoformat(date_text)
+        created_at = parse_datetime(created_text)
+    except ValueError:
+        return None
+    if created_at is None:
+        return None
+    return target_date, created_at, record_type, int(pk)
+
+
+def _after_cursor(queryset, record_type: str, cursor: tuple):
+    """Keep the rows of one union half that sort after ``cursor``.
+
+    The list is ordered by (target_date, created_at, record_type, id), all
+    descending. ``record_type`` is constant within a half, so its tie-break
+    resolves here instead of in SQL.
+    """
+    target_date, created_at, cursor_type, pk = cursor
+    condition = Q(target_date__lt=target_date) | Q(target_date=target_date, created_at__lt=created_at)
+    if record_type < cursor_type:
+        condition |= Q(target_date=target_date, created_at=created_at)
+    elif record_type == cursor_type:
+        condition |= Q(target_date=target_date, created_at=created_at, id__lt=pk)
+    return queryset.filter(condition)
+
+
+def _list_row(values):
+    row = {
+        "id": values["row_id"],
+        "record_type": values["record_type"],
+        "target_date": values["row_date"],
+        "created_at": values["row_created_at"],
+        "member_name": values["member_name"],
+        "department_code": values["department_code"],
+        "location_name": values["row_location_name"],
+    }
+    counts_text = f"CS {values['row_cs_count']} / 難民 {values['row_refugee_count']}"
+    if values["record_type"] == RECORD_CANCELLATION:
+        row.update(
+            source_label="キャンセル",
+            detail_text=counts_text,
+            amount=values["row_support_amount"],
+            edit_url="",
+            delete_url=reverse("performance_cancellation_delete", args=[row["id"]]),
+        )
+        return row
+
+    source_type = values["row_source_type"]
+    if values["department_code"] == "WV":
+        amount = values["row_support_amount"]
+        detail_text = counts_text
+    elif source_type == MetricAdjustment.SOURCE_POSTAL:
+        amount = values["row_postal_amount"]
         detail_text = "郵送"
-    elif adjustment.source_type == MetricAdjustment.SOURCE_QR:
-        amount = adjustment.return_qr_amount
+    elif source_type == MetricAdjustment.SOURCE_QR:
+        amount = values["row_qr_amount"]
         detail_text = "QR"
     else:
-        amount = adjustment.support_amount
-        detail_text = adjustment.get_source_type_display()
-    return {
-        "id": adjustment.id,
-        "record_type": "adjustment",
-        "target_date": adjustment.target_date,
-        "created_at": adjustment.created_at,
-        "member_name": adjustment.member.name,
-        "department_code": adjustment.department.code,
-        "source_label": adjustment.get_source_type_display(),
-        "location_name": adjustment.location_name,
-        "detail_text": detail_text,
-        "amount": amount,
-        "edit_url": f"{reverse('performance_adjustments')}?edit={adjustment.id}",
-        "delete_url": reverse("performance_adjustment_delete", args=[adjustment.id]),
-    }
-
+        amount = values["row_support_amount"]
+        detail_text = _SOURCE_LABELS.get(source_type, source_type)
+    row.update(
+        source_label=_SOURCE_LABELS.get(source_type, source_type),
+        detail_text=detail_text,
+        amount=amount,
+        edit_url=f"{reverse('performance_adjustments')}?edit={row['id']}",
+        delete_url=reverse("performance_adjustment_delete", args=[row["id"]]),
+    )
+    return row
 
-def _cancellation_list_row(cancellation):
-    return {
-        "id": cancellation.id,
-        "record_type": "cancellation",
-        "target_date": cancellation.target_date,
-        "created_at": cancellation.created_at,
-        "member_name": cancellation.member.name,
-        "department_code": cancellation.department.code,
-        "source_label": "キャンセル",
-        "location_name": cancellation.location_name,
-        "detail_text": f"CS {cancellation.cs_count} / 難民 {cancellation.refugee_count}",
-        "amount": cancellation.support_amount,
-        "edit_url": "",
-        "delete_url": reverse("performance_cancellation_delete", args=[cancellation.id]),
-    }
 
+def combined_adjustment_list_page(cleaned_data, *, after: str = "", per_page: int = ADJUSTMENT_LIST_PER_PAGE):
+    """Return one page of adjustments and WV cancellations, newest first.
 
-def combined_adjustment_list_rows(cleaned_data):
-    rows = [
-        _adjustment_list_row(adjustment)
-        for adjustment in _filtered_adjustments_list_queryset(cleaned_data)
-    ]
-    rows.extend(
-        _cancellation_list_row(cancellation)
-        for cancellation in _filtered_cancellations_list_queryset(cleaned_data)
+    Both tables are merged with ``UNION ALL`` and paginated by keyset in SQL,
+    so a page costs ``per_page`` rows however long the history is.
+    """
+    adjustments = _filtered_adjustments_list_queryset(cleaned_data)
+    cancellations = _filtered_cancellations_list_queryset(cleaned_data)
+    cursor = decode_adjustment_list_cursor(after) if after else None
+    if cursor is not None:
+        adjustments = _after_cursor(adjustments, RECORD_ADJUSTMENT, cursor)
+        cancellations = _after_cursor(cancellations, RECORD_CANCELLATION, cursor)
+    adjustment_rows = _adjustment_list_values(adjustments)
+    cancellation_rows = _cancellation_list_values(cancellations)
+    if connections[adjustment_rows.db].features.supports_slicing_ordering_in_compound:
+        # Each half stops after one page on its (target_date, created_at, id) index.
+        adjustment_rows = adjustment_rows.order_by(*HALF_ORDERING)[: per_page + 1]
+        cancellation_rows = cancellation_rows.order_by(*HALF_ORDERING)[: per_page + 1]
+    combined = adjustment_rows.union(cancellation_rows, all=True).order_by(
+        "-row_date",
+        "-row_created_at",
+        "-record_type",
+        "-row_id",
     )
-    return sorted(
-        rows,
-        key=lambda row: (row["target_date"], row["created_at"]),
-        reverse=True,
+    values = list(combined[: per_page + 1])
+    items = values[:per_page]
+    return KeysetPage(
+        items=[_list_row(row) for row in items],
+        next_cursor=encode_adjustment_list_cursor(items[-1]) if len(values) > per_page else "",
     )
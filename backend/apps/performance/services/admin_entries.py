@@ -1,5 +1,5 @@
 from django.core.paginator import Paginator
-from django.db.models import Q
+from django.db.models import Exists, OuterRef
 from django.urls import reverse
 
 from apps.dairymetrics.models import DepartmentDailyMetricSummary, MemberDailyMetricEntry
@@ -37,35 +37,37 @@ def _filtered_summary_queryset(cleaned_data):
         queryset = queryset.filter(entry_date__lte=date_to)
     if member is None:
         return queryset
-    member_entries = MemberDailyMetricEntry.objects.filter(member=member)
-    if department is not None:
-        member_entries = member_entries.filter(department=department)
-    if date_from is not None:
-        member_entries = member_entries.filter(entry_date__gte=date_from)
-    if date_to is not None:
-        member_entries = member_entries.filter(entry_date__lte=date_to)
-    pair_filters = Q()
-    has_pairs = False
-    for department_id, entry_date in member_entries.values_list("department_id", "entry_date").distinct():
-        has_pairs = True
-        pair_filters |= Q(department_id=department_id, entry_date=entry_date)
-    if not has_pairs:
-        return queryset.none()
-    return queryset.filter(pair_filters)
+    # Correlated on (department, entry_date); the outer filters already bound both.
+    return queryset.filter(
+        Exists(
+            MemberDailyMetricEntry.objects.filter(
+                member=member,
+                department_id=OuterRef("department_id"),
+                entry_date=OuterRef("entry_date"),
+            )
+        )
+    )
 
 
 def build_admin_entry_summary_rows(*, summaries, next_url):
     summaries = list(summaries)
     if not summaries:
         return []
-    pair_filters = Q()
-    entry_map = {}
-    for summary in summaries:
-        pair = (summary.department_id, summary.entry_date)
-        pair_filters |= Q(department_id=summary.department_id, entry_date=summary.entry_date)
-        entry_map[pair] = []
+    entry_map = {(summary.department_id, summary.entry_date): [] for summary in summaries}
+    entry_dates = [summary.entry_date for summary in summaries]
+    page_summaries = DepartmentDailyMetricSummary.objects.filter(
+        id__in=[summary.id for summary in summaries],
+        department_id=OuterRef("department_id"),
+        entry_date=OuterRef("entry_date"),
+    )
+    # The department/date bounds let the outer side use the entry index; Exists
+    # then drops the pairs inside the bounding box that are not on the page.
     entries = (
-        MemberDailyMetricEntry.objects.filter(pair_filters)
+        MemberDailyMetricEntry.objects.filter(
+            department_id__in={summary.department_id for summary in summaries},
+            entry_date__range=(min(entry_dates), max(entry_dates)),
+        )
+        .filter(Exists(page_summaries))
         .select_related("member", "department")
         .order_by("member__name", "id")
     )
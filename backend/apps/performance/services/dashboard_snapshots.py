@@ -34,6 +34,7 @@ from apps.performance.services.scopes import (
 from apps.performance.services.trends import (
     build_overall_activity_trend,
 )
+from config.query_profiler import profiled
 
 
 def _build_activity_member_rows(entries):
@@ -86,6 +87,7 @@ def _today_rate_text_for_dashboard(*, actual_count, actual_amount, count_target,
     return "-"
 
 
+@profiled("performance_dashboard_snapshot")
 def build_performance_dashboard_snapshot(*, department=None, target_month=None, period=None):
     today = timezone.localdate()
     target_month = target_month or today.replace(day=1)
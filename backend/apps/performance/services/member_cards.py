@@ -1,5 +1,7 @@
 from datetime import date
 
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.urls import reverse
 from django.utils import timezone
 
@@ -21,6 +23,9 @@ from apps.performance.services.trends import (
 )
 
 
+RECENT_ENTRIES_PER_MEMBER = 6
+
+
 def _resolve_member_department_pairs(*, members, selected_department):
     member_department_pairs = []
     for member in members:
@@ -66,17 +71,24 @@ def _collect_member_latest_entries_by_department(*, member_department_pairs, sta
         )
         if start_date is not None and end_date is not None:
             entries_qs = entries_qs.filter(entry_date__range=(start_date, end_date))
-        department_entries = list(
-            entries_qs.select_related("member", "department").order_by("member_id", "-entry_date", "-id")
+        # Rank entries per member in SQL so only the latest few rows per card are
+        # fetched instead of every entry the department has ever recorded.
+        picked_entries = list(
+            entries_qs.annotate(
+                recent_rank=Window(
+                    RowNumber(),
+                    partition_by=[F("member_id")],
+                    order_by=[F("entry_date").desc(), F("id").desc()],
+                )
+            )
+            .filter(recent_rank__lte=RECENT_ENTRIES_PER_MEMBER)
+            .select_related("member", "department")
+            .order_by("member_id", "-entry_date", "-id")
         )
         latest_entries_by_department[department.id] = {}
-        picked_entries = []
-        for entry in department_entries:
+        for entry in picked_entries:
             pair_key = (entry.member_id, entry.department_id)
-            bucket = latest_entries_by_department[department.id].setdefault(pair_key, [])
-            if len(bucket) < 6:
-                bucket.append(entry)
-                picked_entries.append(entry)
+            latest_entries_by_department[department.id].setdefault(pair_key, []).append(entry)
         adjustment_totals_by_department[department.id] = build_adjustment_totals_map(picked_entries)
     return latest_entries_by_department, adjustment_totals_by_department
 
@@ -3,6 +3,7 @@ from django.utils import timezone
 
 from apps.dairymetrics.models import MemberMetricTransaction
 from apps.mail.models import MailSendHistory
+from apps.mail.retention import restore_archived_snapshots
 
 
 def build_department_today_transaction_rows(*, department, target_date):
@@ -84,7 +85,7 @@ def build_department_today_mail_rows(*, department, target_date):
             "body_text": history.body_snapshot,
             "error_text": history.error_message,
         }
-        for history in histories
+        for history in restore_archived_snapshots(histories)
     ]
 
 
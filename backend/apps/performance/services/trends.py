@@ -2,7 +2,9 @@ from __future__ import annotations
 
 from django.db.models import Sum
 
+from apps.common.date_series import RESAMPLE_DAY, RESAMPLE_MONTH, DateSeries, column_sum, rate_column
 from apps.dairymetrics.models import DepartmentDailyMetricSummary, MemberDailyMetricEntry, MetricAdjustment
+from config.db_router import replica_reads
 
 
 EMPTY_ADJUSTMENT_TOTALS = {
@@ -16,6 +18,17 @@ EMPTY_ADJUSTMENT_TOTALS = {
     "refugee_count": 0,
 }
 
+ENTRY_SERIES_FIELDS = (
+    "result_count",
+    "support_amount",
+    "approach_count",
+    "communication_count",
+    "cs_count",
+    "refugee_count",
+)
+ADJUSTMENT_SERIES_FIELDS = tuple(EMPTY_ADJUSTMENT_TOTALS)
+TREND_WINDOW_SIZE = 120
+
 
 def build_adjustment_totals_map(entries):
     entries = list(entries)
@@ -82,8 +95,38 @@ def entry_final_amount_value(*, entry, adjustment_totals):
     )
 
 
-def build_member_activity_trend(*, member, department, start_date=None, end_date=None):
-    entry_queryset = MemberDailyMetricEntry.objects.select_related("department").filter(member=member, department=department)
+def _grouped_series_rows(queryset, *, date_field: str, fields):
+    return queryset.values(date_field).annotate(**{f"{name}_total": Sum(name) for name in fields})
+
+
+def _load_trend_series(dates, *, entry_queryset, adjustment_queryset, entry_fields=ENTRY_SERIES_FIELDS) -> DateSeries:
+    series = DateSeries(list(dates))
+    series.load_rows(
+        _grouped_series_rows(entry_queryset.filter(entry_date__in=dates), date_field="entry_date", fields=entry_fields),
+        date_key="entry_date",
+        fields={name: f"{name}_total" for name in entry_fields},
+        prefix="entry_",
+    )
+    series.load_rows(
+        _grouped_series_rows(
+            adjustment_queryset.filter(target_date__in=dates),
+            date_field="target_date",
+            fields=ADJUSTMENT_SERIES_FIELDS,
+        ),
+        date_key="target_date",
+        fields={name: f"{name}_total" for name in ADJUSTMENT_SERIES_FIELDS},
+        prefix="adjustment_",
+    )
+    return series
+
+
+def _trend_labels(series: DateSeries, resample: str) -> list[str]:
+    return series.labels("%Y/%m" if resample == RESAMPLE_MONTH else "%m/%d")
+
+
+@replica_reads
+def build_member_activity_trend(*, member, department, start_date=None, end_date=None, resample=RESAMPLE_DAY):
+    entry_queryset = MemberDailyMetricEntry.objects.filter(member=member, department=department)
     adjustment_queryset = MetricAdjustment.objects.filter(member=member, department=department)
     if start_date is not None and end_date is not None:
         entry_queryset = entry_queryset.filter(entry_date__range=(start_date, end_date))
@@ -91,13 +134,15 @@ def build_member_activity_trend(*, member, department, start_date=None, end_date
         latest_entry_dates = list(entry_queryset.order_by("entry_date").values_list("entry_date", flat=True).distinct())
         latest_adjustment_dates = list(adjustment_queryset.order_by("target_date").values_list("target_date", flat=True).distinct())
     else:
-        latest_entry_dates = list(entry_queryset.order_by("-entry_date").values_list("entry_date", flat=True).distinct()[:120])
-        latest_entry_dates.reverse()
-        latest_adjustment_dates = list(adjustment_queryset.order_by("-target_date").values_list("target_date", flat=True).distinct()[:120])
-        latest_adjustment_dates.reverse()
+        latest_entry_dates = list(
+            entry_queryset.order_by("-entry_date").values_list("entry_date", flat=True).distinct()[:TREND_WINDOW_SIZE]
+        )
+        latest_adjustment_dates = list(
+            adjustment_queryset.order_by("-target_date").values_list("target_date", flat=True).distinct()[:TREND_WINDOW_SIZE]
+        )
     latest_dates = sorted(set(latest_entry_dates) | set(latest_adjustment_dates))
-    if start_date is None and end_date is None and len(latest_dates) > 120:
-        latest_dates = latest_dates[-120:]
+    if start_date is None and end_date is None and len(latest_dates) > TREND_WINDOW_SIZE:
+        latest_dates = latest_dates[-TREND_WINDOW_SIZE:]
     if not latest_dates:
         return {
             "dates": [],
@@ -111,126 +156,59 @@ def build_member_activity_trend(*, member, department, start_date=None, end_date
             "is_wv": department.code == "WV",
             "default_visible_count": 0,
         }
-    latest_entries = list(entry_queryset.filter(entry_date__in=latest_dates).order_by("entry_date", "id"))
-    entry_by_date = {entry.entry_date: entry for entry in latest_entries}
-    adjustment_totals_map = build_adjustment_totals_map(latest_entries)
-    adjustment_only_rows = (
-        adjustment_queryset.filter(target_date__in=latest_dates)
-        .values("target_date")
-        .annotate(
-            result_count_total=Sum("result_count"),
-            support_amount_total=Sum("support_amount"),
-            return_postal_count_total=Sum("return_postal_count"),
-            return_postal_amount_total=Sum("return_postal_amount"),
-            return_qr_count_total=Sum("return_qr_count"),
-            return_qr_amount_total=Sum("return_qr_amount"),
-            cs_count_total=Sum("cs_count"),
-            refugee_count_total=Sum("refugee_count"),
-        )
+
+    series = _load_trend_series(
+        latest_dates,
+        entry_queryset=entry_queryset,
+        adjustment_queryset=adjustment_queryset,
+        entry_fields=(*ENTRY_SERIES_FIELDS, "daily_target_amount"),
+    ).resample(resample)
+    is_wv = department.code == "WV"
+    adjustment_amounts = column_sum(
+        series.column("adjustment_support_amount"),
+        series.column("adjustment_return_postal_amount"),
+        series.column("adjustment_return_qr_amount"),
     )
-    adjustment_only_map = {
-        row["target_date"]: {
-            "result_count": int(row["result_count_total"] or 0),
-            "support_amount": int(row["support_amount_total"] or 0),
-            "return_postal_count": int(row["return_postal_count_total"] or 0),
-            "return_postal_amount": int(row["return_postal_amount_total"] or 0),
-            "return_qr_count": int(row["return_qr_count_total"] or 0),
-            "return_qr_amount": int(row["return_qr_amount_total"] or 0),
-            "cs_count": int(row["cs_count_total"] or 0),
-            "refugee_count": int(row["refugee_count_total"] or 0),
-        }
-        for row in adjustment_only_rows
-    }
-    labels = []
-    amounts = []
-    counts = []
-    cs_counts = []
-    refugee_counts = []
-    adjustment_amounts = []
-    adjustment_counts = []
-    adjustment_cs_counts = []
-    adjustment_refugee_counts = []
-    approach_counts = []
-    communication_counts = []
-    target_amounts = []
-    rate_values = []
-    for activity_date in latest_dates:
-        entry = entry_by_date.get(activity_date)
-        if entry is not None:
-            adjustment_totals = adjustment_totals_map.get(
-                (entry.member_id, entry.department_id, entry.entry_date),
-                EMPTY_ADJUSTMENT_TOTALS,
-            )
-        else:
-            adjustment_totals = adjustment_only_map.get(activity_date, EMPTY_ADJUSTMENT_TOTALS)
-        labels.append(activity_date.strftime("%m/%d"))
-        if entry is not None:
-            amount_value = entry_final_amount_value(entry=entry, adjustment_totals=adjustment_totals)
-        else:
-            amount_value = (
-                int(adjustment_totals["support_amount"])
-                + int(adjustment_totals["return_postal_amount"])
-                + int(adjustment_totals["return_qr_amount"])
-            )
-        amounts.append(amount_value)
-        adjustment_amount_value = (
-            int(adjustment_totals["support_amount"])
-            + int(adjustment_totals["return_postal_amount"])
-            + int(adjustment_totals["return_qr_amount"])
+    if is_wv:
+        adjustment_cs_counts = series.column("adjustment_cs_count")
+        adjustment_refugee_counts = series.column("adjustment_refugee_count")
+        adjustment_counts = column_sum(adjustment_cs_counts, adjustment_refugee_counts)
+        entry_counts = column_sum(series.column("entry_cs_count"), series.column("entry_refugee_count"))
+    else:
+        adjustment_cs_counts = [0] * len(series)
+        adjustment_refugee_counts = [0] * len(series)
+        adjustment_counts = column_sum(
+            series.column("adjustment_result_count"),
+            series.column("adjustment_return_postal_count"),
+            series.column("adjustment_return_qr_count"),
         )
-        adjustment_amounts.append(adjustment_amount_value)
-        if department.code == "WV":
-            adjustment_count_value = int(adjustment_totals["cs_count"]) + int(adjustment_totals["refugee_count"])
-            adjustment_cs_counts.append(int(adjustment_totals["cs_count"]))
-            adjustment_refugee_counts.append(int(adjustment_totals["refugee_count"]))
-        else:
-            adjustment_count_value = (
-                int(adjustment_totals["result_count"])
-                + int(adjustment_totals["return_postal_count"])
-                + int(adjustment_totals["return_qr_count"])
-            )
-            adjustment_cs_counts.append(0)
-            adjustment_refugee_counts.append(0)
-        if entry is not None:
-            counts.append(entry_final_count_value(entry=entry, adjustment_totals=adjustment_totals))
-            cs_counts.append(int(entry.cs_count or 0) + int(adjustment_totals["cs_count"]))
-            refugee_counts.append(int(entry.refugee_count or 0) + int(adjustment_totals["refugee_count"]))
-            approach_counts.append(int(entry.approach_count or 0))
-            communication_counts.append(int(entry.communication_count or 0))
-            target_amount = int(entry.daily_target_amount or 0)
-        else:
-            counts.append(adjustment_count_value)
-            cs_counts.append(int(adjustment_totals["cs_count"]))
-            refugee_counts.append(int(adjustment_totals["refugee_count"]))
-            approach_counts.append(0)
-            communication_counts.append(0)
-            target_amount = 0
-        adjustment_counts.append(adjustment_count_value)
-        target_amounts.append(target_amount)
-        rate_values.append(round((amount_value / target_amount) * 100, 1) if target_amount > 0 else None)
+        entry_counts = series.column("entry_result_count")
+    amounts = column_sum(series.column("entry_support_amount"), adjustment_amounts)
+    target_amounts = series.column("entry_daily_target_amount")
     return {
-        "dates": [activity_date.isoformat() for activity_date in latest_dates],
-        "labels": labels,
+        "dates": series.iso_dates(),
+        "labels": _trend_labels(series, resample),
         "amounts": amounts,
-        "counts": counts,
-        "cs_counts": cs_counts,
-        "refugee_counts": refugee_counts,
+        "counts": column_sum(entry_counts, adjustment_counts),
+        "cs_counts": column_sum(series.column("entry_cs_count"), series.column("adjustment_cs_count")),
+        "refugee_counts": column_sum(series.column("entry_refugee_count"), series.column("adjustment_refugee_count")),
         "adjustment_amounts": adjustment_amounts,
         "adjustment_counts": adjustment_counts,
         "adjustment_cs_counts": adjustment_cs_counts,
         "adjustment_refugee_counts": adjustment_refugee_counts,
-        "approach_counts": approach_counts,
-        "communication_counts": communication_counts,
+        "approach_counts": series.column("entry_approach_count"),
+        "communication_counts": series.column("entry_communication_count"),
         "target_amounts": target_amounts,
-        "rate_values": rate_values,
+        "rate_values": rate_column(amounts, target_amounts),
         "has_data": True,
-        "count_label": "件数" if department.code != "WV" else "件数相当",
-        "is_wv": department.code == "WV",
-        "default_visible_count": min(30, len(labels)),
+        "count_label": "件数" if not is_wv else "件数相当",
+        "is_wv": is_wv,
+        "default_visible_count": min(30, len(series)),
     }
 
 
-def build_overall_activity_trend(*, department=None, start_date=None, end_date=None):
+@replica_reads
+def build_overall_activity_trend(*, department=None, start_date=None, end_date=None, resample=RESAMPLE_DAY):
     entry_queryset = MemberDailyMetricEntry.objects.all()
     adjustment_queryset = MetricAdjustment.objects.all()
     if department is not None:
@@ -241,7 +219,9 @@ def build_overall_activity_trend(*, department=None, start_date=None, end_date=N
         adjustment_queryset = adjustment_queryset.filter(target_date__range=(start_date, end_date))
         latest_dates = list(entry_queryset.order_by("entry_date").values_list("entry_date", flat=True).distinct())
     else:
-        latest_dates = list(entry_queryset.order_by("-entry_date").values_list("entry_date", flat=True).distinct()[:120])
+        latest_dates = list(
+            entry_queryset.order_by("-entry_date").values_list("entry_date", flat=True).distinct()[:TREND_WINDOW_SIZE]
+        )
         latest_dates.reverse()
     if not latest_dates:
         return {
@@ -262,105 +242,59 @@ def build_overall_activity_trend(*, department=None, start_date=None, end_date=N
             "is_wv": department is not None and department.code == "WV",
             "default_visible_count": 0,
         }
-    entry_totals = {
-        row["entry_date"]: row
-        for row in entry_queryset.filter(entry_date__in=latest_dates)
-        .values("entry_date")
-        .annotate(
-            result_count_total=Sum("result_count"),
-            support_amount_total=Sum("support_amount"),
-            approach_count_total=Sum("approach_count"),
-            communication_count_total=Sum("communication_count"),
-            cs_count_total=Sum("cs_count"),
-            refugee_count_total=Sum("refugee_count"),
-        )
-    }
-    adjustment_totals = {
-        row["target_date"]: row
-        for row in adjustment_queryset.filter(target_date__in=latest_dates)
-        .values("target_date")
-        .annotate(
-            result_count_total=Sum("result_count"),
-            support_amount_total=Sum("support_amount"),
-            return_postal_count_total=Sum("return_postal_count"),
-            return_postal_amount_total=Sum("return_postal_amount"),
-            return_qr_count_total=Sum("return_qr_count"),
-            return_qr_amount_total=Sum("return_qr_amount"),
-            cs_count_total=Sum("cs_count"),
-            refugee_count_total=Sum("refugee_count"),
-        )
-    }
+
+    series = _load_trend_series(latest_dates, entry_queryset=entry_queryset, adjustment_queryset=adjustment_queryset)
     summary_queryset = DepartmentDailyMetricSummary.objects.filter(entry_date__in=latest_dates)
     if department is not None:
         summary_queryset = summary_queryset.filter(department=department)
-    daily_target_totals = {
-        row["entry_date"]: int(row["daily_target_amount_total"] or 0)
-        for row in summary_queryset.values("entry_date").annotate(daily_target_amount_total=Sum("daily_target_amount"))
-    }
+    series.load_rows(
+        _grouped_series_rows(summary_queryset, date_field="entry_date", fields=("daily_target_amount",)),
+        date_key="entry_date",
+        fields={"daily_target_amount": "daily_target_amount_total"},
+        prefix="summary_",
+    )
+    series = series.resample(resample)
 
-    labels = []
-    amounts = []
-    counts = []
-    cs_counts = []
-    refugee_counts = []
-    adjustment_cs_counts = []
-    adjustment_refugee_counts = []
-    approach_counts = []
-    communication_counts = []
-    target_amounts = []
-    rate_values = []
     use_equivalent_count = department is not None and department.code == "WV"
-    for activity_date in latest_dates:
-        entry_row = entry_totals.get(activity_date, {})
-        adjustment_row = adjustment_totals.get(activity_date, {})
-        labels.append(activity_date.strftime("%m/%d"))
-        amount_value = (
-            int(entry_row.get("support_amount_total") or 0)
-            + int(adjustment_row.get("support_amount_total") or 0)
-            + int(adjustment_row.get("return_postal_amount_total") or 0)
-            + int(adjustment_row.get("return_qr_amount_total") or 0)
+    amounts = column_sum(
+        series.column("entry_support_amount"),
+        series.column("adjustment_support_amount"),
+        series.column("adjustment_return_postal_amount"),
+        series.column("adjustment_return_qr_amount"),
+    )
+    if use_equivalent_count:
+        adjustment_cs_counts = series.column("adjustment_cs_count")
+        adjustment_refugee_counts = series.column("adjustment_refugee_count")
+        cs_counts = column_sum(series.column("entry_cs_count"), adjustment_cs_counts)
+        refugee_counts = column_sum(series.column("entry_refugee_count"), adjustment_refugee_counts)
+        counts = column_sum(cs_counts, refugee_counts)
+    else:
+        adjustment_cs_counts = [0] * len(series)
+        adjustment_refugee_counts = [0] * len(series)
+        cs_counts = [0] * len(series)
+        refugee_counts = [0] * len(series)
+        counts = column_sum(
+            series.column("entry_result_count"),
+            series.column("adjustment_result_count"),
+            series.column("adjustment_return_postal_count"),
+            series.column("adjustment_return_qr_count"),
         )
-        amounts.append(amount_value)
-        if use_equivalent_count:
-            cs_count_value = int(entry_row.get("cs_count_total") or 0) + int(adjustment_row.get("cs_count_total") or 0)
-            refugee_count_value = int(entry_row.get("refugee_count_total") or 0) + int(adjustment_row.get("refugee_count_total") or 0)
-            adjustment_cs_counts.append(int(adjustment_row.get("cs_count_total") or 0))
-            adjustment_refugee_counts.append(int(adjustment_row.get("refugee_count_total") or 0))
-            cs_counts.append(cs_count_value)
-            refugee_counts.append(refugee_count_value)
-            counts.append(cs_count_value + refugee_count_value)
-        else:
-            cs_counts.append(0)
-            refugee_counts.append(0)
-            adjustment_cs_counts.append(0)
-            adjustment_refugee_counts.append(0)
-            counts.append(
-                int(entry_row.get("result_count_total") or 0)
-                + int(adjustment_row.get("result_count_total") or 0)
-                + int(adjustment_row.get("return_postal_count_total") or 0)
-                + int(adjustment_row.get("return_qr_count_total") or 0)
-            )
-        approach_counts.append(int(entry_row.get("approach_count_total") or 0))
-        communication_counts.append(int(entry_row.get("communication_count_total") or 0))
-        target_amount = int(daily_target_totals.get(activity_date) or 0)
-        target_amounts.append(target_amount)
-        rate_values.append(round((amount_value / target_amount) * 100, 1) if target_amount > 0 else None)
-
+    target_amounts = series.column("summary_daily_target_amount")
     return {
-        "dates": [activity_date.isoformat() for activity_date in latest_dates],
-        "labels": labels,
+        "dates": series.iso_dates(),
+        "labels": _trend_labels(series, resample),
         "amounts": amounts,
         "counts": counts,
         "cs_counts": cs_counts,
         "refugee_counts": refugee_counts,
         "adjustment_cs_counts": adjustment_cs_counts,
         "adjustment_refugee_counts": adjustment_refugee_counts,
-        "approach_counts": approach_counts,
-        "communication_counts": communication_counts,
+        "approach_counts": series.column("entry_approach_count"),
+        "communication_counts": series.column("entry_communication_count"),
         "target_amounts": target_amounts,
-        "rate_values": rate_values,
+        "rate_values": rate_column(amounts, target_amounts),
         "has_data": True,
         "count_label": "件数相当" if use_equivalent_count else "件数",
         "is_wv": department is not None and department.code == "WV",
-        "default_visible_count": min(30, len(labels)),
+        "default_visible_count": min(30, len(series)),
     }
@@ -1,4 +1,6 @@
+import re
 from datetime import date, timedelta
+from html import unescape
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
@@ -6,6 +8,7 @@ from apps.accounts.models import Member
 from apps.dairymetrics.models import DepartmentDailyMetricSummary, MemberDailyMetricEntry, MemberMetricTransaction, MemberMonthMetricTarget, MemberPeriodMetricTarget, MetricAdjustment, WVMetricCancellation
 from apps.dairymetrics.services.final_actuals import collect_department_final_actual_totals, collect_member_final_actual_totals
 from apps.performance.forms import PerformanceMetricAdjustmentForm
+from apps.performance.services.adjustments import combined_adjustment_list_page
 from apps.targets.models import MonthTargetMetricValue, Period, PeriodTargetMetricValue, TargetMetric
 from .base import PerformanceTestBase
 
@@ -444,9 +447,15 @@ class AdjustmentsTests(PerformanceTestBase):
                 location_name=f"現場{index:02d}",
             )
 
+        first_page = self.client.get(reverse("performance_adjustments"), HTTP_X_REQUESTED_WITH="XMLHttpRequest")
+        first_html = first_page.json()["list_html"]
+        self.assertIn("performance-adjustments-load-more-btn", first_html)
+        self.assertNotIn("現場00", first_html)
+        next_cursor = re.search(r'data-next-cursor="([^"]+)"', first_html).group(1)
+
         response = self.client.get(
             reverse("performance_adjustments"),
-            {"page": 2},
+            {"after": unescape(next_cursor)},
             HTTP_X_REQUESTED_WITH="XMLHttpRequest",
         )
 
@@ -454,8 +463,63 @@ class AdjustmentsTests(PerformanceTestBase):
         payload = response.json()
         self.assertIn("list_html", payload)
         self.assertIn("現場00", payload["list_html"] or "")
+        self.assertNotIn("現場01", payload["list_html"])
         self.assertNotIn("performance-adjustments-load-more-btn", payload["list_html"])
 
+    def test_combined_adjustment_list_page_interleaves_cancellations_by_keyset(self):
+        wv_department = self.create_department("WV")
+        wv_member = self.create_member(name="Bob", department=wv_department)
+        expected = []
+        for index in range(5):
+            adjustment = MetricAdjustment.objects.create(
+                member=self.member,
+                department=self.department,
+                target_date=date(2026, 5, 1 + index % 3),
+                source_type=MetricAdjustment.SOURCE_POSTAL,
+                return_postal_count=1,
+                return_postal_amount=100 + index,
+            )
+            cancellation = WVMetricCancellation.objects.create(
+                member=wv_member,
+                department=wv_department,
+                target_date=date(2026, 5, 1 + index % 3),
+                support_amount=200 + index,
+                refugee_count=1,
+            )
+            expected.extend([adjustment, cancellation])
+        created_at = timezone.now()
+        MetricAdjustment.objects.update(created_at=created_at)
+        WVMetricCancellation.objects.update(created_at=created_at)
+        expected.sort(
+            key=lambda record: (record.target_date, type(record) is WVMetricCancellation, record.id),
+            reverse=True,
+        )
+
+        rows = []
+        after = ""
+        filters = {"department": None, "q": ""}
+        while True:
+            with self.assertNumQueries(1):
+                page = combined_adjustment_list_page(filters, after=after, per_page=3)
+            rows.extend(page.items)
+            if not page.has_next:
+                break
+            after = page.next_cursor
+
+        self.assertEqual(
+            [(row["record_type"], row["id"]) for row in rows],
+            [
+                ("cancellation" if isinstance(record, WVMetricCancellation) else "adjustment", record.id)
+                for record in expected
+            ],
+        )
+        postal_row = next(row for row in rows if row["record_type"] == "adjustment")
+        self.assertEqual((postal_row["detail_text"], postal_row["source_label"]), ("郵送", "郵送"))
+        cancellation_row = next(row for row in rows if row["record_type"] == "cancellation")
+        self.assertEqual(cancellation_row["source_label"], "キャンセル")
+        self.assertEqual(cancellation_row["edit_url"], "")
+        self.assertEqual(combined_adjustment_list_page(filters, after="broken").items[0]["id"], rows[0]["id"])
+
 
     def test_performance_adjustments_default_list_shows_all_departments(self):
         other_department = self.create_department("WV")
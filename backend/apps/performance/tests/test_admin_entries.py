@@ -4,11 +4,52 @@ from django.urls import reverse
 from django.utils import timezone
 from apps.dairymetrics.models import DepartmentDailyMetricSummary, MemberDailyMetricEntry, MemberMetricTransaction
 from apps.mail.models import MailSendHistory
+from apps.performance.services.admin_entries import build_admin_entry_management_page
 from apps.targets.models import Period
 from .base import PerformanceTestBase
 
 
 class AdminEntriesTests(PerformanceTestBase):
+    def test_admin_entry_member_filter_over_a_year_uses_constant_queries(self):
+        other_department = self.create_department("WV")
+        other_member = self.create_member(name="Bob", department=self.department)
+        start = date(2025, 6, 1)
+        for offset in range(0, 365, 3):
+            entry_date = start + timedelta(days=offset)
+            for department in (self.department, other_department):
+                DepartmentDailyMetricSummary.objects.create(
+                    department=department,
+                    entry_date=entry_date,
+                    created_by=self.member,
+                    updated_by=self.member,
+                )
+            member = self.member if offset % 2 == 0 else other_member
+            MemberDailyMetricEntry.objects.create(member=member, department=self.department, entry_date=entry_date)
+        expected = list(
+            DepartmentDailyMetricSummary.objects.filter(
+                department=self.department,
+                entry_date__in=MemberDailyMetricEntry.objects.filter(member=self.member).values("entry_date"),
+            )
+            .order_by("-entry_date")
+            .values_list("id", flat=True)
+        )
+        cleaned_data = {
+            "department": None,
+            "member": self.member,
+            "date_from": start,
+            "date_to": start + timedelta(days=364),
+        }
+
+        with self.assertNumQueries(3):
+            page = build_admin_entry_management_page(cleaned_data=cleaned_data, page_number=2, next_url="/")
+
+        self.assertEqual(page["paginator"].count, len(expected))
+        self.assertEqual([row["summary"].id for row in page["summary_rows"]], expected[20:40])
+        for row in page["summary_rows"]:
+            names = [item["member_name"] for item in row["entries"]]
+            self.assertEqual(names, ["Alice"])
+            self.assertFalse(row["can_delete_summary"])
+
     def test_closeout_notes_uses_shared_app_shell_and_current_navigation(self):
         response = self.client.get(reverse("performance_closeout_notes"))
 
@@ -0,0 +1,53 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+
+from apps.common.benchmark_dataset import seed_benchmark_dataset
+from apps.dairymetrics.models import DepartmentDailyMetricSummary, MemberDailyMetricEntry, MemberMetricTransaction
+from apps.performance.benchmarks import benchmark_cases, compare_results, run_benchmarks
+
+
+class BenchmarkHarnessTests(TestCase):
+    def test_seeded_dataset_keeps_entry_and_summary_totals_consistent(self):
+        dataset = seed_benchmark_dataset(members=6, days=14, seed=3, posts=5)
+
+        self.assertEqual(dataset.counts["entries"], MemberDailyMetricEntry.objects.count())
+        entry_amount = MemberDailyMetricEntry.objects.aggregate(total=Sum("support_amount"))["total"] or 0
+        transaction_amount = MemberMetricTransaction.objects.aggregate(total=Sum("support_amount"))["total"] or 0
+        summary_amount = DepartmentDailyMetricSummary.objects.aggregate(total=Sum("support_amount"))["total"] or 0
+        self.assertEqual(entry_amount, transaction_amount)
+        self.assertEqual(entry_amount, summary_amount)
+
+    def test_run_benchmarks_reports_every_entry_point(self):
+        dataset = seed_benchmark_dataset(members=4, days=10, seed=1, posts=5)
+
+        results = run_benchmarks(dataset, repeat=1)
+
+        self.assertEqual([row["name"] for row in results], [name for name, _ in benchmark_cases(dataset)])
+        for row in results:
+            self.assertGreater(row["queries"], 0, row["name"])
+        comparison = compare_results(results, results)
+        self.assertTrue(all(row["queries"][0] == row["queries"][1] for row in comparison))
+
+    def test_command_writes_json_results(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_path = Path(output_dir) / "bench.json"
+            call_command(
+                "benchmark_selectors",
+                members=4,
+                days=10,
+                repeat=1,
+                only=["build_metrics_scope_report"],
+                output=str(output_path),
+                use_current_database=True,
+                stdout=StringIO(),
+            )
+            payload = json.loads(output_path.read_text(encoding="utf-8"))
+
+        self.assertEqual(payload["dataset"]["members"], 4)
+        self.assertEqual([row["name"] for row in payload["results"]], ["build_metrics_scope_report"])
@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.dairymetrics.models import DepartmentDataVersion, MemberDailyMetricEntry, MemberMetricTransaction, MetricAdjustment
+from apps.dairymetrics.services.data_versions import data_version_state
+
+from .base import PerformanceTestBase
+
+
+class ConditionalGetTests(PerformanceTestBase):
+    def setUp(self):
+        super().setUp()
+        self.other_department = self.create_department("WV")
+        self.other_member = self.create_member(name="Bob", department=self.other_department)
+        self.selected_day = timezone.localdate() - timedelta(days=1)
+        self.entry = MemberDailyMetricEntry.objects.create(
+            member=self.member,
+            department=self.department,
+            entry_date=self.selected_day,
+            result_count=1,
+            support_amount=1000,
+            activity_closed=True,
+        )
+        self.url = reverse("performance_member_detail_day_detail", args=[self.member.id, self.department.id])
+
+    def _get(self, **headers):
+        return self.client.get(self.url, {"date": self.selected_day.isoformat()}, HTTP_X_REQUESTED_WITH="XMLHttpRequest", **headers)
+
+    def test_writes_bump_only_their_department_version(self):
+        before, _ = data_version_state([self.department.id])
+        other_before, _ = data_version_state([self.other_department.id])
+
+        MemberMetricTransaction.objects.create(
+            entry=self.entry,
+            support_amount=1000,
+            age_band=MemberMetricTransaction.AGE_BAND_TWENTIES,
+            gender=MemberMetricTransaction.GENDER_FEMALE,
+            nationality_type=MemberMetricTransaction.NATIONALITY_DOMESTIC,
+        )
+        MetricAdjustment.objects.create(member=self.member, department=self.department, result_count=1)
+
+        after, _ = data_version_state([self.department.id])
+        self.assertNotEqual(before, after)
+        self.assertEqual(other_before, data_version_state([self.other_department.id])[0])
+        self.assertGreater(DepartmentDataVersion.objects.get(department=self.department).version, 2)
+
+    def test_fragment_returns_304_until_department_data_changes(self):
+        first = self._get()
+        self.assertEqual(first.status_code, 200)
+        self.assertIn("no-cache", first["Cache-Control"])
+        etag = first["ETag"]
+
+        # Session, user, stale-entry closeout and the version lookup; no selectors.
+        with self.assertNumQueries(4):
+            unchanged = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(unchanged.content, b"")
+
+        MetricAdjustment.objects.create(member=self.other_member, department=self.other_department, result_count=1)
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.entry.result_count = 2
+        self.entry.save()
+        changed = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_etag_is_scoped_to_the_viewer(self):
+        etag = self._get()["ETag"]
+        other_admin = self.create_user("perf-admin-2", is_staff=True)
+        self.login(other_admin)
+
+        self.assertEqual(self._get(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_member_dashboard_fragment_uses_member_departments(self):
+        report_user = self.create_user("perf-member-etag")
+        self.member.user = report_user
+        self.member.save(update_fields=["user"])
+        self.client.force_login(report_user)
+        url = reverse("performance_member_dashboard_day_detail")
+
+        etag = self.client.get(url, {"date": self.selected_day.isoformat()})["ETag"]
+        response = self.client.get(url, {"date": self.selected_day.isoformat()}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        MetricAdjustment.objects.create(member=self.member, department=self.department, result_count=1)
+        response = self.client.get(url, {"date": self.selected_day.isoformat()}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
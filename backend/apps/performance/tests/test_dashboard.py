@@ -5,6 +5,7 @@ from django.utils import timezone
 from apps.accounts.models import Department, Member, MemberDepartment
 from apps.dairymetrics.models import MemberDailyMetricEntry, MemberMetricTransaction, MetricAdjustment
 from apps.mail.models import MailSendHistory
+from apps.performance.services.member_cards import _collect_member_latest_entries_by_department
 from apps.targets.models import MonthTargetMetricValue, Period, PeriodTargetMetricValue, TargetMetric
 from .base import PerformanceTestBase
 
@@ -400,6 +401,28 @@ class DashboardTests(PerformanceTestBase):
         self.assertLess(content.index("Newer"), content.index("Older"))
 
 
+    def test_member_latest_entries_keep_only_recent_rows_per_member(self):
+        today = timezone.localdate()
+        other_member = Member.objects.create(name="Other", default_department=self.department)
+        MemberDepartment.objects.create(member=other_member, department=self.department)
+        for offset in range(10):
+            MemberDailyMetricEntry.objects.create(
+                member=self.member,
+                department=self.department,
+                entry_date=today - timedelta(days=offset),
+                support_amount=1000 * offset,
+            )
+        MemberDailyMetricEntry.objects.create(member=other_member, department=self.department, entry_date=today - timedelta(days=30))
+
+        latest_entries, _adjustment_totals = _collect_member_latest_entries_by_department(
+            member_department_pairs=[(self.member, self.department), (other_member, self.department)],
+        )
+
+        entries = latest_entries[self.department.id][(self.member.id, self.department.id)]
+        self.assertEqual([entry.entry_date for entry in entries], [today - timedelta(days=offset) for offset in range(6)])
+        self.assertEqual(len(latest_entries[self.department.id][(other_member.id, self.department.id)]), 1)
+
+
     def test_performance_index_marks_member_when_last_three_entries_are_zero_count(self):
         today = timezone.localdate()
         for offset in range(3):
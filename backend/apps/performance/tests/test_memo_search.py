@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.dairymetrics.models import MemberDailyMetricEntry
+from apps.dairymetrics.services import memo_search
+from apps.dairymetrics.services.memo_search import BoundedCountPaginator, _sqlite_index_ready, search_closeout_entries
+
+from .base import PerformanceTestBase
+
+
+class MemoSearchTests(PerformanceTestBase):
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.localdate()
+        self.other_member = self.create_member(name="Bob", department=self.department)
+
+    def _entry(self, member, memo, *, days_ago=0, location_name=""):
+        return MemberDailyMetricEntry.objects.create(
+            member=member,
+            department=self.department,
+            entry_date=self.today - timedelta(days=days_ago),
+            location_name=location_name,
+            memo=memo,
+        )
+
+    def _search(self, query, **kwargs):
+        entries = MemberDailyMetricEntry.objects.exclude(memo="").order_by("-entry_date", "-id")
+        return list(search_closeout_entries(entries, query, **kwargs))
+
+    def test_index_follows_entry_and_member_changes(self):
+        self.assertTrue(_sqlite_index_ready("default"))
+        entry = self._entry(self.member, "比較資料を準備する", location_name="新宿駅前")
+        self._entry(self.other_member, "別のケース")
+        self.assertEqual(self._search("比較資料"), [entry])
+        self.assertEqual(self._search("新宿駅"), [entry])
+        self.assertEqual(self._search("alice"), [entry])
+
+        entry.memo = "予算の確認が必要"
+        entry.save()
+        self.assertEqual(self._search("比較資料"), [])
+        self.assertEqual(self._search("予算の確認"), [entry])
+
+        self.member.name = "Alicia"
+        self.member.save()
+        self.assertEqual(self._search("Alicia"), [entry])
+
+        entry.delete()
+        self.assertEqual(self._search("予算の確認"), [])
+
+    def test_index_check_is_repeated_after_migrate(self):
+        memo_search._index_state["default"] = False
+        entry = self._entry(self.member, "比較資料を準備する")
+        self.assertEqual(self._search("比較資料"), [entry])
+
+        call_command("migrate", verbosity=0)
+
+        self.assertNotIn("default", memo_search._index_state)
+        self.assertTrue(_sqlite_index_ready("default"))
+
+    def test_short_queries_and_ranking(self):
+        weak = self._entry(self.member, "声かけ", days_ago=0)
+        strong = self._entry(self.other_member, "声かけ 声かけ 声かけ", days_ago=1)
+        self.assertEqual(self._search("声か"), [weak, strong])
+        self.assertEqual(self._search("声かけ"), [weak, strong])
+        self.assertEqual(self._search("声かけ", ranked=True), [strong, weak])
+
+    def test_paginator_count_is_bounded(self):
+        for index in range(4):
+            self._entry(self.member, f"メモ{index}", days_ago=index)
+
+        paginator = BoundedCountPaginator(MemberDailyMetricEntry.objects.order_by("-entry_date"), 2, count_limit=3)
+        self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.count_label, "3+")
+        self.assertEqual(BoundedCountPaginator(MemberDailyMetricEntry.objects.all(), 2).count_label, "4")
+
+    def test_closeout_notes_sorts_by_relevance(self):
+        self._entry(self.member, "比較資料", location_name="新宿駅前")
+        self._entry(self.other_member, "比較資料を比較資料と並べる", days_ago=1)
+
+        response = self.client.get(
+            reverse("performance_closeout_notes"),
+            {"scope": "month", "q": "比較資料", "sort": "relevance"},
+            HTTP_X_REQUESTED_WITH="XMLHttpRequest",
+        )
+
+        payload = response.json()
+        self.assertEqual(payload["count_label"], "2")
+        self.assertLess(payload["results_html"].index("Bob"), payload["results_html"].index("Alice"))
+        self.assertIn(f'datetime="{self.today:%Y-%m-%d}"', payload["results_html"])
@@ -0,0 +1,104 @@
+from datetime import datetime, time
+
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import Member
+from apps.common.benchmark_dataset import seed_benchmark_dataset
+from apps.common.test_helpers import AppTestMixin, QueryBudgetMixin
+from apps.testimony.models import Article
+
+
+# Upper bounds per page. They sit a little above today's counts so that a new
+# per-member or per-day loop fails here instead of surfacing in production.
+QUERY_BUDGETS = {
+    "metrics_v2_admin": 80,
+    "metrics_v2_member": 86,
+    "metrics_report": 40,
+    "performance_index": 55,
+    "performance_member_dashboard": 56,
+    "performance_member_history": 42,
+    "performance_member_detail": 58,
+    "dashboard_index": 52,
+    "talks_index": 15,
+    "testimony_article_list": 8,
+}
+
+# Both sizes cover more history than the six-month/six-period trend windows, so
+# any difference in query count comes from headcount or row count.
+SMALL_DATASET = {"members": 4, "days": 100}
+LARGE_DATASET = {"members": 16, "days": 200}
+
+
+class QueryBudgetTests(AppTestMixin, QueryBudgetMixin, TestCase):
+    def _seed(self, *, members: int, days: int):
+        dataset = seed_benchmark_dataset(members=members, days=days, seed=1, posts=members * 3)
+        member = dataset.members_for("UN")[0]
+        member_user = self.create_user(f"budget-member-{members}")
+        member.user = member_user
+        member.save(update_fields=["user"])
+        created_at = timezone.make_aware(datetime.combine(dataset.end_date, time(9)))
+        Article.objects.bulk_create(
+            [
+                Article(
+                    title=f"証し{index:04d}",
+                    body="本文",
+                    author="証者",
+                    created_by=dataset.admin_user,
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+                for index in range(members * 3)
+            ]
+        )
+        return dataset, member, member_user
+
+    def _page_urls(self, dataset, member, member_user):
+        department = dataset.departments["UN"]
+        metrics_v2_url = f"{reverse('dairymetrics_metrics_v2_demo')}?department=UN&scope=month"
+        return {
+            "metrics_v2_admin": (dataset.admin_user, metrics_v2_url),
+            "metrics_v2_member": (member_user, metrics_v2_url),
+            "metrics_report": (dataset.admin_user, f"{reverse('dairymetrics_metrics_report')}?department=UN"),
+            "performance_index": (dataset.admin_user, reverse("performance_index")),
+            "performance_member_dashboard": (member_user, reverse("performance_member_dashboard")),
+            "performance_member_history": (member_user, reverse("performance_member_history")),
+            "performance_member_detail": (
+                dataset.admin_user,
+                reverse("performance_member_detail", args=[member.id, department.id]),
+            ),
+            "dashboard_index": (dataset.admin_user, reverse("dashboard_index")),
+            "talks_index": (member_user, reverse("talks_index")),
+            "testimony_article_list": (member_user, reverse("testimony_article_list")),
+        }
+
+    def _measure(self, *, members: int, days: int) -> dict[str, int]:
+        counts = {}
+        with transaction.atomic():
+            dataset, member, member_user = self._seed(members=members, days=days)
+            for name, (user, url) in self._page_urls(dataset, member, member_user).items():
+                self.login(user)
+                counts[name] = self.count_get_queries(url)
+            transaction.set_rollback(True)
+        return counts
+
+    def test_key_pages_stay_within_query_budget_and_do_not_scale(self):
+        small = self._measure(**SMALL_DATASET)
+        large = self._measure(**LARGE_DATASET)
+
+        self.assertEqual(set(small), set(QUERY_BUDGETS))
+        for name, budget in QUERY_BUDGETS.items():
+            with self.subTest(page=name):
+                self.assertLessEqual(large[name], budget, f"{name} ran {large[name]} queries (budget {budget})")
+        self.assertQueryCountsDoNotScale(small, large)
+
+    def test_assert_query_budget_reports_repeated_queries(self):
+        department = self.create_department("UN")
+        members = [self.create_member(name=f"member-{index}", department=department) for index in range(3)]
+
+        with self.assertRaisesMessage(AssertionError, "3x SELECT"):
+            with self.assertQueryBudget(2, label="member loop"):
+                for member in members:
+                    Member.objects.filter(id=member.id).exists()
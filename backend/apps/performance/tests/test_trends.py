@@ -0,0 +1,73 @@
+from datetime import date
+
+from django.test import SimpleTestCase
+
+from apps.common.date_series import DateSeries, height_column, rate_column
+from apps.dairymetrics.models import MemberDailyMetricEntry, MetricAdjustment
+from apps.performance.services.trends import build_member_activity_trend
+from .base import PerformanceTestBase
+
+
+class DateSeriesTests(SimpleTestCase):
+    def test_load_rows_aligns_grouped_rows_to_the_date_index(self):
+        series = DateSeries([date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 9)])
+        series.load_rows(
+            [{"day": date(2026, 3, 9), "total": 5}, {"day": date(2026, 3, 1), "total": 2}, {"day": date(2026, 4, 1), "total": 9}],
+            date_key="day",
+            fields={"amount": "total"},
+        )
+
+        self.assertEqual(series.column("amount"), [2, 0, 5])
+        self.assertEqual(series.column("missing"), [0, 0, 0])
+
+    def test_resample_sums_into_week_and_month_buckets(self):
+        series = DateSeries(
+            [date(2026, 2, 27), date(2026, 3, 1), date(2026, 3, 2), date(2026, 3, 9)],
+            {"amount": [1, 2, 3, 4]},
+        )
+
+        weekly = series.resample("week")
+        monthly = series.resample("month")
+
+        self.assertEqual(weekly.dates, [date(2026, 2, 23), date(2026, 3, 2), date(2026, 3, 9)])
+        self.assertEqual(weekly.column("amount"), [3, 3, 4])
+        self.assertEqual(monthly.dates, [date(2026, 2, 1), date(2026, 3, 1)])
+        self.assertEqual(monthly.column("amount"), [1, 9])
+        with self.assertRaises(ValueError):
+            series.resample("year")
+
+    def test_rate_and_height_columns(self):
+        self.assertEqual(rate_column([50, 10, 0], [200, 0, 100]), [25.0, None, 0.0])
+        self.assertEqual(height_column([0, 5, 10]), [12, 50, 100])
+        self.assertEqual(height_column([1, 100]), [14, 100])
+
+
+class ActivityTrendTests(PerformanceTestBase):
+    def test_member_activity_trend_can_resample_by_month(self):
+        for entry_date, amount in ((date(2026, 2, 27), 1000), (date(2026, 3, 2), 2000), (date(2026, 3, 20), 3000)):
+            MemberDailyMetricEntry.objects.create(
+                member=self.member,
+                department=self.department,
+                entry_date=entry_date,
+                support_amount=amount,
+                result_count=1,
+                daily_target_amount=2000,
+            )
+        MetricAdjustment.objects.create(
+            member=self.member,
+            department=self.department,
+            target_date=date(2026, 3, 5),
+            source_type=MetricAdjustment.SOURCE_POSTAL,
+            return_postal_count=1,
+            return_postal_amount=500,
+        )
+
+        daily = build_member_activity_trend(member=self.member, department=self.department)
+        monthly = build_member_activity_trend(member=self.member, department=self.department, resample="month")
+
+        self.assertEqual(len(daily["dates"]), 4)
+        self.assertEqual(monthly["labels"], ["2026/02", "2026/03"])
+        self.assertEqual(monthly["amounts"], [1000, 5500])
+        self.assertEqual(monthly["counts"], [1, 3])
+        self.assertEqual(monthly["target_amounts"], [2000, 4000])
+        self.assertEqual(monthly["rate_values"], [50.0, 137.5])
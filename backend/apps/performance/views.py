@@ -3,7 +3,6 @@ from datetime import date
 
 from django.contrib.auth import login as auth_login, logout as auth_logout
 from django.contrib.auth import get_user_model
-from django.core.paginator import Paginator
 from django.db.models import Q, Sum
 from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
@@ -13,7 +12,10 @@ from django.utils.http import urlencode
 from django.utils import timezone
 
 from apps.accounts.auth import ROLE_ADMIN, ROLE_REPORT, resolve_request_role
-from apps.accounts.models import Department, Member, MemberDepartment
+from apps.accounts.models import Department, Member
+from apps.common.conditional_get import conditional_on_data_version
+from apps.common.keyset import KeysetPage
+from apps.common.reference_loaders import active_department, member_department_ids
 from apps.common.target_periods import period_options_active_first
 from apps.dairymetrics.forms import DairyMetricsLoginForm, DairymetricsV2TransactionForm, MemberScopeTargetForm
 from apps.dairymetrics.models import (
@@ -24,6 +26,7 @@ from apps.dairymetrics.models import (
     WVMetricCancellation,
 )
 from apps.dairymetrics.services.activity_state import auto_close_stale_entries
+from apps.dairymetrics.services.memo_search import BoundedCountPaginator, search_closeout_entries
 from apps.dairymetrics.services.final_actuals import (
     collect_department_final_actual_totals,
     collect_department_final_actual_totals_by_codes,
@@ -65,10 +68,7 @@ from apps.performance.services.scopes import (
     resolve_performance_history_scope as _resolve_performance_history_scope,
 )
 from apps.performance.services.admin_entries import build_admin_entry_management_page
-from apps.performance.services.adjustments import (
-    combined_adjustment_list_rows,
-    filtered_adjustments_queryset,
-)
+from apps.performance.services.adjustments import combined_adjustment_list_page
 from apps.performance.services.adjustment_options import (
     active_department_code_map,
     adjustment_member_options,
@@ -133,9 +133,19 @@ def require_performance_roles(*allowed_roles: str, auto_close: bool = True):
 
     return decorator
 
+def _url_department_ids(request: HttpRequest, member_id: int, department_id: int):
+    return [department_id]
+
+def _request_member_department_ids(request: HttpRequest):
+    return Department.objects.filter(
+        Q(member_links__member__user_id=request.user.pk) | Q(default_members__user_id=request.user.pk)
+    ).values_list("id", flat=True)
+
 def _resolve_performance_member_department_or_404(*, member, department_id):
-    department = get_object_or_404(Department, pk=department_id, is_active=True)
-    if not MemberDepartment.objects.filter(member=member, department=department).exists() and member.default_department_id != department.id:
+    department = active_department(department_id)
+    if department is None:
+        raise Http404
+    if department.id not in member_department_ids(member) and member.default_department_id != department.id:
         raise Http404
     return department
 
@@ -297,6 +307,7 @@ def performance_closeout_notes(request: HttpRequest) -> HttpResponse:
     selected_department = (request.GET.get("department") or "").strip()
     selected_member = (request.GET.get("member") or "").strip()
     query = (request.GET.get("q") or "").strip()
+    sort = "relevance" if query and request.GET.get("sort") == "relevance" else "date"
 
     entries = (
         MemberDailyMetricEntry.objects.filter(
@@ -310,15 +321,9 @@ def performance_closeout_notes(request: HttpRequest) -> HttpResponse:
         entries = entries.filter(department_id=int(selected_department))
     if selected_member.isdigit():
         entries = entries.filter(member_id=int(selected_member))
-    if query:
-        entries = entries.filter(
-            Q(memo__icontains=query)
-            | Q(member__name__icontains=query)
-            | Q(department__code__icontains=query)
-            | Q(location_name__icontains=query)
-        )
+    entries = search_closeout_entries(entries, query, ranked=sort == "relevance")
 
-    paginator = Paginator(entries, 30)
+    paginator = BoundedCountPaginator(entries, 30)
     page_obj = paginator.get_page(request.GET.get("page") or 1)
     nav_items = performance_nav_items()
     if resolve_request_role(request) == ROLE_REPORT:
@@ -332,6 +337,7 @@ def performance_closeout_notes(request: HttpRequest) -> HttpResponse:
         "selected_department": selected_department,
         "selected_member": selected_member,
         "query": query,
+        "sort": sort,
         "date_from": notes_scope.start_date,
         "date_to": notes_scope.end_date,
         "today": today,
@@ -349,6 +355,7 @@ def performance_closeout_notes(request: HttpRequest) -> HttpResponse:
                     request=request,
                 ),
                 "count": paginator.count,
+                "count_label": paginator.count_label,
                 "scope_key": notes_scope.key,
                 "scope_label": notes_scope.label,
             }
@@ -632,12 +639,14 @@ def _render_member_history_list_response(
     return render(request, "performance/partials/member_history_day_detail_cards.html", context)
 
 @require_performance_roles(ROLE_ADMIN)
+@conditional_on_data_version(_url_department_ids)
 def performance_member_history_detail_day_detail(request: HttpRequest, member_id: int, department_id: int) -> HttpResponse:
     member = get_object_or_404(Member.objects.select_related("default_department"), pk=member_id)
     department = _resolve_performance_member_department_or_404(member=member, department_id=department_id)
     return _render_member_history_day_detail_response(request=request, member=member, department=department, is_admin=True)
 
 @require_performance_roles(ROLE_ADMIN)
+@conditional_on_data_version(_url_department_ids)
 def performance_member_history_detail_list(request: HttpRequest, member_id: int, department_id: int) -> HttpResponse:
     member = get_object_or_404(Member.objects.select_related("default_department"), pk=member_id)
     department = _resolve_performance_member_department_or_404(member=member, department_id=department_id)
@@ -719,12 +728,14 @@ def _render_member_recent_detail_response(
     return render(request, "performance/partials/member_day_detail_cards.html", context)
 
 @require_performance_roles(ROLE_ADMIN)
+@conditional_on_data_version(_url_department_ids)
 def performance_member_detail_day_detail(request: HttpRequest, member_id: int, department_id: int) -> HttpResponse:
     member = get_object_or_404(Member.objects.select_related("default_department"), pk=member_id)
     department = _resolve_performance_member_department_or_404(member=member, department_id=department_id)
     return _render_member_day_detail_response(request=request, member=member, department=department, is_admin=True)
 
 @require_performance_roles(ROLE_ADMIN)
+@conditional_on_data_version(_url_department_ids)
 def performance_member_detail_recent_detail(request: HttpRequest, member_id: int, department_id: int) -> HttpResponse:
     member = get_object_or_404(Member.objects.select_related("default_department"), pk=member_id)
     department = _resolve_performance_member_department_or_404(member=member, department_id=department_id)
@@ -756,6 +767,7 @@ def performance_member_insight(request: HttpRequest, member_id: int, department_
     return render(request, "performance/member_detail.html", context)
 
 @require_performance_roles(ROLE_ADMIN, ROLE_REPORT)
+@conditional_on_data_version(_url_department_ids)
 def performance_member_insight_day_detail(request: HttpRequest, member_id: int, department_id: int) -> HttpResponse:
     member = get_object_or_404(Member.objects.select_related("default_department"), pk=member_id)
     department = _resolve_performance_member_department_or_404(member=member, department_id=department_id)
@@ -768,6 +780,7 @@ def performance_member_insight_day_detail(request: HttpRequest, member_id: int,
     )
 
 @require_performance_roles(ROLE_ADMIN, ROLE_REPORT)
+@conditional_on_data_version(_url_department_ids)
 def performance_member_insight_recent_detail(request: HttpRequest, member_id: int, department_id: int) -> HttpResponse:
     member = get_object_or_404(Member.objects.select_related("default_department"), pk=member_id)
     department = _resolve_performance_member_department_or_404(member=member, department_id=department_id)
@@ -804,6 +817,7 @@ def performance_member_history_insight(request: HttpRequest, member_id: int, dep
     return render(request, "performance/member_history.html", context)
 
 @require_performance_roles(ROLE_ADMIN, ROLE_REPORT)
+@conditional_on_data_version(_url_department_ids)
 def performance_member_history_insight_day_detail(request: HttpRequest, member_id: int, department_id: int) -> HttpResponse:
     member = get_object_or_404(Member.objects.select_related("default_department"), pk=member_id)
     department = _resolve_performance_member_department_or_404(member=member, department_id=department_id)
@@ -816,6 +830,7 @@ def performance_member_history_insight_day_detail(request: HttpRequest, member_i
     )
 
 @require_performance_roles(ROLE_ADMIN, ROLE_REPORT)
+@conditional_on_data_version(_url_department_ids)
 def performance_member_history_insight_list(request: HttpRequest, member_id: int, department_id: int) -> HttpResponse:
     member = get_object_or_404(Member.objects.select_related("default_department"), pk=member_id)
     department = _resolve_performance_member_department_or_404(member=member, department_id=department_id)
@@ -828,6 +843,7 @@ def performance_member_history_insight_list(request: HttpRequest, member_id: int
     )
 
 @require_performance_roles(ROLE_ADMIN, ROLE_REPORT)
+@conditional_on_data_version(_request_member_department_ids)
 def performance_member_dashboard(request: HttpRequest) -> HttpResponse:
     if request.user.is_staff or request.user.is_superuser:
         return redirect("performance_index")
@@ -867,6 +883,7 @@ def performance_member_dashboard(request: HttpRequest) -> HttpResponse:
     return render(request, "performance/member_detail.html", context)
 
 @require_performance_roles(ROLE_ADMIN, ROLE_REPORT)
+@conditional_on_data_version(_request_member_department_ids)
 def performance_member_dashboard_day_detail(request: HttpRequest) -> HttpResponse:
     if request.user.is_staff or request.user.is_superuser:
         raise Http404
@@ -879,6 +896,7 @@ def performance_member_dashboard_day_detail(request: HttpRequest) -> HttpRespons
     return _render_member_day_detail_response(request=request, member=member, department=department, is_admin=False)
 
 @require_performance_roles(ROLE_ADMIN, ROLE_REPORT)
+@conditional_on_data_version(_request_member_department_ids)
 def performance_member_dashboard_recent_detail(request: HttpRequest) -> HttpResponse:
     if request.user.is_staff or request.user.is_superuser:
         raise Http404
@@ -904,6 +922,7 @@ def performance_member_history(request: HttpRequest) -> HttpResponse:
     return render(request, "performance/member_history.html", context)
 
 @require_performance_roles(ROLE_ADMIN, ROLE_REPORT)
+@conditional_on_data_version(_request_member_department_ids)
 def performance_member_history_list(request: HttpRequest) -> HttpResponse:
     if request.user.is_staff or request.user.is_superuser:
         raise Http404
@@ -916,6 +935,7 @@ def performance_member_history_list(request: HttpRequest) -> HttpResponse:
     return _render_member_history_list_response(request=request, member=member, department=department, is_admin=False)
 
 @require_performance_roles(ROLE_ADMIN, ROLE_REPORT)
+@conditional_on_data_version(_request_member_department_ids)
 def performance_member_history_day_detail(request: HttpRequest) -> HttpResponse:
     if request.user.is_staff or request.user.is_superuser:
         raise Http404
@@ -1068,9 +1088,6 @@ def performance_adjustments(request: HttpRequest) -> HttpResponse:
         filter_data["date_from"] = ""
         filter_data["date_to"] = ""
     filter_form = PerformanceEntryFilterForm(filter_data)
-    adjustments_queryset = MetricAdjustment.objects.none()
-    if filter_form.is_valid():
-        adjustments_queryset = filtered_adjustments_queryset(filter_form.cleaned_data)
 
     if request.method == "POST":
         adjustment_id = request.POST.get("adjustment_id")
@@ -1095,16 +1112,16 @@ def performance_adjustments(request: HttpRequest) -> HttpResponse:
         list_filter_data["q"] = ""
     list_filter_form = PerformanceAdjustmentListFilterForm(list_filter_data)
     if list_filter_form.is_valid():
-        adjustments_queryset = combined_adjustment_list_rows(list_filter_form.cleaned_data)
+        list_page = combined_adjustment_list_page(
+            list_filter_form.cleaned_data,
+            after=request.GET.get("after", ""),
+        )
     else:
-        adjustments_queryset = []
+        list_page = KeysetPage(items=[])
 
-    paginator = Paginator(adjustments_queryset, 20)
-    page_obj = paginator.get_page(request.GET.get("page") or 1)
     list_context = {
-        "adjustments": page_obj.object_list,
-        "page_obj": page_obj,
-        "paginator": paginator,
+        "adjustments": list_page.items,
+        "list_page": list_page,
     }
     if request.headers.get("X-Requested-With") == "XMLHttpRequest":
         return JsonResponse(
@@ -1127,9 +1144,8 @@ def performance_adjustments(request: HttpRequest) -> HttpResponse:
         "form": form,
         "edit_adjustment": edit_adjustment,
         "status_message": status_message,
-        "page_obj": page_obj,
-        "paginator": paginator,
-        "adjustments": page_obj.object_list,
+        "list_page": list_page,
+        "adjustments": list_page.items,
         "member_options": member_options,
         "department_code_map": department_code_map,
     }
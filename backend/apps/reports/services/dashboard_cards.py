@@ -1,18 +1,30 @@
+import hashlib
+import logging
 from datetime import timedelta
 
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
 
 from apps.accounts.models import Department
 from apps.common.dashboard_snapshot import build_member_rows, build_submission_snapshot
+from apps.common.reference_loaders import active_target_metrics
 from apps.common.target_periods import current_active_period
 from apps.common.report_metrics import (
     SPLIT_COUNT_CODES,
-    collect_actual_totals,
+    collect_actual_totals_for_ranges,
     format_metric_triples,
     metric_detail_rows,
 )
 from apps.dairymetrics.models import MemberDailyMetricEntry
-from apps.targets.models import MonthTargetMetricValue, PeriodTargetMetricValue, TargetMetric
+from apps.dairymetrics.services.data_versions import data_version_state
+from apps.targets.models import MonthTargetMetricValue, PeriodTargetMetricValue
+from config.query_profiler import profiled
+
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_CARDS_CACHE_SECONDS = 60 * 60
 
 
 def format_amount_text(value):
@@ -21,11 +33,32 @@ def format_amount_text(value):
     return value
 
 
+def _cards_cache_key(today) -> str:
+    token, _last_modified = data_version_state()
+    digest = hashlib.sha1(f"{settings.APP_RELEASE}|{token}".encode()).hexdigest()[:16]
+    return f"report_dashboard_cards:{today.isoformat()}:{digest}"
+
+
+@profiled("report_dashboard_cards")
 def build_report_dashboard_cards_context():
+    """Return the landing page cards, memoized per day and data version.
+
+    Every input (reports, adjustments, targets, periods, departments) bumps the
+    department data versions, so a new version or a new day is a cache miss.
+    """
     today = timezone.localdate()
-    target_departments = list(
-        Department.objects.filter(is_active=True).order_by("code").values_list("code", "name")
-    )
+    cache_key = _cards_cache_key(today)
+    context = cache.get(cache_key)
+    if context is None:
+        context = _build_report_dashboard_cards_context(today=today)
+        cache.set(cache_key, context, DASHBOARD_CARDS_CACHE_SECONDS)
+        logger.info("report_dashboard_cards cache_miss key=%s", cache_key)
+    return context
+
+
+def _build_report_dashboard_cards_context(*, today):
+    departments = list(Department.objects.filter(is_active=True).order_by("code").only("id", "code", "name"))
+    target_departments = [(department.code, department.name) for department in departments]
     snapshot = build_submission_snapshot(
         report_date=today,
         target_departments=target_departments,
@@ -93,32 +126,23 @@ def build_report_dashboard_cards_context():
     else:
         month_end = current_month.replace(month=current_month.month + 1, day=1) - timedelta(days=1)
 
-    month_actual_totals_by_code = collect_actual_totals(
-        start_date=month_start,
-        end_date=month_end,
+    actual_ranges = {"month": (month_start, month_end)}
+    if period_start and period_end:
+        actual_ranges["period"] = (period_start, period_end)
+    actual_totals = collect_actual_totals_for_ranges(
+        ranges=actual_ranges,
         target_codes=target_codes,
         include_adjustments=True,
     )
-    if period_start and period_end:
-        period_actual_totals_by_code = collect_actual_totals(
-            start_date=period_start,
-            end_date=period_end,
-            target_codes=target_codes,
-            include_adjustments=True,
-        )
-    else:
-        period_actual_totals_by_code = {
-            code: {"count": 0, "amount": 0, "cs_count": 0, "refugee_count": 0}
-            for code in target_codes
-        }
-
-    metrics_by_code = {}
-    departments_by_code = {department.code: department for department in Department.objects.filter(code__in=target_codes)}
-    for code, _ in target_departments:
-        department = departments_by_code.get(code)
-        metrics_by_code[code] = list(
-            TargetMetric.objects.filter(department=department, is_active=True).order_by("display_order", "id")
-        ) if department else []
+    month_actual_totals_by_code = actual_totals["month"]
+    period_actual_totals_by_code = actual_totals.get("period") or {
+        code: {"count": 0, "amount": 0, "cs_count": 0, "refugee_count": 0}
+        for code in target_codes
+    }
+
+    metrics_by_code = {
+        department.code: active_target_metrics(department, prime=departments) for department in departments
+    }
 
     target_progress_rows = []
     for code, label in target_departments:
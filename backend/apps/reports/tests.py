@@ -1,7 +1,7 @@
 from datetime import timedelta
 
 from django.db.models import Sum
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
@@ -892,3 +892,27 @@ class ReportTargetMonthSelectionTests(TestCase):
         row = next(r for r in response.context["target_progress_rows"] if r["label"] == "UN")
         self.assertIn("1,300", row["month_actual"])
         self.assertIn("1,300", row["period_actual"])
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "report-cards"}})
+    def test_report_index_cards_are_memoized_until_data_changes(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        today = timezone.localdate()
+        un = Department.objects.create(name="UN", code="UN")
+        reporter = Member.objects.create(name="Reporter", login_id="report_cards_user", password="")
+        TargetMetric.objects.create(department=un, code="amount", label="Amount", unit="yen", display_order=1)
+        self.client.get(reverse("report_index"))
+
+        # Session, department buttons and the data-version lookup; no card queries.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("report_index"))
+        self.assertEqual(response.context["kpi_cards"][0]["amount"], 0)
+
+        report = DailyDepartmentReport.objects.create(
+            department=un, report_date=today, reporter=reporter, total_count=1, followup_count=1200
+        )
+        DailyDepartmentReportLine.objects.create(report=report, member=reporter, amount=1200, count=1)
+        response = self.client.get(reverse("report_index"))
+        self.assertEqual(response.context["kpi_cards"][0]["amount"], 1200)
+        self.assertEqual(response.context["submission_rows"][0]["reporter_name"], "Reporter")
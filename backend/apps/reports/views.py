@@ -12,6 +12,7 @@ from apps.accounts.auth import ROLE_ADMIN, ROLE_REPORT, require_roles
 from apps.accounts.models import Department, Member
 from apps.common.report_metrics import SPLIT_COUNT_CODES
 from apps.dairymetrics.models import MemberDailyMetricEntry
+from apps.dairymetrics.services.data_versions import bump_data_versions
 from apps.targets.models import Period
 
 from .forms import ReportSubmissionForm
@@ -369,6 +370,8 @@ def _render_report_form(
                     for row in parsed_rows
                 ]
             )
+            # ``bulk_create`` sends no signals; move the version so cached dashboards see the new lines.
+            bump_data_versions([report.department_id])
 
             if editing_report:
                 return redirect(redirect_target)
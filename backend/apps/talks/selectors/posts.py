@@ -9,6 +9,7 @@ from django.http import HttpRequest
 from django.utils import timezone
 
 from apps.accounts.models import Member
+from config.query_profiler import profiled
 
 from ..models import (
     KnowledgePost,
@@ -167,6 +168,7 @@ def _append_preferred_tags(query_params, *, has_explicit_tag_query: bool, select
             query_params.appendlist("tag", tag)
 
 
+@profiled("talks_index_context")
 def build_talks_index_context(
     request: HttpRequest,
     *,
@@ -1,19 +1,60 @@
 import os
+import time
 
+from django.contrib.auth import SESSION_KEY
+from django.db import DEFAULT_DB_ALIAS
 from django.http import HttpRequest
+from django.utils.dateparse import parse_datetime
 from django.utils.text import slugify
 
-from apps.accounts.auth import ROLE_ADMIN, SESSION_ROLE_KEY
+from apps.accounts.auth import ROLE_ADMIN, SESSION_ROLE_KEY, claim_is_fresh, role_claim_is_valid
 from apps.accounts.models import Member
 
 
 TALKS_SESSION_MEMBER_ID_KEY = "talks_member_id"
 TALKS_SESSION_MEMBER_NAME_KEY = "talks_member_name"
 TALKS_SESSION_IS_ADMIN_KEY = "talks_is_admin"
+TALKS_SESSION_MEMBER_CLAIM_KEY = "talks_member_claim"
 TALKS_ADMIN_LOGIN_ID = os.getenv("TALKS_ADMIN_LOGIN_ID", "admin")
 
+# Every concrete Member column is kept in the claim, so the rebuilt member has
+# no deferred fields that would load lazily in views and templates.
+MEMBER_CLAIM_FIELDS = tuple(field.attname for field in Member._meta.concrete_fields)
+_DATETIME_CLAIM_FIELDS = {"created_at"}
+
+
+def store_talks_member_claim(request: HttpRequest, member: Member) -> None:
+    claim = {field: getattr(member, field) for field in MEMBER_CLAIM_FIELDS}
+    for field in _DATETIME_CLAIM_FIELDS:
+        claim[field] = claim[field].isoformat() if claim[field] else None
+    claim["checked_at"] = int(time.time())
+    request.session[TALKS_SESSION_MEMBER_CLAIM_KEY] = claim
+
+
+def _member_from_claim(claim: dict) -> Member:
+    values = [
+        parse_datetime(claim[field]) if field in _DATETIME_CLAIM_FIELDS and claim[field] else claim[field]
+        for field in MEMBER_CLAIM_FIELDS
+    ]
+    return Member.from_db(DEFAULT_DB_ALIAS, MEMBER_CLAIM_FIELDS, values)
+
+
+def _member_claim_is_valid(request: HttpRequest, claim, member_id) -> bool:
+    # The member claim lives only as long as the login it was issued under.
+    if not claim_is_fresh(claim) or not all(field in claim for field in MEMBER_CLAIM_FIELDS):
+        return False
+    if claim["id"] != member_id or not claim["is_active"]:
+        return False
+    return role_claim_is_valid(request.session) and str(claim["user_id"]) == str(request.session.get(SESSION_KEY))
+
 
 def get_talks_member(request: HttpRequest) -> Member | None:
+    """Return the member signed in to talks.
+
+    A member verified within the role revalidation interval, under the same
+    login as the session's role claim, is rebuilt from the session claim
+    without a query.
+    """
     member_id = request.session.get(TALKS_SESSION_MEMBER_ID_KEY)
     if not member_id:
         if not request.user.is_authenticated:
@@ -24,13 +65,20 @@ def get_talks_member(request: HttpRequest) -> Member | None:
         request.session[TALKS_SESSION_MEMBER_ID_KEY] = member.id
         request.session[TALKS_SESSION_MEMBER_NAME_KEY] = member.name
         request.session[TALKS_SESSION_IS_ADMIN_KEY] = False
+        store_talks_member_claim(request, member)
         return member
 
+    claim = request.session.get(TALKS_SESSION_MEMBER_CLAIM_KEY)
+    if _member_claim_is_valid(request, claim, member_id):
+        return _member_from_claim(claim)
+
     member = Member.objects.active().filter(id=member_id).first()
     if not member:
         request.session.pop(TALKS_SESSION_MEMBER_ID_KEY, None)
         request.session.pop(TALKS_SESSION_MEMBER_NAME_KEY, None)
+        request.session.pop(TALKS_SESSION_MEMBER_CLAIM_KEY, None)
         return None
+    store_talks_member_claim(request, member)
     return member
 
 
@@ -85,3 +133,4 @@ def clear_talks_session(request: HttpRequest) -> None:
     request.session.pop(TALKS_SESSION_IS_ADMIN_KEY, None)
     request.session.pop(TALKS_SESSION_MEMBER_ID_KEY, None)
     request.session.pop(TALKS_SESSION_MEMBER_NAME_KEY, None)
+    request.session.pop(TALKS_SESSION_MEMBER_CLAIM_KEY, None)
@@ -1,9 +1,13 @@
+import time
 from datetime import timedelta
+from unittest.mock import patch
 
-from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.contrib.auth import HASH_SESSION_KEY, get_user_model
+from django.contrib.auth.models import AnonymousUser
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
-from django.test import TestCase
+from django.test import RequestFactory, TestCase
 from django.urls import reverse
 from django.utils import timezone
 
@@ -19,6 +23,7 @@ from apps.talks.models import (
     KnowledgeTag,
     KnowledgeUserPreference,
 )
+from apps.talks.services.session import get_talks_member
 from apps.talks.views import TALKS_SESSION_IS_ADMIN_KEY, TALKS_SESSION_MEMBER_ID_KEY
 
 
@@ -217,6 +222,35 @@ class TalksAuthTests(TalksBaseTestCase):
         response = self.client.get(reverse("talks_index"))
         self.assertRedirects(response, reverse("talks_login"))
 
+    def test_member_claim_skips_queries_until_revalidation(self):
+        self._login_talks_member("alice", "pass1")
+        request = RequestFactory().get("/")
+        request.session = self.client.session
+        request.user = AnonymousUser()
+        self.assertIn(TALKS_SESSION_MEMBER_ID_KEY, request.session)
+
+        with self.assertNumQueries(0):
+            member = get_talks_member(request)
+            self.assertEqual((member.id, member.name), (self.member1.id, "Alice"))
+            self.assertEqual(member.get_deferred_fields(), set())
+            self.assertEqual((member.email, member.created_at), (self.member1.email, self.member1.created_at))
+
+        Member.objects.filter(id=self.member1.id).update(is_active=False)
+        later = time.time() + settings.AUTH_ROLE_REVALIDATE_SECONDS + 1
+        with patch("apps.accounts.auth.time.time", return_value=later):
+            self.assertIsNone(get_talks_member(request))
+        self.assertNotIn(TALKS_SESSION_MEMBER_ID_KEY, request.session)
+
+    def test_member_claim_is_not_trusted_under_another_login(self):
+        self._login_talks_member("alice", "pass1")
+        request = RequestFactory().get("/")
+        request.session = self.client.session
+        request.user = AnonymousUser()
+        request.session[HASH_SESSION_KEY] = "issued-for-another-login"
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_talks_member(request).id, self.member1.id)
+
     def test_member_without_linked_user_cannot_login(self):
         member = Member.objects.create(
             name="NoUser",
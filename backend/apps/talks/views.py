@@ -15,7 +15,7 @@ from django.urls import reverse
 from django.template.loader import render_to_string
 from django.utils import timezone
 
-from apps.accounts.auth import ROLE_ADMIN, ROLE_REPORT, SESSION_ROLE_KEY
+from apps.accounts.auth import ROLE_ADMIN, ROLE_REPORT, SESSION_ROLE_KEY, store_role_claim
 from apps.accounts.models import Member
 
 from .forms import CommentEditForm, PostEditForm, TagManageForm, TalksLoginForm
@@ -35,6 +35,7 @@ from .services.session import (
     get_talks_display_name,
     get_talks_member,
     is_talks_admin,
+    store_talks_member_claim,
 )
 
 
@@ -205,6 +206,7 @@ def talks_login(request: HttpRequest) -> HttpResponse:
             if admin_user and (admin_user.is_staff or admin_user.is_superuser):
                 auth_login(request, admin_user)
                 request.session[SESSION_ROLE_KEY] = ROLE_ADMIN
+                store_role_claim(request, admin_user, ROLE_ADMIN)
                 request.session[TALKS_SESSION_IS_ADMIN_KEY] = True
                 request.session[TALKS_SESSION_MEMBER_ID_KEY] = None
                 request.session[TALKS_SESSION_MEMBER_NAME_KEY] = "管理者"
@@ -231,6 +233,8 @@ def talks_login(request: HttpRequest) -> HttpResponse:
             request.session[TALKS_SESSION_IS_ADMIN_KEY] = False
             request.session[TALKS_SESSION_MEMBER_ID_KEY] = form.member.id
             request.session[TALKS_SESSION_MEMBER_NAME_KEY] = form.member.name
+            store_role_claim(request, user, ROLE_REPORT)
+            store_talks_member_claim(request, form.member)
             return _next_or_default("talks_index")
     else:
         form = TalksLoginForm()
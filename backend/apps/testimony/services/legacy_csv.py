@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import csv
+
+from apps.testimony.models import Article, Product
+
+
+PRODUCT_CSV_HEADER = ["legacy_product_id", "name", "description"]
+ARTICLE_CSV_HEADER = [
+    "legacy_article_id",
+    "title",
+    "body",
+    "author",
+    "video_url",
+    "legacy_product_id",
+    "testimonied_at",
+    "created_at",
+    "updated_at",
+]
+
+
+def write_legacy_products_csv(fp) -> int:
+    writer = csv.writer(fp)
+    writer.writerow(PRODUCT_CSV_HEADER)
+    written = 0
+    for p in Product.objects.all().order_by("id").iterator(chunk_size=500):
+        writer.writerow([p.legacy_product_id or p.id, p.name, p.description or ""])
+        written += 1
+    return written
+
+
+def write_legacy_articles_csv(fp, *, progress=None) -> int:
+    """Write every article in legacy CSV layout, reporting progress per chunk."""
+    queryset = Article.objects.select_related("product").order_by("id")
+    total = queryset.count()
+    writer = csv.writer(fp)
+    writer.writerow(ARTICLE_CSV_HEADER)
+    written = 0
+    for a in queryset.iterator(chunk_size=500):
+        writer.writerow(
+            [
+                a.legacy_article_id or a.id,
+                a.title,
+                a.body,
+                a.author,
+                a.video_url or "",
+                a.product.legacy_product_id if a.product else "",
+                a.testimonied_at.isoformat() if a.testimonied_at else "",
+                a.created_at.isoformat() if a.created_at else "",
+                a.updated_at.isoformat() if a.updated_at else "",
+            ]
+        )
+        written += 1
+        if progress and written % 500 == 0:
+            progress(written, total)
+    if progress:
+        progress(written, total)
+    return written
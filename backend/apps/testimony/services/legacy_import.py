@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from itertools import islice
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from apps.testimony.models import Article, Product
+
+
+DEFAULT_IMPORT_BATCH_SIZE = 500
+ERROR_CSV_HEADER = ["line", "reason", "legacy_article_id", "title"]
+ARTICLE_IMPORT_FIELDS = [
+    "title",
+    "body",
+    "author",
+    "video_url",
+    "product",
+    "testimonied_at",
+    "created_at",
+    "updated_at",
+    "migrated_at",
+    "migration_source",
+]
+
+
+@dataclass
+class LegacyImportResult:
+    products_created: int = 0
+    products_updated: int = 0
+    articles_created: int = 0
+    articles_updated: int = 0
+    errors: list[dict[str, str]] = field(default_factory=list)
+
+    @property
+    def articles_processed(self) -> int:
+        return self.articles_created + self.articles_updated + len(self.errors)
+
+
+def parse_legacy_datetime(value: str):
+    value = (value or "").strip()
+    if not value:
+        return timezone.now()
+    dt = parse_datetime(value)
+    if dt is None:
+        raise ValueError(f"invalid datetime: {value}")
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt, timezone.get_current_timezone())
+    return dt
+
+
+@transaction.atomic
+def import_legacy_products(fp, *, result: LegacyImportResult) -> dict[str, Product]:
+    """Upsert products by ``legacy_product_id`` (or name) and return them keyed by legacy id."""
+    rows = []
+    for row in csv.DictReader(fp):
+        name = (row.get("name") or "").strip()
+        if name:
+            rows.append(
+                (
+                    (row.get("legacy_product_id") or "").strip(),
+                    name,
+                    (row.get("description") or "").strip(),
+                )
+            )
+
+    legacy_ids = {int(legacy_id) for legacy_id, _name, _description in rows if legacy_id}
+    by_legacy_id = {product.legacy_product_id: product for product in Product.objects.filter(legacy_product_id__in=legacy_ids)}
+    by_name = {product.name: product for product in Product.objects.filter(name__in=[name for _id, name, _desc in rows])}
+
+    product_map: dict[str, Product] = {}
+    to_create: list[Product] = []
+    to_update: dict[int, Product] = {}
+    for legacy_id, name, description in rows:
+        if not legacy_id:
+            if name not in by_name:
+                product = Product(name=name, description=description)
+                by_name[name] = product
+                to_create.append(product)
+            continue
+        product = by_legacy_id.get(int(legacy_id))
+        if product is None:
+            product = Product(legacy_product_id=int(legacy_id), name=name, description=description)
+            by_legacy_id[product.legacy_product_id] = product
+            to_create.append(product)
+        else:
+            product.name = name
+            product.description = description
+            product.updated_at = timezone.now()
+            if product.pk:
+                to_update[product.pk] = product
+        product_map[legacy_id] = product
+
+    Product.objects.bulk_create(to_create)
+    Product.objects.bulk_update(list(to_update.values()), ["name", "description", "updated_at"])
+    result.products_created += len(to_create)
+    result.products_updated += len(to_update)
+    return product_map
+
+
+def _article_values(row: dict, *, product_map: dict[str, Product], source: str, migrated_at) -> dict:
+    title = (row.get("title") or "").strip()
+    author = (row.get("author") or "").strip()
+    if not title or not author:
+        raise ValueError("title/author is required")
+
+    legacy_product_id = (row.get("legacy_product_id") or "").strip()
+    product = product_map.get(legacy_product_id) if legacy_product_id else None
+    if legacy_product_id and product is None:
+        raise ValueError(f"legacy_product_id not found: {legacy_product_id}")
+
+    return {
+        "title": title,
+        "body": row.get("body") or "",
+        "author": author,
+        "video_url": (row.get("video_url") or "").strip(),
+        "product": product,
+        "testimonied_at": parse_date((row.get("testimonied_at") or "").strip()) if row.get("testimonied_at") else None,
+        "created_at": parse_legacy_datetime(row.get("created_at") or ""),
+        "updated_at": parse_legacy_datetime(row.get("updated_at") or ""),
+        "migrated_at": migrated_at,
+        "migration_source": source,
+    }
+
+
+def _import_article_chunk(rows, *, product_map, source, existing_ids: dict[int, int], batch_size: int, result: LegacyImportResult):
+    migrated_at = timezone.now()
+    to_create: list[Article] = []
+    to_update: dict[int, Article] = {}
+    pending_by_legacy_id: dict[int, Article] = {}
+    for line_no, row in rows:
+        try:
+            values = _article_values(row, product_map=product_map, source=source, migrated_at=migrated_at)
+            legacy_article_id = (row.get("legacy_article_id") or "").strip()
+            if not legacy_article_id:
+                to_create.append(Article(**values))
+                continue
+            legacy_article_id = int(legacy_article_id)
+        except Exception as exc:
+            result.errors.append(
+                {
+                    "line": str(line_no),
+                    "reason": str(exc),
+                    "legacy_article_id": (row.get("legacy_article_id") or ""),
+                    "title": (row.get("title") or ""),
+                }
+            )
+            continue
+
+        article_id = existing_ids.get(legacy_article_id)
+        if article_id is not None:
+            to_update[article_id] = Article(pk=article_id, legacy_article_id=legacy_article_id, **values)
+        elif legacy_article_id in pending_by_legacy_id:
+            # Same as update_or_create: a repeated legacy id keeps the last row.
+            for name, value in values.items():
+                setattr(pending_by_legacy_id[legacy_article_id], name, value)
+        else:
+            pending_by_legacy_id[legacy_article_id] = Article(legacy_article_id=legacy_article_id, **values)
+            to_create.append(pending_by_legacy_id[legacy_article_id])
+
+    with transaction.atomic():
+        Article.objects.bulk_create(to_create, batch_size=batch_size)
+        Article.objects.bulk_update(list(to_update.values()), ARTICLE_IMPORT_FIELDS, batch_size=batch_size)
+    if pending_by_legacy_id:
+        existing_ids.update(
+            Article.objects.filter(legacy_article_id__in=list(pending_by_legacy_id))
+            .order_by()
+            .values_list("legacy_article_id", "id")
+        )
+    result.articles_created += len(to_create)
+    result.articles_updated += len(to_update)
+
+
+def import_legacy_articles(
+    fp,
+    *,
+    product_map: dict[str, Product],
+    source: str,
+    result: LegacyImportResult,
+    batch_size: int = DEFAULT_IMPORT_BATCH_SIZE,
+    progress=None,
+) -> LegacyImportResult:
+    """Upsert articles by ``legacy_article_id`` in set-based chunks of ``batch_size`` rows.
+
+    Existing legacy ids are loaded once up front, so each chunk costs one
+    ``bulk_create`` and one ``bulk_update`` instead of a lookup and a write per
+    row. Each chunk commits on its own; re-running the import is idempotent.
+    """
+    batch_size = max(1, int(batch_size))
+    existing_ids = dict(
+        Article.objects.exclude(legacy_article_id__isnull=True).order_by().values_list("legacy_article_id", "id")
+    )
+    rows = enumerate(csv.DictReader(fp), start=2)
+    while chunk := list(islice(rows, batch_size)):
+        _import_article_chunk(
+            chunk,
+            product_map=product_map,
+            source=source,
+            existing_ids=existing_ids,
+            batch_size=batch_size,
+            result=result,
+        )
+        if progress:
+            progress(result)
+    return result
+
+
+def write_import_errors_csv(fp, errors: list[dict[str, str]]) -> None:
+    writer = csv.DictWriter(fp, fieldnames=ERROR_CSV_HEADER)
+    writer.writeheader()
+    writer.writerows(errors)
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from io import StringIO
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
@@ -52,6 +53,51 @@ class TestimonyImportTests(TestCase):
             self.assertTrue(errors_csv.exists())
 
 
+    def test_import_updates_existing_articles_in_bulk_chunks(self):
+        with TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            products_csv = tmp_path / "products.csv"
+            articles_csv = tmp_path / "articles.csv"
+            errors_csv = tmp_path / "errors.csv"
+            products_csv.write_text("legacy_product_id,name,description\n1,UN,UN desc\n", encoding="utf-8")
+            Article.objects.create(
+                legacy_article_id=200,
+                title="Old",
+                body="Old body",
+                author="Alice",
+                created_at=timezone.now(),
+                updated_at=timezone.now(),
+            )
+            header = "legacy_article_id,title,body,author,video_url,legacy_product_id,testimonied_at,created_at,updated_at\n"
+            rows = "".join(
+                f"{300 + index},Article {index},Body,Alice,,1,2026-03-01,2026-03-01T10:00:00+09:00,\n" for index in range(30)
+            )
+            articles_csv.write_text(
+                header
+                + "200,Renamed,New body,Alice,,1,,,\n"
+                + rows
+                + "300,Article 0 v2,Body,Alice,,1,,,\n"
+                + ",No author,Body,,,,,,\n",
+                encoding="utf-8",
+            )
+
+            with self.assertNumQueries(24):
+                call_command(
+                    "import_articles_csv",
+                    products=str(products_csv),
+                    articles=str(articles_csv),
+                    errors=str(errors_csv),
+                    batch_size=10,
+                    stdout=StringIO(),
+                )
+
+            self.assertEqual(Article.objects.count(), 31)
+            self.assertEqual(Article.objects.get(legacy_article_id=200).title, "Renamed")
+            self.assertEqual(Article.objects.get(legacy_article_id=300).title, "Article 0 v2")
+            self.assertEqual(Article.objects.filter(product__legacy_product_id=1, migration_source="legacy_testimony").count(), 31)
+            self.assertIn("title/author is required", errors_csv.read_text(encoding="utf-8"))
+
+
 class TestimonyReactionTests(TestCase):
     def setUp(self):
         User = get_user_model()
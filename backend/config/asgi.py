@@ -1,3 +1,15 @@
+"""ASGI entrypoint.
+
+Serves the whole site like ``config.wsgi`` and additionally keeps the live
+board's server-sent-event streams (``dairymetrics_live_board_stream``) open
+on the event loop instead of pinning a worker thread per viewer. Start it
+with ``APP_SERVER=asgi`` (see ``scripts/start.sh``).
+
+Pages are still sync views; the request-scope middlewares are async-capable
+so only the view itself is handed to a thread. Worker sizing under ASGI is
+described in ``DEPLOY_CLOUD_RUN.md``.
+"""
+
 import os
 
 from django.core.asgi import get_asgi_application
@@ -0,0 +1,94 @@
+"""Database connection reuse and its metrics.
+
+Settings choose one of two modes per database (see ``DATABASES`` in
+``config.settings.base``):
+
+* ``pool``: PostgreSQL with psycopg 3 keeps a ``psycopg_pool.ConnectionPool``
+  per process. Closing a Django connection returns it to the pool.
+* ``persistent``: connections live for ``CONN_MAX_AGE`` seconds and are
+  checked before reuse when ``CONN_HEALTH_CHECKS`` is on.
+
+``connection_metrics`` reports the pool's own statistics in pool mode. In
+persistent mode it counts requests and the connections opened for them; an
+opened connection is a miss.
+"""
+
+from __future__ import annotations
+
+import threading
+
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpRequest, JsonResponse
+
+from apps.accounts.auth import ROLE_ADMIN, require_roles
+
+
+_counter_lock = threading.Lock()
+_requests = 0
+_connections_opened: dict[str, int] = {}
+
+
+def _count_request(sender, **kwargs):
+    global _requests
+    with _counter_lock:
+        _requests += 1
+
+
+def _count_connection(sender, connection, **kwargs):
+    with _counter_lock:
+        _connections_opened[connection.alias] = _connections_opened.get(connection.alias, 0) + 1
+
+
+def connect_connection_metrics() -> None:
+    request_started.connect(_count_request, dispatch_uid="db_connections_count_request")
+    connection_created.connect(_count_connection, dispatch_uid="db_connections_count_connection")
+
+
+def _pool_for(connection):
+    if connection.vendor != "postgresql" or not connection.settings_dict.get("OPTIONS", {}).get("pool"):
+        return None
+    return connection.pool
+
+
+def connection_metrics(alias: str = "default") -> dict:
+    connection = connections[alias]
+    pool = _pool_for(connection)
+    if pool is not None:
+        stats = pool.get_stats()
+        size = stats.get("pool_size", 0)
+        return {
+            "alias": alias,
+            "mode": "pool",
+            "min_size": stats.get("pool_min", 0),
+            "max_size": stats.get("pool_max", 0),
+            "size": size,
+            "in_use": size - stats.get("pool_available", 0),
+            "waiting": stats.get("requests_waiting", 0),
+            "requests": stats.get("requests_num", 0),
+            # Requests that found no idle connection and had to wait for one.
+            "misses": stats.get("requests_queued", 0),
+            "wait_ms": stats.get("requests_wait_ms", 0),
+            "errors": stats.get("requests_errors", 0),
+            "connections_opened": stats.get("connections_num", 0),
+            "connections_lost": stats.get("connections_lost", 0),
+        }
+
+    with _counter_lock:
+        requests = _requests
+        opened = _connections_opened.get(alias, 0)
+    return {
+        "alias": alias,
+        "mode": "persistent",
+        "conn_max_age": connection.settings_dict.get("CONN_MAX_AGE", 0),
+        "health_checks": bool(connection.settings_dict.get("CONN_HEALTH_CHECKS")),
+        "requests": requests,
+        "misses": opened,
+        "connections_opened": opened,
+    }
+
+
+@require_roles(ROLE_ADMIN)
+def connection_metrics_view(request: HttpRequest) -> JsonResponse:
+    return JsonResponse({"databases": [connection_metrics(alias) for alias in connections]})
@@ -0,0 +1,140 @@
+"""Optional read replica for analytics reads.
+
+When settings define a ``replica`` database, code wrapped in ``use_replica()``
+or decorated with ``@replica_reads`` sends its ORM reads there; every write
+and every read outside such a block stays on ``default``. Without a replica
+both are no-ops, so selectors opt in unconditionally.
+
+A replica lags the primary. ``ReplicaStickinessMiddleware`` therefore pins a
+browser to the primary for ``DB_REPLICA_STICKY_SECONDS`` after any unsafe
+request, so a member who just saved an entry reads it back on the next page.
+Reads inside an open transaction also stay on the primary, where the
+transaction's own rows are visible.
+
+Section executor workers copy the caller's ``contextvars`` and inherit its
+choice of database.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+REPLICA_ALIAS = "replica"
+PIN_COOKIE_NAME = "db_primary_pin"
+UNSAFE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+_read_alias: ContextVar[str | None] = ContextVar("db_router_read_alias", default=None)
+_pinned_to_primary: ContextVar[bool] = ContextVar("db_router_pinned_to_primary", default=False)
+
+
+def replica_configured() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def use_replica():
+    """Send ORM reads in the enclosed block to the replica when one is usable."""
+    usable = (
+        replica_configured()
+        and not _pinned_to_primary.get()
+        and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+    )
+    token = _read_alias.set(REPLICA_ALIAS if usable else _read_alias.get())
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def replica_reads(func):
+    """Decorator form of ``use_replica``."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with use_replica():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def pin_to_primary():
+    token = _pinned_to_primary.set(True)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # Explicit, so instances read from the replica are still saved to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA_ALIAS:
+            return False
+        return None
+
+
+class ReplicaStickinessMiddleware:
+    """Keep a browser on the primary for a short while after it writes."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _is_pinned(self, request) -> bool:
+        sticky_seconds = getattr(settings, "DB_REPLICA_STICKY_SECONDS", 5)
+        return request.method in UNSAFE_METHODS or bool(
+            request.get_signed_cookie(PIN_COOKIE_NAME, default="", max_age=sticky_seconds)
+        )
+
+    def _set_pin_cookie(self, request, response):
+        if request.method in UNSAFE_METHODS and replica_configured():
+            response.set_signed_cookie(
+                PIN_COOKIE_NAME,
+                "1",
+                max_age=getattr(settings, "DB_REPLICA_STICKY_SECONDS", 5),
+                httponly=True,
+                samesite="Lax",
+                secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not self._is_pinned(request):
+            return self.get_response(request)
+        with pin_to_primary():
+            response = self.get_response(request)
+        return self._set_pin_cookie(request, response)
+
+    async def __acall__(self, request):
+        # The pin is a contextvar, so the sync view's thread inherits it.
+        if not self._is_pinned(request):
+            return await self.get_response(request)
+        with pin_to_primary():
+            response = await self.get_response(request)
+        return self._set_pin_cookie(request, response)
@@ -0,0 +1,169 @@
+"""In-process publish/subscribe bus for live page updates.
+
+Events are published to a named channel, numbered per process and kept in a
+short per-channel history so polling clients can catch up from a cursor.
+Subscribers are either blocking (``subscribe``; for worker threads)
+or asyncio based (``asubscribe``; used by ASGI streaming views), and both may
+be fed from any thread.
+
+The bus only sees events published in its own process. Consumers must treat
+it as a low-latency hint and reconcile against the database (see
+``apps.dairymetrics.services.live_board``) for writes made by other workers or
+instances.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import queue
+import threading
+import uuid
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_SIZE = 200
+
+
+class _Subscription:
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+
+    def deliver(self, event: dict) -> None:
+        self._queue.put(event)
+
+    def get(self, timeout: float | None = None) -> dict | None:
+        """Return the next event, or ``None`` when ``timeout`` seconds pass without one."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class _AsyncSubscription:
+    def __init__(self, channel: str, loop: asyncio.AbstractEventLoop):
+        self.channel = channel
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def deliver(self, event: dict) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+        except RuntimeError:
+            # The subscriber's loop already closed; it is about to unsubscribe.
+            pass
+
+    async def get(self, timeout: float | None = None) -> dict | None:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class _AsyncSubscriptionScope:
+    def __init__(self, bus: "EventBus", channel: str):
+        self._bus = bus
+        self._channel = channel
+        self._subscription: _AsyncSubscription | None = None
+
+    async def __aenter__(self) -> _AsyncSubscription:
+        self._subscription = _AsyncSubscription(self._channel, asyncio.get_running_loop())
+        self._bus._add(self._subscription)
+        return self._subscription
+
+    async def __aexit__(self, exc_type, exc, traceback) -> bool:
+        self._bus._remove(self._subscription)
+        return False
+
+
+class EventBus:
+    def __init__(self, *, history_size: int = DEFAULT_HISTORY_SIZE):
+        self.boot_id = uuid.uuid4().hex[:12]
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self._history: dict[str, deque] = defaultdict(lambda: deque(maxlen=history_size))
+        # Highest event id evicted from each channel's history.
+        self._evicted_id: dict[str, int] = {}
+        self._subscribers: dict[str, set] = defaultdict(set)
+
+    def publish(self, channel: str, event: dict) -> dict:
+        """Number ``event``, keep it in the channel history and hand it to every subscriber."""
+        with self._lock:
+            self._last_id = next(self._ids)
+            event = {**event, "id": self._last_id}
+            history = self._history[channel]
+            if len(history) == history.maxlen:
+                self._evicted_id[channel] = history[0]["id"]
+            history.append(event)
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            subscriber.deliver(event)
+        logger.debug("event_bus publish channel=%s id=%s subscribers=%s", channel, event["id"], len(subscribers))
+        return event
+
+    def cursor(self, event_id: int | None = None) -> str:
+        """Return an opaque cursor for ``event_id`` (the latest event when omitted)."""
+        if event_id is None:
+            with self._lock:
+                event_id = self._last_id
+        return f"{self.boot_id}:{event_id}"
+
+    def events_since(self, channel: str, cursor: str) -> list[dict] | None:
+        """Return the channel events after ``cursor``.
+
+        ``None`` means the cursor cannot be served from this process (another
+        worker issued it, or the history no longer reaches back to it) and the
+        caller must resynchronise from the database.
+        """
+        boot_id, _separator, raw_event_id = (cursor or "").partition(":")
+        if boot_id != self.boot_id or not raw_event_id.isdigit():
+            return None
+        event_id = int(raw_event_id)
+        with self._lock:
+            if event_id < self._evicted_id.get(channel, 0):
+                return None
+            return [event for event in self._history.get(channel, ()) if event["id"] > event_id]
+
+    def _add(self, subscription) -> None:
+        with self._lock:
+            self._subscribers[subscription.channel].add(subscription)
+
+    def _remove(self, subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    @contextmanager
+    def subscribe(self, channel: str):
+        subscription = _Subscription(channel)
+        self._add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._remove(subscription)
+
+    def asubscribe(self, channel: str) -> "_AsyncSubscriptionScope":
+        """Async context manager that subscribes for the duration of the block.
+
+        A class rather than ``@asynccontextmanager``: when a client disconnects,
+        the loop finalizes abandoned async generators independently, and a
+        generator-based manager may be closed before the stream that uses it,
+        which then fails with "generator didn't stop after athrow()".
+        """
+        return _AsyncSubscriptionScope(self, channel)
+
+    def subscriber_count(self, channel: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(channel, ()))
+
+
+bus = EventBus()
@@ -0,0 +1,32 @@
+"""Gunicorn settings and warm-up hooks (``gunicorn -c python:config.gunicorn``).
+
+With ``preload_app`` the master imports the project and compiles templates
+once before forking; each worker then opens its own database connections
+before it accepts requests. See ``config.warmup``.
+"""
+
+import logging
+import os
+
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+logger = logging.getLogger("config.warmup")
+
+
+def when_ready(server):
+    if not server.cfg.preload_app:
+        return
+    from config.warmup import run_warmup
+
+    run_warmup(database=False)
+
+
+def post_worker_init(worker):
+    from config.warmup import run_warmup
+
+    try:
+        run_warmup()
+    except Exception:
+        # The worker still serves; /_warmup reports 503 until the database answers.
+        logger.exception("warmup failed pid=%s", worker.pid)
@@ -0,0 +1,166 @@
+"""Opt-in per-request query profiling.
+
+Enable with ``QUERY_PROFILER_ENABLED=1``. Each request then logs one
+``request_profile`` line with the query count, DB time, view time and named
+spans, adds a ``Server-Timing`` header, and logs every SQL fingerprint that ran
+at least ``QUERY_PROFILER_DUPLICATE_THRESHOLD`` times (typical N+1 loops).
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger("apps.query_profiler")
+
+_active_profile: ContextVar["RequestProfile | None"] = ContextVar("query_profiler_active_profile", default=None)
+
+_STRING_LITERAL_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)", re.IGNORECASE)
+_PLACEHOLDER_RE = re.compile(r"%s")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def sql_fingerprint(sql: str) -> str:
+    """Collapse literals and IN-lists so repeated lookups share one fingerprint."""
+    normalized = _STRING_LITERAL_RE.sub("?", sql)
+    normalized = _NUMBER_RE.sub("?", normalized)
+    normalized = _PLACEHOLDER_RE.sub("?", normalized)
+    normalized = _IN_LIST_RE.sub("IN (...)", normalized)
+    return _WHITESPACE_RE.sub(" ", normalized).strip()
+
+
+@dataclass
+class SpanTiming:
+    calls: int = 0
+    duration: float = 0.0
+    queries: int = 0
+
+
+@dataclass
+class RequestProfile:
+    query_count: int = 0
+    db_time: float = 0.0
+    fingerprints: Counter = field(default_factory=Counter)
+    spans: dict[str, SpanTiming] = field(default_factory=dict)
+    # Section executor workers share the request's profile across threads.
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            fingerprint = sql_fingerprint(sql)
+            with self._lock:
+                self.db_time += elapsed
+                self.query_count += 1
+                self.fingerprints[fingerprint] += 1
+
+    def record_span(self, name: str, *, duration: float, queries: int) -> None:
+        with self._lock:
+            span = self.spans.setdefault(name, SpanTiming())
+            span.calls += 1
+            span.duration += duration
+            span.queries += queries
+
+    def duplicates(self, threshold: int) -> list[tuple[str, int]]:
+        return [(sql, count) for sql, count in self.fingerprints.most_common() if count >= threshold]
+
+
+def current_profile() -> RequestProfile | None:
+    return _active_profile.get()
+
+
+@contextmanager
+def profile_span(name: str):
+    """Time a named block inside the active request profile; a no-op otherwise."""
+    profile = _active_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    queries_before = profile.query_count
+    try:
+        yield
+    finally:
+        profile.record_span(
+            name,
+            duration=time.perf_counter() - started,
+            queries=profile.query_count - queries_before,
+        )
+
+
+def profiled(name: str):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with profile_span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _server_timing_value(profile: RequestProfile, view_time: float) -> str:
+    entries = [
+        f'db;dur={profile.db_time * 1000:.1f};desc="{profile.query_count} queries"',
+        f"view;dur={view_time * 1000:.1f}",
+    ]
+    for name, span in profile.spans.items():
+        entries.append(f'{name};dur={span.duration * 1000:.1f};desc="{span.queries} queries"')
+    return ", ".join(entries)
+
+
+class QueryProfilerMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.duplicate_threshold = int(getattr(settings, "QUERY_PROFILER_DUPLICATE_THRESHOLD", 3))
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _active_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _active_profile.reset(token)
+        view_time = time.perf_counter() - started
+
+        duplicates = profile.duplicates(self.duplicate_threshold)
+        response["Server-Timing"] = _server_timing_value(profile, view_time)
+        logger.info(
+            "request_profile method=%s path=%s status=%s queries=%s db_ms=%.1f view_ms=%.1f duplicate_fingerprints=%s spans=%s",
+            request.method,
+            request.path,
+            response.status_code,
+            profile.query_count,
+            profile.db_time * 1000,
+            view_time * 1000,
+            len(duplicates),
+            ",".join(
+                f"{name}:{span.duration * 1000:.1f}ms/{span.queries}q/{span.calls}x"
+                for name, span in profile.spans.items()
+            )
+            or "-",
+        )
+        for sql, count in duplicates:
+            logger.warning("request_profile duplicate_query path=%s count=%s sql=%s", request.path, count, sql)
+        return response
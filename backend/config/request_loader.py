@@ -0,0 +1,177 @@
+"""Request-scoped batched loaders for keyed reference lookups.
+
+A loader wraps a batch function ``keys -> {key: value}`` and memoizes its
+results for the current request, so each distinct key reaches the database
+once however many selectors ask for it. Keys announced with ``prime_keys``
+are fetched together with the next ``load``, which lets a caller that will
+walk several departments pay for one query instead of one per department.
+
+``RequestLoaderMiddleware`` opens a cache per request. Outside a request
+(management commands, direct selector calls in tests) every ``get_loader``
+call returns a fresh loader, so callers behave exactly as before. Writes to a
+loader's source models clear it for the rest of the request.
+
+Section executor workers copy the request's ``contextvars`` and therefore
+share its cache; loaders are thread safe.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db.models.signals import post_delete, post_save
+
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class LoaderSpec:
+    name: str
+    batch: Callable[[list], dict]
+    models: tuple = ()
+    default: Any = None
+
+
+_specs: dict[str, LoaderSpec] = {}
+
+
+class Loader:
+    def __init__(self, spec: LoaderSpec):
+        self.spec = spec
+        self._lock = threading.Lock()
+        self._values: dict[Hashable, Any] = {}
+        self._pending: set = set()
+        self.batches = 0
+
+    def prime_keys(self, keys: Iterable[Hashable]) -> None:
+        """Queue ``keys`` so the next ``load`` fetches them in the same batch."""
+        with self._lock:
+            self._pending.update(key for key in keys if key not in self._values)
+
+    def load(self, key: Hashable) -> Any:
+        return self.load_many([key])[key]
+
+    def load_many(self, keys: Iterable[Hashable]) -> dict:
+        keys = list(dict.fromkeys(keys))
+        with self._lock:
+            missing = [key for key in keys if key not in self._values]
+            if missing:
+                missing = list(dict.fromkeys([*missing, *self._pending]))
+                self._pending.clear()
+        if missing:
+            values = self.spec.batch(missing)
+            self.batches += 1
+            with self._lock:
+                for key in missing:
+                    self._values[key] = values.get(key, self.spec.default)
+            logger.debug("request_loader batch name=%s keys=%s", self.spec.name, len(missing))
+        with self._lock:
+            return {key: self._values.get(key, self.spec.default) for key in keys}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self._pending.clear()
+
+
+class LoaderRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaders: dict[str, Loader] = {}
+
+    def get(self, name: str) -> Loader:
+        with self._lock:
+            loader = self._loaders.get(name)
+            if loader is None:
+                loader = self._loaders[name] = Loader(_specs[name])
+            return loader
+
+    def clear(self, names: Iterable[str] | None = None) -> None:
+        with self._lock:
+            loaders = list(self._loaders.values()) if names is None else [
+                self._loaders[name] for name in names if name in self._loaders
+            ]
+        for loader in loaders:
+            loader.clear()
+
+
+_active_registry: ContextVar[LoaderRegistry | None] = ContextVar("request_loader_registry", default=None)
+
+
+def register_loader(name: str, *, models: tuple = (), default: Any = None):
+    """Register ``batch(keys) -> {key: value}`` as loader ``name``.
+
+    Keys absent from the returned mapping load as ``default``. A save or delete
+    of any model in ``models`` clears the loader in the active request.
+    """
+
+    def decorator(batch):
+        _specs[name] = LoaderSpec(name=name, batch=batch, models=tuple(models), default=default)
+        for model in models:
+            dispatch_uid = f"request_loader_clear_{model._meta.label_lower}"
+            post_save.connect(_clear_for_model, sender=model, dispatch_uid=dispatch_uid)
+            post_delete.connect(_clear_for_model, sender=model, dispatch_uid=dispatch_uid)
+        return batch
+
+    return decorator
+
+
+def _clear_for_model(sender, **kwargs):
+    registry = _active_registry.get()
+    if registry is None:
+        return
+    registry.clear([spec.name for spec in _specs.values() if sender in spec.models])
+
+
+def invalidate_loaders(*names: str) -> None:
+    """Clear loaders whose sources changed without model signals (queryset ``update``)."""
+    registry = _active_registry.get()
+    if registry is not None:
+        registry.clear(names)
+
+
+def get_loader(name: str) -> Loader:
+    """Return loader ``name`` for the active request (a one-off loader outside requests)."""
+    registry = _active_registry.get()
+    if registry is None:
+        return Loader(_specs[name])
+    return registry.get(name)
+
+
+@contextmanager
+def request_loader_scope():
+    """Open a loader cache for the enclosed block (used by the middleware and by batch jobs)."""
+    registry = LoaderRegistry()
+    token = _active_registry.set(registry)
+    try:
+        yield registry
+    finally:
+        _active_registry.reset(token)
+
+
+class RequestLoaderMiddleware:
+    # Under ASGI the scope opens on the event loop; the sync view's thread
+    # inherits it through the copied contextvars.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with request_loader_scope():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with request_loader_scope():
+            return await self.get_response(request)
@@ -0,0 +1,184 @@
+"""Run independent, DB-bound page sections concurrently on a bounded thread pool.
+
+Each section runs in a worker thread with its own database connection (Django
+connections are per thread) and a copy of the caller's ``contextvars``, so the
+active request profile, timezone and translation follow it. Worker queries are
+added to the request profile and every section is recorded as a
+``<label>.<section>`` span.
+
+The pool is shared by every request in the process and holds at most
+``SECTION_EXECUTOR_MAX_WORKERS`` threads, so the process never needs more than
+``GUNICORN_THREADS + SECTION_EXECUTOR_MAX_WORKERS`` connections (the default
+pool ``max_size``). When the pool is busy, sections queue.
+``SECTION_EXECUTOR_TIMEOUT_SECONDS`` bounds the wait for the pool: a section
+still queued then is cancelled and run inline by the caller, and a section
+still running is left to finish on its worker and reported as a
+``SectionFailure`` with ``STATUS_TIMEOUT`` (it is never started twice). A
+section whose worker raised is retried inline; if it fails again its value is
+a ``SectionFailure`` with ``STATUS_ERROR``, so one broken section does not
+fail the page. When the caller is inside a transaction the sections run
+inline from the start: worker connections could not see its uncommitted rows.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import close_old_connections, connection, connections
+
+from config.query_profiler import current_profile
+
+
+logger = logging.getLogger(__name__)
+
+STATUS_PARALLEL = "parallel"
+STATUS_INLINE = "inline"
+STATUS_TIMEOUT = "timeout"
+STATUS_ERROR = "error"
+
+
+@dataclass(frozen=True)
+class SectionFailure:
+    """Value of a section that timed out or raised; callers render it as that section's error."""
+
+    status: str
+    error: str = ""
+
+
+@dataclass
+class SectionTiming:
+    name: str
+    status: str
+    duration: float = 0.0
+    queries: int = 0
+
+
+class _QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _run_counted(func: Callable[[], Any], *, profile) -> tuple[Any, float, int]:
+    counter = _QueryCounter()
+    started = time.perf_counter()
+    with ExitStack() as stack:
+        stack.enter_context(connection.execute_wrapper(counter))
+        if profile is not None:
+            stack.enter_context(connection.execute_wrapper(profile))
+        value = func()
+    return value, time.perf_counter() - started, counter.count
+
+
+def _run_in_worker(func: Callable[[], Any], profile):
+    try:
+        return _run_counted(func, profile=profile)
+    finally:
+        # Pool threads outlive the task: release connections that are broken or
+        # past CONN_MAX_AGE (with a connection pool, always) like a request end does.
+        close_old_connections()
+
+
+_executor_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+_executor_pid: int | None = None
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    """Return this process's pool, creating it on first use (and again after a fork)."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, int(getattr(settings, "SECTION_EXECUTOR_MAX_WORKERS", 4))),
+                thread_name_prefix="section",
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _in_transaction() -> bool:
+    return any(conn.in_atomic_block for conn in connections.all(initialized_only=True))
+
+
+def run_sections(
+    sections: dict[str, Callable[[], Any]],
+    *,
+    label: str,
+    max_workers: int | None = None,
+    timeout: float | None = None,
+) -> tuple[dict[str, Any], list[SectionTiming]]:
+    """Evaluate every ``sections`` callable and return ``(values_by_name, timings)``.
+
+    ``max_workers`` of 1 or less runs every section inline; the pool itself is
+    sized by ``SECTION_EXECUTOR_MAX_WORKERS``.
+    """
+    if max_workers is None:
+        max_workers = int(getattr(settings, "SECTION_EXECUTOR_MAX_WORKERS", 4))
+    if timeout is None:
+        timeout = float(getattr(settings, "SECTION_EXECUTOR_TIMEOUT_SECONDS", 10))
+    profile = current_profile()
+
+    futures = {}
+    if max_workers > 1 and len(sections) > 1 and not _in_transaction():
+        executor = _shared_executor()
+        futures = {
+            name: executor.submit(contextvars.copy_context().run, _run_in_worker, func, profile)
+            for name, func in sections.items()
+        }
+        _done, pending = wait(futures.values(), timeout=timeout)
+        # Only sections that never started are taken back; the rest finish on their worker.
+        for future in pending:
+            future.cancel()
+
+    values: dict[str, Any] = {}
+    timings: list[SectionTiming] = []
+    for name, func in sections.items():
+        future = futures.get(name)
+        status = STATUS_INLINE
+        if future is not None:
+            if future.cancelled():
+                status = STATUS_TIMEOUT
+                logger.warning("section_executor timeout label=%s section=%s timeout_s=%s", label, name, timeout)
+            elif not future.done():
+                logger.warning(
+                    "section_executor timeout label=%s section=%s timeout_s=%s running=1", label, name, timeout
+                )
+                values[name] = SectionFailure(status=STATUS_TIMEOUT)
+                timings.append(SectionTiming(name=name, status=STATUS_TIMEOUT, duration=timeout))
+                continue
+            elif future.exception() is not None:
+                status = STATUS_ERROR
+                logger.warning(
+                    "section_executor error label=%s section=%s error=%r", label, name, future.exception()
+                )
+            else:
+                values[name], duration, queries = future.result()
+                timings.append(SectionTiming(name=name, status=STATUS_PARALLEL, duration=duration, queries=queries))
+                continue
+        started = time.perf_counter()
+        try:
+            values[name], duration, queries = _run_counted(func, profile=None)
+        except Exception as exc:
+            logger.exception("section_executor failed label=%s section=%s", label, name)
+            values[name] = SectionFailure(status=STATUS_ERROR, error=repr(exc))
+            timings.append(SectionTiming(name=name, status=STATUS_ERROR, duration=time.perf_counter() - started))
+            continue
+        timings.append(SectionTiming(name=name, status=status, duration=duration, queries=queries))
+
+    if profile is not None:
+        for timing in timings:
+            profile.record_span(f"{label}.{timing.name}", duration=timing.duration, queries=timing.queries)
+    return values, timings
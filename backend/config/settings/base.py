@@ -26,6 +26,7 @@ INSTALLED_APPS = [
     "apps.mail",
     "apps.performance",
     "apps.mosaic",
+    "apps.exports",
 ]
 
 MIDDLEWARE = [
@@ -36,8 +37,37 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "config.db_router.ReplicaStickinessMiddleware",
+    "config.request_loader.RequestLoaderMiddleware",
 ]
 
+# Part of every data-version ETag, so a deploy never revalidates against old markup.
+APP_RELEASE = os.getenv("APP_RELEASE", os.getenv("K_REVISION", ""))
+
+# Threads per request for independent page sections (metrics V2); 1 runs them inline.
+SECTION_EXECUTOR_MAX_WORKERS = int(os.getenv("SECTION_EXECUTOR_MAX_WORKERS", "4"))
+SECTION_EXECUTOR_TIMEOUT_SECONDS = float(os.getenv("SECTION_EXECUTOR_TIMEOUT_SECONDS", "10"))
+
+# Live activity board (server-sent events under ASGI, interval polling under WSGI).
+LIVE_BOARD_RECONCILE_SECONDS = float(os.getenv("LIVE_BOARD_RECONCILE_SECONDS", "10"))
+LIVE_BOARD_POLL_INTERVAL_SECONDS = float(os.getenv("LIVE_BOARD_POLL_INTERVAL_SECONDS", "5"))
+LIVE_BOARD_POLL_MAX_INTERVAL_SECONDS = float(os.getenv("LIVE_BOARD_POLL_MAX_INTERVAL_SECONDS", "60"))
+LIVE_BOARD_STREAM_MAX_SECONDS = float(os.getenv("LIVE_BOARD_STREAM_MAX_SECONDS", "290"))
+
+QUERY_PROFILER_ENABLED = os.getenv("QUERY_PROFILER_ENABLED", "0") == "1"
+QUERY_PROFILER_DUPLICATE_THRESHOLD = int(os.getenv("QUERY_PROFILER_DUPLICATE_THRESHOLD", "3"))
+if QUERY_PROFILER_ENABLED:
+    # Outermost, so the reported view time covers every other middleware.
+    MIDDLEWARE.insert(0, "config.query_profiler.QueryProfilerMiddleware")
+
+# "django.contrib.sessions.backends.signed_cookies" takes the session table off
+# the request path. Use "cached_db" only with a cache shared by every worker:
+# a process-local cache keeps serving sessions that another worker logged out.
+SESSION_ENGINE = os.getenv("SESSION_ENGINE", "django.contrib.sessions.backends.db")
+# Role and talks member claims in the session are re-checked after this many
+# seconds, bounding how long a change made from another session goes unseen.
+AUTH_ROLE_REVALIDATE_SECONDS = int(os.getenv("AUTH_ROLE_REVALIDATE_SECONDS", "60"))
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -69,6 +99,43 @@ DATABASES = {
     }
 }
 
+# PostgreSQL keeps a psycopg connection pool per process (DB_POOL=0 disables
+# it), checking each connection as it is handed out. The default size covers
+# every gunicorn thread plus one request's section executor workers; further
+# workers wait up to the timeout. Other engines, and PostgreSQL without the
+# pool, keep connections for DB_CONN_MAX_AGE seconds and check them before reuse.
+GUNICORN_THREADS = int(os.getenv("GUNICORN_THREADS", "4"))
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql" and os.getenv("DB_POOL", "1") == "1":
+    from psycopg_pool import ConnectionPool
+
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "check": ConnectionPool.check_connection,
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "1")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", str(GUNICORN_THREADS + SECTION_EXECUTOR_MAX_WORKERS))),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "10")),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE_SECONDS", "300")),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME_SECONDS", "1800")),
+        }
+    }
+elif DATABASES["default"]["ENGINE"] != "django.db.backends.sqlite3":
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Optional read replica for analytics selectors (config.db_router). Browsers
+# read from the primary for DB_REPLICA_STICKY_SECONDS after they write.
+if os.getenv("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("DB_REPLICA_HOST"),
+        "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "USER": os.getenv("DB_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.getenv("DB_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["config.db_router.ReplicaRouter"]
+DB_REPLICA_STICKY_SECONDS = int(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+
 LANGUAGE_CODE = "ja"
 TIME_ZONE = "Asia/Tokyo"
 USE_I18N = True
@@ -78,6 +145,21 @@ STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [BASE_DIR / "static"]
 
+MEDIA_URL = "/media/"
+MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", str(BASE_DIR / "media")))
+
+# "thread" runs export jobs on an in-process pool; "command" leaves them for
+# the run_export_jobs management command (e.g. a Cloud Run job).
+EXPORT_JOB_RUNNER = os.getenv("EXPORT_JOB_RUNNER", "thread")
+EXPORT_JOB_THREADS = int(os.getenv("EXPORT_JOB_THREADS", "1"))
+# A running job without a progress heartbeat for this long is re-queued, and
+# failed once it has been tried EXPORT_JOB_MAX_ATTEMPTS times.
+EXPORT_JOB_STALE_SECONDS = int(os.getenv("EXPORT_JOB_STALE_SECONDS", "900"))
+EXPORT_JOB_MAX_ATTEMPTS = int(os.getenv("EXPORT_JOB_MAX_ATTEMPTS", "2"))
+
+# archive_mail_history compresses mail history texts older than this many months.
+MAIL_HISTORY_RETENTION_MONTHS = int(os.getenv("MAIL_HISTORY_RETENTION_MONTHS", "6"))
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 LOGIN_URL = "home"
@@ -1,3 +1,4 @@
+import logging
 import os
 
 from .base import *
@@ -38,6 +39,25 @@ STORAGES = {
     },
 }
 
+# Export artifacts are written by one instance (or the run_export_jobs job) and
+# downloaded through any other, so production should keep them in a shared
+# bucket. Without one, files stay on the local disk of the instance that wrote
+# them, which only works for a single instance running exports in threads.
+GS_BUCKET_NAME = os.getenv("GS_BUCKET_NAME", "")
+if GS_BUCKET_NAME:
+    STORAGES["default"] = {
+        "BACKEND": "storages.backends.gcloud.GoogleCloudStorage",
+        "OPTIONS": {
+            "bucket_name": GS_BUCKET_NAME,
+            "location": os.getenv("GS_LOCATION", ""),
+        },
+    }
+else:
+    logging.getLogger(__name__).warning(
+        "export_storage local_fallback runner=%s: set GS_BUCKET_NAME so export files are shared across instances",
+        os.getenv("EXPORT_JOB_RUNNER", "thread"),
+    )
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
@@ -4,3 +4,7 @@ from .local import *
 # Password strength is covered by Django. Application tests only need a
 # deterministic encoded password that authenticate() can verify quickly.
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+# Memoized page contexts are keyed by data versions, which repeat across
+# rolled-back test cases; tests that exercise the cache opt in with LocMemCache.
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
@@ -1,9 +1,51 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+
+from unittest.mock import patch
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
-from django.test import RequestFactory, SimpleTestCase
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from apps.accounts.models import Department, Member, MemberDepartment
+from apps.common.conditional_get import conditional_on_data_version
+from apps.common.reference_loaders import active_department, department_roster
+
+from .db_connections import connection_metrics
+from .db_router import (
+    PIN_COOKIE_NAME,
+    REPLICA_ALIAS,
+    ReplicaRouter,
+    ReplicaStickinessMiddleware,
+    pin_to_primary,
+    replica_reads,
+    use_replica,
+)
 from .error_views import page_not_found, permission_denied, server_error
+from .event_bus import EventBus
+from .query_profiler import QueryProfilerMiddleware, current_profile, profile_span, sql_fingerprint
+from .request_loader import RequestLoaderMiddleware, request_loader_scope
+from .section_executor import (
+    STATUS_ERROR,
+    STATUS_INLINE,
+    STATUS_PARALLEL,
+    STATUS_TIMEOUT,
+    SectionFailure,
+    _shared_executor,
+    run_sections,
+)
+from .warmup import WARM_TEMPLATES, compile_templates
+
+_section_marker: ContextVar[str] = ContextVar("section_marker", default="")
 
 
 class ErrorPageTests(SimpleTestCase):
@@ -34,3 +76,451 @@ class TestEnvironmentTests(SimpleTestCase):
             settings.PASSWORD_HASHERS,
             ["django.contrib.auth.hashers.MD5PasswordHasher"],
         )
+
+
+class QueryProfilerTests(TestCase):
+    def test_fingerprint_collapses_literals_and_in_lists(self):
+        self.assertEqual(
+            sql_fingerprint('SELECT "a"."id" FROM "a" WHERE "a"."id" IN (%s, %s, %s) AND "a"."code" = \'UN\' LIMIT 21'),
+            'SELECT "a"."id" FROM "a" WHERE "a"."id" IN (...) AND "a"."code" = ? LIMIT ?',
+        )
+
+    def test_span_is_noop_outside_profiled_request(self):
+        with profile_span("outside"):
+            Department.objects.count()
+        self.assertIsNone(current_profile())
+
+    def test_middleware_reports_queries_spans_and_duplicates(self):
+        Department.objects.create(code="UN", name="UN")
+
+        def view(request):
+            with profile_span("lookup"):
+                for _ in range(3):
+                    list(Department.objects.filter(code="UN"))
+            return HttpResponse("ok")
+
+        middleware = QueryProfilerMiddleware(view)
+        with self.assertLogs("apps.query_profiler", level="INFO") as logs:
+            response = middleware(RequestFactory().get("/profiled/"))
+
+        self.assertIsNone(current_profile())
+        self.assertIn('db;dur=', response["Server-Timing"])
+        self.assertIn('desc="3 queries"', response["Server-Timing"])
+        self.assertIn("lookup;dur=", response["Server-Timing"])
+        self.assertIn("queries=3", logs.output[0])
+        self.assertIn("duplicate_fingerprints=1", logs.output[0])
+        self.assertIn("lookup:", logs.output[0])
+        self.assertIn("duplicate_query path=/profiled/ count=3", logs.output[1])
+
+
+class SectionExecutorTests(SimpleTestCase):
+    def _statuses(self, timings):
+        return {timing.name: timing.status for timing in timings}
+
+    def test_sections_run_on_worker_threads_with_caller_context(self):
+        main_thread = threading.current_thread()
+        token = _section_marker.set("request-1")
+        try:
+            values, timings = run_sections(
+                {
+                    "first": lambda: (_section_marker.get(), threading.current_thread() is main_thread),
+                    "second": lambda: (_section_marker.get(), threading.current_thread() is main_thread),
+                },
+                label="test",
+                max_workers=2,
+            )
+        finally:
+            _section_marker.reset(token)
+
+        self.assertEqual(values, {"first": ("request-1", False), "second": ("request-1", False)})
+        self.assertEqual(self._statuses(timings), {"first": STATUS_PARALLEL, "second": STATUS_PARALLEL})
+
+    def test_failing_sections_are_retried_inline(self):
+        main_thread = threading.current_thread()
+
+        def fails_off_main_thread():
+            if threading.current_thread() is not main_thread:
+                raise RuntimeError("worker failed")
+            return "inline-value"
+
+        with self.assertLogs("config.section_executor", level="WARNING") as logs:
+            values, timings = run_sections(
+                {"ok": lambda: 1, "broken": fails_off_main_thread},
+                label="test",
+                max_workers=2,
+            )
+
+        self.assertEqual(values, {"ok": 1, "broken": "inline-value"})
+        self.assertEqual(self._statuses(timings), {"ok": STATUS_PARALLEL, "broken": STATUS_ERROR})
+        self.assertTrue(any("section=broken" in line for line in logs.output))
+
+    def test_sections_that_fail_inline_too_become_error_payloads(self):
+        def broken():
+            raise RuntimeError("always fails")
+
+        with self.assertLogs("config.section_executor", level="WARNING"):
+            values, timings = run_sections({"ok": lambda: 1, "broken": broken}, label="test", max_workers=2)
+
+        self.assertEqual(values["ok"], 1)
+        self.assertEqual(values["broken"], SectionFailure(status=STATUS_ERROR, error="RuntimeError('always fails')"))
+        self.assertEqual(self._statuses(timings), {"ok": STATUS_PARALLEL, "broken": STATUS_ERROR})
+
+    def test_late_sections_are_never_run_twice_and_bound_the_wait(self):
+        calls = []
+        release = threading.Event()
+
+        def slow():
+            calls.append("slow")
+            release.wait(5)
+            return "slow-value"
+
+        def queued():
+            calls.append(("queued", threading.current_thread() is threading.main_thread()))
+            return "queued-value"
+
+        one_thread = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(one_thread.shutdown)
+        self.addCleanup(release.set)
+        started = time.monotonic()
+        with patch("config.section_executor._shared_executor", return_value=one_thread):
+            with self.assertLogs("config.section_executor", level="WARNING") as logs:
+                values, timings = run_sections({"slow": slow, "queued": queued}, label="test", max_workers=2, timeout=0.1)
+        elapsed = time.monotonic() - started
+
+        # The running section is left on its worker and reported as timed out; the
+        # one still queued behind it is taken back and run inline.
+        self.assertLess(elapsed, 2)
+        self.assertEqual(values, {"slow": SectionFailure(status=STATUS_TIMEOUT), "queued": "queued-value"})
+        self.assertEqual(calls, ["slow", ("queued", True)])
+        self.assertEqual(self._statuses(timings), {"slow": STATUS_TIMEOUT, "queued": STATUS_TIMEOUT})
+        self.assertTrue(any("section=slow" in line and "running=1" in line for line in logs.output))
+
+    def test_requests_share_one_bounded_pool(self):
+        with patch("config.section_executor._executor", None), patch("config.section_executor._executor_pid", None):
+            with self.settings(SECTION_EXECUTOR_MAX_WORKERS=3):
+                first = _shared_executor()
+                self.addCleanup(first.shutdown)
+                self.assertIs(_shared_executor(), first)
+                self.assertEqual(first._max_workers, 3)
+                with patch("config.section_executor.os.getpid", return_value=-1):
+                    after_fork = _shared_executor()
+                self.addCleanup(after_fork.shutdown)
+                self.assertIsNot(after_fork, first)
+
+    def test_single_worker_runs_inline(self):
+        values, timings = run_sections({"a": lambda: 1, "b": lambda: 2}, label="test", max_workers=1)
+
+        self.assertEqual(values, {"a": 1, "b": 2})
+        self.assertEqual(self._statuses(timings), {"a": STATUS_INLINE, "b": STATUS_INLINE})
+
+
+class SectionExecutorDatabaseTests(TransactionTestCase):
+    def test_open_transaction_forces_inline_sections(self):
+        with transaction.atomic():
+            Department.objects.create(code="UN", name="UN")
+            values, timings = run_sections(
+                {"count": Department.objects.count, "codes": lambda: list(Department.objects.values_list("code", flat=True))},
+                label="test",
+                max_workers=2,
+            )
+
+        self.assertEqual(values, {"count": 1, "codes": ["UN"]})
+        self.assertEqual({timing.status for timing in timings}, {STATUS_INLINE})
+
+    def test_worker_queries_use_own_connections_and_reach_the_profile(self):
+        Department.objects.create(code="UN", name="UN")
+        Department.objects.create(code="WV", name="WV")
+
+        def view(request):
+            values, _timings = run_sections(
+                {
+                    "un": lambda: Department.objects.filter(code="UN").count(),
+                    "wv": lambda: Department.objects.filter(code="WV").count(),
+                },
+                label="sections",
+                max_workers=2,
+            )
+            return HttpResponse(str(values["un"] + values["wv"]))
+
+        with self.assertLogs("apps.query_profiler", level="INFO") as logs:
+            response = QueryProfilerMiddleware(view)(RequestFactory().get("/sections/"))
+
+        self.assertEqual(response.content, b"2")
+        self.assertIn("queries=2", logs.output[0])
+        self.assertIn("sections.un:", logs.output[0])
+        self.assertIn("sections.wv:", logs.output[0])
+
+
+class EventBusTests(SimpleTestCase):
+    def test_events_since_serves_own_cursors_only(self):
+        bus = EventBus()
+        start = bus.cursor()
+        bus.publish("a", {"type": "first"})
+        bus.publish("b", {"type": "other"})
+        second = bus.publish("a", {"type": "second"})
+
+        self.assertEqual([event["type"] for event in bus.events_since("a", start)], ["first", "second"])
+        self.assertEqual(bus.events_since("a", bus.cursor(second["id"])), [])
+        self.assertIsNone(bus.events_since("a", EventBus().cursor()))
+        self.assertIsNone(bus.events_since("a", "garbage"))
+
+    def test_events_since_reports_evicted_history(self):
+        bus = EventBus(history_size=2)
+        start = bus.cursor()
+        for index in range(3):
+            bus.publish("a", {"index": index})
+
+        self.assertIsNone(bus.events_since("a", start))
+        self.assertEqual(len(bus.events_since("a", bus.cursor(2))), 1)
+
+    def test_blocking_subscriber_receives_events_from_other_threads(self):
+        bus = EventBus()
+        with bus.subscribe("a") as subscription:
+            thread = threading.Thread(target=bus.publish, args=("a", {"type": "ping"}))
+            thread.start()
+            event = subscription.get(timeout=2)
+            thread.join()
+            self.assertEqual(event["type"], "ping")
+            self.assertIsNone(subscription.get(timeout=0.01))
+        self.assertEqual(bus.subscriber_count("a"), 0)
+
+    def test_async_subscriber_receives_events_from_other_threads(self):
+        bus = EventBus()
+
+        async def listen():
+            async with bus.asubscribe("a") as subscription:
+                threading.Thread(target=bus.publish, args=("a", {"type": "ping"})).start()
+                return await subscription.get(timeout=2)
+
+        self.assertEqual(asyncio.run(listen())["type"], "ping")
+        self.assertEqual(bus.subscriber_count("a"), 0)
+
+    def test_abandoned_stream_unsubscribes_when_the_loop_finalizes_it(self):
+        bus = EventBus()
+
+        async def stream():
+            async with bus.asubscribe("a"):
+                yield "snapshot"
+                yield "never"
+
+        async def disconnect_after_first_frame():
+            generator = stream()
+            await anext(generator)
+            self.assertEqual(bus.subscriber_count("a"), 1)
+            # Left for the loop's async generator finalizer, as after a client disconnect.
+            return generator
+
+        errors = []
+        loop = asyncio.new_event_loop()
+        loop.set_exception_handler(lambda _loop, context: errors.append(context))
+        try:
+            abandoned = loop.run_until_complete(disconnect_after_first_frame())
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(bus.subscriber_count("a"), 0)
+        del abandoned
+
+
+class RequestLoaderTests(TestCase):
+    def setUp(self):
+        self.un = Department.objects.create(code="UN", name="UN")
+        self.wv = Department.objects.create(code="WV", name="WV")
+        for name, department in (("Aoki", self.un), ("Baba", self.un), ("Chiba", self.wv)):
+            member = Member.objects.create(name=name)
+            MemberDepartment.objects.create(member=member, department=department)
+
+    def test_keys_are_loaded_once_per_scope_and_primed_keys_share_the_batch(self):
+        with request_loader_scope():
+            with self.assertNumQueries(1):
+                self.assertEqual([member.name for member in department_roster(self.un, prime=[self.wv])], ["Aoki", "Baba"])
+                self.assertEqual([member.name for member in department_roster(self.wv)], ["Chiba"])
+                department_roster(self.un)
+
+        with self.assertNumQueries(2):
+            department_roster(self.un)
+            department_roster(self.un)
+
+    def test_writes_to_source_models_clear_the_loader(self):
+        with request_loader_scope():
+            self.assertEqual(active_department(self.un.id), self.un)
+            self.un.is_active = False
+            self.un.save(update_fields=["is_active"])
+            self.assertIsNone(active_department(self.un.id))
+
+            self.assertEqual(len(department_roster(self.wv)), 1)
+            MemberDepartment.objects.create(member=Member.objects.get(name="Aoki"), department=self.wv)
+            self.assertEqual(len(department_roster(self.wv)), 2)
+
+    def test_middleware_scopes_the_cache_to_one_request(self):
+        def view(request):
+            department_roster(self.un)
+            department_roster(self.un)
+            return HttpResponse("ok")
+
+        middleware = RequestLoaderMiddleware(view)
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                middleware(RequestFactory().get("/"))
+
+    async def test_async_middleware_scope_reaches_the_sync_view(self):
+        counts = []
+
+        @sync_to_async
+        def view(request):
+            with CaptureQueriesContext(connection) as queries:
+                department_roster(self.un)
+                department_roster(self.un)
+            counts.append(len(queries))
+            return HttpResponse("ok")
+
+        middleware = RequestLoaderMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        await middleware(RequestFactory().get("/"))
+        self.assertEqual(counts, [1])
+
+
+class ConnectionMetricsTests(TestCase):
+    def test_endpoint_is_admin_only_and_counts_requests(self):
+        url = reverse("debug_db_connections")
+        self.assertRedirects(self.client.get(url), reverse("home"), fetch_redirect_response=False)
+
+        self.client.force_login(get_user_model().objects.create_user(username="admin", password="x", is_staff=True))
+        before = connection_metrics()["requests"]
+        payload = self.client.get(url).json()
+
+        default = payload["databases"][0]
+        self.assertEqual((default["alias"], default["mode"]), ("default", "persistent"))
+        self.assertGreater(default["requests"], before)
+
+    def test_pool_statistics_are_reported_with_in_use_and_misses(self):
+        class FakePool:
+            def get_stats(self):
+                return {
+                    "pool_min": 1,
+                    "pool_max": 8,
+                    "pool_size": 5,
+                    "pool_available": 2,
+                    "requests_num": 40,
+                    "requests_queued": 3,
+                    "requests_wait_ms": 120,
+                }
+
+        with patch("config.db_connections._pool_for", return_value=FakePool()):
+            metrics = connection_metrics()
+
+        self.assertEqual(metrics["mode"], "pool")
+        self.assertEqual((metrics["size"], metrics["in_use"], metrics["max_size"]), (5, 3, 8))
+        self.assertEqual((metrics["requests"], metrics["misses"], metrics["wait_ms"], metrics["waiting"]), (40, 3, 120, 0))
+
+
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+        patcher = patch("config.db_router.replica_configured", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _read_alias(self):
+        return self.router.db_for_read(Member)
+
+    def test_reads_opt_in_and_writes_stay_on_primary(self):
+        self.assertIsNone(self._read_alias())
+        with use_replica():
+            self.assertEqual(self._read_alias(), REPLICA_ALIAS)
+            self.assertEqual(self.router.db_for_write(Member), "default")
+        self.assertIsNone(self._read_alias())
+        self.assertEqual(replica_reads(self._read_alias)(), REPLICA_ALIAS)
+        self.assertFalse(self.router.allow_migrate(REPLICA_ALIAS, "accounts"))
+
+    def test_open_transaction_keeps_reads_on_primary(self):
+        with patch("config.db_router.connections") as mock_connections:
+            mock_connections.__getitem__.return_value.in_atomic_block = True
+            with use_replica():
+                self.assertIsNone(self._read_alias())
+
+    def test_writes_pin_the_browser_to_the_primary(self):
+        seen = []
+
+        def view(request):
+            with use_replica():
+                seen.append(self._read_alias())
+            return HttpResponse("ok")
+
+        middleware = ReplicaStickinessMiddleware(view)
+        factory = RequestFactory()
+        middleware(factory.get("/"))
+        response = middleware(factory.post("/"))
+        pinned_request = factory.get("/")
+        pinned_request.COOKIES.update({key: morsel.value for key, morsel in response.cookies.items()})
+        middleware(pinned_request)
+
+        self.assertEqual(seen, [REPLICA_ALIAS, None, None])
+
+    async def test_async_middleware_pins_the_sync_view(self):
+        seen = []
+
+        @sync_to_async
+        def view(request):
+            with use_replica():
+                seen.append(self._read_alias())
+            return HttpResponse("ok")
+
+        middleware = ReplicaStickinessMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        factory = RequestFactory()
+        await middleware(factory.get("/"))
+        response = await middleware(factory.post("/"))
+
+        self.assertEqual(seen, [REPLICA_ALIAS, None])
+        self.assertIn(PIN_COOKIE_NAME, response.cookies)
+
+    def test_etag_versions_are_read_on_the_same_database_as_the_body(self):
+        seen = []
+
+        def fake_state(department_ids):
+            seen.append(self._read_alias())
+            return "1:1", None
+
+        @conditional_on_data_version()
+        @replica_reads
+        def view(request):
+            seen.append(self._read_alias())
+            return HttpResponse("ok")
+
+        def request():
+            request = RequestFactory().get("/")
+            request.user = AnonymousUser()
+            return request
+
+        with patch("apps.common.conditional_get.data_version_state", side_effect=fake_state):
+            view(request())
+            with pin_to_primary():
+                view(request())
+
+        self.assertEqual(seen, [REPLICA_ALIAS, REPLICA_ALIAS, None, None])
+
+
+class WarmupTests(TestCase):
+    def test_templates_compile_with_their_parents_and_includes(self):
+        self.assertGreater(compile_templates(), len(WARM_TEMPLATES))
+
+    def test_probe_warms_once_per_process(self):
+        with patch.dict("config.warmup._completed", clear=True):
+            with self.assertLogs("config.warmup", level="INFO") as logs:
+                response = self.client.get(reverse("warmup"))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(set(response.json()["steps_ms"]), {"code", "database"})
+            self.assertEqual(len(logs.records), 2)
+
+            with self.assertNumQueries(0):
+                self.assertTrue(self.client.get(reverse("warmup")).json()["ready"])
+
+    def test_probe_reports_unavailable_until_warm(self):
+        with patch.dict("config.warmup._completed", clear=True):
+            with patch.dict("config.warmup.STEPS", {"database": lambda: 1 / 0}), self.assertLogs("config.warmup", level="ERROR"):
+                response = self.client.get(reverse("warmup"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {"ready": False})
@@ -1,12 +1,17 @@
 from django.contrib import admin
 from django.urls import include, path
 
+from config.db_connections import connection_metrics_view
+from config.warmup import warmup_view
+
 handler403 = "config.error_views.permission_denied"
 handler404 = "config.error_views.page_not_found"
 handler500 = "config.error_views.server_error"
 
 urlpatterns = [
+    path("_warmup", warmup_view, name="warmup"),
     path("admin/", admin.site.urls),
+    path("_debug/db-connections/", connection_metrics_view, name="debug_db_connections"),
     path("", include("apps.accounts.urls")),
     path("reports/", include("apps.reports.urls")),
     path("targets/", include("apps.targets.urls")),
@@ -18,4 +23,5 @@ urlpatterns = [
     path("mail/", include("apps.mail.urls")),
     path("performance/", include("apps.performance.urls")),
     path("mosaic/", include("apps.mosaic.urls")),
+    path("exports/", include("apps.exports.urls")),
 ]
@@ -0,0 +1,126 @@
+"""Process warm-up for cold starts.
+
+A fresh process otherwise pays on its first requests for importing every
+view module, compiling templates and connecting to the database. Warm-up does
+that work up front, in two halves:
+
+* ``code``: import all URLconfs and views, then compile ``WARM_TEMPLATES``
+  and the templates they extend or include into the cached template loader.
+  It touches no database, so the gunicorn master can run it before forking
+  (``--preload``) and every worker inherits the result.
+* ``database``: open each database connection (filling the pool) and build
+  the memoized report dashboard cards. Connections must not cross a fork, so
+  this runs in each worker (``config.gunicorn``) or on the first ``/_warmup``
+  request.
+
+Completed steps are remembered per process, so repeated calls are cheap.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from django.db import connections
+from django.http import HttpRequest, JsonResponse
+from django.template import loader
+from django.template.loader_tags import ExtendsNode, IncludeNode
+from django.urls import get_resolver, reverse
+from django.views.decorators.cache import never_cache
+
+
+logger = logging.getLogger(__name__)
+
+WARM_TEMPLATES = (
+    "dairymetrics/entry_form_v2_transaction.html",
+    "dairymetrics/metrics_report.html",
+    "dashboard/admin.html",
+    "performance/index.html",
+    "performance/member_detail.html",
+    "performance/adjustments.html",
+    "reports/report_index.html",
+    "talks/thread_index.html",
+    "accounts/login.html",
+)
+
+_lock = threading.Lock()
+_completed: dict[str, float] = {}
+
+
+def _literal_template_name(expression) -> str | None:
+    # Constant names are resolved to ``str`` when the template is compiled;
+    # variables stay ``Variable`` objects and can only be known at render time.
+    name = getattr(expression, "var", None)
+    if isinstance(name, str) and not expression.filters:
+        return name
+    return None
+
+
+def compile_templates(names=WARM_TEMPLATES) -> int:
+    """Compile ``names`` and their literal parents and includes; return the count."""
+    pending = list(names)
+    seen: set[str] = set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        template = loader.get_template(name).template
+        for node in template.nodelist.get_nodes_by_type((ExtendsNode, IncludeNode)):
+            expression = node.parent_name if isinstance(node, ExtendsNode) else node.template
+            dependency = _literal_template_name(expression)
+            if dependency:
+                pending.append(dependency)
+    return len(seen)
+
+
+def _warm_code() -> None:
+    get_resolver().url_patterns
+    reverse("home")
+    compile_templates()
+
+
+def _warm_database() -> None:
+    from apps.reports.services.dashboard_cards import build_report_dashboard_cards_context
+    from config.request_loader import request_loader_scope
+
+    for connection in connections.all():
+        if connection.in_atomic_block:
+            continue
+        connection.ensure_connection()
+        # Returns the connection to the pool when pooling is on.
+        connection.close()
+    with request_loader_scope():
+        build_report_dashboard_cards_context()
+
+
+STEPS = {"code": _warm_code, "database": _warm_database}
+
+
+def run_warmup(*, database: bool = True) -> dict[str, float]:
+    """Run the warm-up steps not yet completed in this process.
+
+    Returns the duration in milliseconds of every completed step.
+    """
+    names = ["code", "database"] if database else ["code"]
+    with _lock:
+        for name in names:
+            if name in _completed:
+                continue
+            started = time.perf_counter()
+            STEPS[name]()
+            _completed[name] = round((time.perf_counter() - started) * 1000, 1)
+            logger.info("warmup step=%s duration_ms=%s", name, _completed[name])
+        return dict(_completed)
+
+
+@never_cache
+def warmup_view(request: HttpRequest) -> JsonResponse:
+    """Readiness probe: 200 once this process is warm, 503 while it cannot be."""
+    try:
+        steps = run_warmup()
+    except Exception:
+        logger.exception("warmup failed")
+        return JsonResponse({"ready": False}, status=503)
+    return JsonResponse({"ready": True, "steps_ms": steps})
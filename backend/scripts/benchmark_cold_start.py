@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Measure cold-start latency of the app server.
+
+Each run starts ``scripts/start.sh`` on a free port and times:
+
+* ``ready``: the time until ``--probe`` (default ``/_warmup``) first answers 200.
+* The first response of every ``--url``, requested in order right after that.
+
+Then the server is stopped. The script prints the median and p95 over the runs.
+
+    python scripts/benchmark_cold_start.py --runs 10 --url / --url /metrics/ --output bench/cold.json
+    python scripts/benchmark_cold_start.py --runs 10 --url / --compare bench/cold.json
+
+Run it from ``backend/`` with the same environment the server needs
+(``DJANGO_SETTINGS_MODULE``, ``SECRET_KEY``, ``ALLOWED_HOSTS``, database).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import pathlib
+import shlex
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def fetch_status(url: str, timeout: float) -> int:
+    request = urllib.request.Request(url, headers={"Host": "localhost"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        return 0
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+
+def run_once(*, command: list[str], probe: str, urls: list[str], timeout: float) -> dict[str, float]:
+    port = free_port()
+    env = {**os.environ, "PORT": str(port)}
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while fetch_status(base + probe, timeout=1) != 200:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with {process.returncode}")
+            if time.perf_counter() - started > timeout:
+                raise RuntimeError(f"{probe} not ready after {timeout}s")
+            time.sleep(0.05)
+        timings = {"ready": (time.perf_counter() - started) * 1000}
+        for url in urls:
+            request_started = time.perf_counter()
+            fetch_status(base + url, timeout=timeout)
+            timings[url] = (time.perf_counter() - request_started) * 1000
+        return timings
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def summarize(runs: list[dict[str, float]]) -> list[dict]:
+    rows = []
+    for name in runs[0]:
+        values = [run[name] for run in runs]
+        rows.append(
+            {
+                "name": name,
+                "ms_median": round(statistics.median(values), 1),
+                "ms_p95": round(percentile(values, 0.95), 1),
+                "ms_max": round(max(values), 1),
+            }
+        )
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to measure.")
+    parser.add_argument("--probe", default="/_warmup", help="Readiness path polled after start.")
+    parser.add_argument("--url", action="append", default=[], help="Path timed once after readiness. Repeatable.")
+    parser.add_argument("--timeout", type=float, default=60, help="Seconds to wait for readiness.")
+    parser.add_argument("--command", default="sh scripts/start.sh", help="Server start command.")
+    parser.add_argument("--output", default="", help="Write results as JSON to this path.")
+    parser.add_argument("--compare", default="", help="Compare against a previous JSON result file.")
+    options = parser.parse_args()
+
+    previous = None
+    if options.compare:
+        previous = {row["name"]: row for row in json.loads(pathlib.Path(options.compare).read_text(encoding="utf-8"))["results"]}
+
+    runs = [
+        run_once(command=shlex.split(options.command), probe=options.probe, urls=options.url, timeout=options.timeout)
+        for _ in range(options.runs)
+    ]
+    results = summarize(runs)
+    for row in results:
+        line = f"{row['name']}: median={row['ms_median']}ms p95={row['ms_p95']}ms max={row['ms_max']}ms"
+        if previous and row["name"] in previous:
+            line += f" (p95 before={previous[row['name']]['ms_p95']}ms)"
+        print(line)
+
+    if options.output:
+        output_path = pathlib.Path(options.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(json.dumps({"runs": options.runs, "results": results}, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,10 +9,18 @@ if [ "${RUN_SEED_ON_STARTUP:-0}" = "1" ]; then
   python manage.py seed_default_departments_and_metrics_if_empty
 fi
 
-exec gunicorn config.wsgi:application \
+if [ "${APP_SERVER:-wsgi}" = "asgi" ]; then
+  # Live board streams need the ASGI app; uvicorn workers run one event loop each.
+  set -- config.asgi:application --worker-class uvicorn_worker.UvicornWorker
+else
+  set -- config.wsgi:application --threads "${GUNICORN_THREADS:-4}"
+fi
+
+# config.gunicorn preloads the app and warms each worker (GUNICORN_PRELOAD=0 disables preloading).
+exec gunicorn "$@" \
+  --config python:config.gunicorn \
   --bind "0.0.0.0:${PORT:-8080}" \
   --workers "${GUNICORN_WORKERS:-2}" \
-  --threads "${GUNICORN_THREADS:-4}" \
   --timeout "${GUNICORN_TIMEOUT:-120}" \
   --log-level "${GUNICORN_LOG_LEVEL:-info}" \
   --access-logfile "-" \
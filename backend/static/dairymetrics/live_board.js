@@ -0,0 +1,147 @@
+(() => {
+  const board = document.querySelector("[data-live-board]");
+  if (!board) return;
+
+  const POLL_INTERVAL_MS = 5000;
+  const POLL_MAX_INTERVAL_MS = 60000;
+  const emptyMessages = {
+    active: "まだ活動中メンバーはいません。",
+    closed: "まだ活動終了メンバーはいません。",
+  };
+  const today = new Date();
+  const todayText = [
+    today.getFullYear(),
+    String(today.getMonth() + 1).padStart(2, "0"),
+    String(today.getDate()).padStart(2, "0"),
+  ].join("-");
+  const rowsByMember = new Map();
+
+  const formatYen = (value) => `${Number(value || 0).toLocaleString("ja-JP")}円`;
+
+  const element = (tagName, className, text) => {
+    const node = document.createElement(tagName);
+    if (className) node.className = className;
+    if (text !== undefined) node.textContent = text;
+    return node;
+  };
+
+  const renderItem = (row) => {
+    const item = element("a", "dairymetrics-v2-activity-item");
+    item.href = row.detail_url;
+    const top = element("div", "dairymetrics-v2-activity-top");
+    top.append(
+      element("strong", "", row.member_name),
+      element("span", `dairymetrics-v2-mail-badge ${row.is_closed ? "is-sent" : "is-unsent"}`, row.status_label),
+    );
+    const meta = element("div", "dairymetrics-v2-activity-meta");
+    meta.append(element("span", "", row.department_name), element("span", "", `${row.updated_label} 更新`));
+    const values = element("div", "dairymetrics-v2-activity-values");
+    values.append(
+      element("span", "", row.count_label),
+      element("span", "", `${formatYen(row.amount_value)} / ${formatYen(row.target_amount_value)}`),
+    );
+    item.append(top, meta, values, element("div", "dairymetrics-subtext", row.location_name || "現場未入力"));
+    return item;
+  };
+
+  const render = () => {
+    const rows = Array.from(rowsByMember.values()).sort((left, right) => {
+      if (left.updated_at !== right.updated_at) return left.updated_at < right.updated_at ? 1 : -1;
+      return String(left.member_name).localeCompare(String(right.member_name), "ja");
+    });
+    board.querySelectorAll("[data-live-board-group]").forEach((group) => {
+      const key = group.dataset.liveBoardGroup;
+      const groupRows = rows.filter((row) => (key === "closed") === Boolean(row.is_closed));
+      const head = group.querySelector(".dairymetrics-v2-activity-group-head");
+      const count = group.querySelector("[data-live-board-count]");
+      if (count) count.textContent = `${groupRows.length}人`;
+      const children = groupRows.length
+        ? groupRows.map(renderItem)
+        : [element("p", "muted", emptyMessages[key] || "")];
+      group.replaceChildren(...(head ? [head] : []), ...children);
+    });
+  };
+
+  const applyEvent = (event) => {
+    if (event.entry_date && event.entry_date !== todayText) return false;
+    if (event.type === "snapshot") {
+      rowsByMember.clear();
+      event.rows.forEach((row) => rowsByMember.set(row.member_id, row));
+      return true;
+    }
+    if (event.type === "entry_removed") {
+      return rowsByMember.delete(event.member_id);
+    }
+    if (event.row) {
+      rowsByMember.set(event.member_id, event.row);
+      return true;
+    }
+    // Transaction events are followed by the entry's own update; nothing to draw yet.
+    return false;
+  };
+
+  const applyEvents = (events) => {
+    const changed = events.map(applyEvent).some(Boolean);
+    if (changed) render();
+  };
+
+  // Polls return at once; the client waits between them and backs off while
+  // nothing changes, so an open page never holds a server thread.
+  let pollCursor = "";
+  let pollIntervalMs = POLL_INTERVAL_MS;
+  let pollMaxIntervalMs = POLL_MAX_INTERVAL_MS;
+  let pollDelayMs = POLL_INTERVAL_MS;
+  let pollTimer = null;
+  const schedulePoll = (delayMs) => {
+    window.clearTimeout(pollTimer);
+    pollTimer = window.setTimeout(poll, delayMs);
+  };
+  const poll = async () => {
+    if (document.hidden) {
+      // Resumed by the visibilitychange listener below.
+      pollTimer = null;
+      return;
+    }
+    try {
+      const url = new URL(board.dataset.liveBoardPollUrl, window.location.href);
+      if (pollCursor) url.searchParams.set("cursor", pollCursor);
+      const response = await fetch(url, { headers: { Accept: "application/json" }, credentials: "same-origin" });
+      if (!response.ok) throw new Error(`live board poll failed: ${response.status}`);
+      const payload = await response.json();
+      pollCursor = payload.cursor || "";
+      pollIntervalMs = payload.poll_interval_ms || pollIntervalMs;
+      pollMaxIntervalMs = payload.poll_max_interval_ms || pollMaxIntervalMs;
+      const events = payload.events || [];
+      applyEvents(events);
+      pollDelayMs = events.length ? pollIntervalMs : Math.min(pollDelayMs * 2, pollMaxIntervalMs);
+    } catch (error) {
+      pollDelayMs = Math.min(pollDelayMs * 2, pollMaxIntervalMs);
+    }
+    schedulePoll(pollDelayMs);
+  };
+  const startPolling = () => {
+    document.addEventListener("visibilitychange", () => {
+      if (document.hidden) return;
+      pollDelayMs = pollIntervalMs;
+      schedulePoll(0);
+    });
+    poll();
+  };
+
+  if (!("EventSource" in window) || !board.dataset.liveBoardStreamUrl) {
+    startPolling();
+    return;
+  }
+  const source = new EventSource(board.dataset.liveBoardStreamUrl);
+  source.addEventListener("message", (message) => {
+    try {
+      applyEvents([JSON.parse(message.data)]);
+    } catch (error) {
+      // Ignore a malformed frame; the next snapshot resynchronises the board.
+    }
+  });
+  source.addEventListener("error", () => {
+    // CLOSED means the server declined streaming (WSGI answers 204); switch to polling.
+    if (source.readyState === EventSource.CLOSED) startPolling();
+  });
+})();
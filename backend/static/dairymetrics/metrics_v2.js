@@ -54,9 +54,10 @@
     scopeSelect.addEventListener("change", toggleScopeFields);
   }
 
-  if (!dataNode || typeof window.Chart === "undefined") {
+  if (!dataNode) {
     return;
   }
+  const hasChart = typeof window.Chart !== "undefined";
 
   let payload;
   try {
@@ -107,7 +108,7 @@
   };
 
   function createDoughnutChart(canvas, labels, values, options) {
-    if (!canvas) {
+    if (!canvas || !hasChart) {
       return;
     }
     const context = canvas.getContext("2d");
@@ -180,50 +181,54 @@
     createRateDoughnutChart(canvas, values);
   });
 
-  document.querySelectorAll(".metrics-v2-distribution-chart").forEach(function (canvas) {
-    const labels = (canvas.dataset.chartLabels || "").split("|").filter(Boolean);
-    const values = (canvas.dataset.chartValues || "")
-      .split(",")
-      .map(function (value) { return Number(value || 0); });
-    const isEmpty = !values.some(function (value) { return value > 0; });
-    setChartEmptyState(canvas, isEmpty);
-    if (isEmpty) {
-      return;
-    }
-    const context = canvas.getContext("2d");
-    if (!context) {
-      return;
-    }
-    new window.Chart(context, {
-      type: "doughnut",
-      data: {
-        labels: labels,
-        datasets: [
-          {
-            data: values,
-            backgroundColor: defaultPalette.slice(0, values.length),
-            borderWidth: 0,
+  function initDistributionCharts(root) {
+    root.querySelectorAll(".metrics-v2-distribution-chart").forEach(function (canvas) {
+      const labels = (canvas.dataset.chartLabels || "").split("|").filter(Boolean);
+      const values = (canvas.dataset.chartValues || "")
+        .split(",")
+        .map(function (value) { return Number(value || 0); });
+      const isEmpty = !values.some(function (value) { return value > 0; });
+      setChartEmptyState(canvas, isEmpty);
+      if (isEmpty || !hasChart) {
+        return;
+      }
+      const context = canvas.getContext("2d");
+      if (!context) {
+        return;
+      }
+      new window.Chart(context, {
+        type: "doughnut",
+        data: {
+          labels: labels,
+          datasets: [
+            {
+              data: values,
+              backgroundColor: defaultPalette.slice(0, values.length),
+              borderWidth: 0,
+            },
+          ],
+        },
+        options: {
+          responsive: true,
+          maintainAspectRatio: false,
+          cutout: "48%",
+          plugins: {
+            legend: { display: false },
+            tooltip: { enabled: true },
           },
-        ],
-      },
-      options: {
-        responsive: true,
-        maintainAspectRatio: false,
-        cutout: "48%",
-        plugins: {
-          legend: { display: false },
-          tooltip: { enabled: true },
         },
-      },
-      plugins: [distributionLabelPlugin],
+        plugins: [distributionLabelPlugin],
+      });
     });
-  });
+  }
+
+  initDistributionCharts(document);
 
   function buildComboChart(canvasId, chartPayload) {
     const canvas = document.getElementById(canvasId);
     const isEmpty = !chartPayload || !chartPayload.labels || !chartPayload.labels.length || chartPayload.has_data === false;
     setChartEmptyState(canvas, isEmpty);
-    if (!canvas || isEmpty) {
+    if (!canvas || isEmpty || !hasChart) {
       return null;
     }
     const context = canvas.getContext("2d");
@@ -308,18 +313,16 @@
     });
   }
 
-  buildComboChart("metrics-v2-month-history-chart", payload.month_history);
-  buildComboChart("metrics-v2-period-history-chart", payload.period_history);
-
   const rankingCanvas = document.getElementById("metrics-v2-ranking-chart");
   const rankingSelect = document.querySelector("[data-metrics-v2-ranking-select]");
   let rankingChart = null;
+  let rankingPayload = null;
 
   function renderRanking(metricKey) {
-    const metricPayload = payload.ranking && payload.ranking.metric_map ? payload.ranking.metric_map[metricKey] : null;
+    const metricPayload = rankingPayload && rankingPayload.metric_map ? rankingPayload.metric_map[metricKey] : null;
     const isEmpty = !metricPayload || !metricPayload.labels || !metricPayload.labels.length;
     setChartEmptyState(rankingCanvas, isEmpty);
-    if (!rankingCanvas || isEmpty) {
+    if (!rankingCanvas || isEmpty || !hasChart) {
       return;
     }
     if (rankingChart) {
@@ -403,11 +406,11 @@
       renderRanking(rankingSelect.value);
     });
   }
-  renderRanking((payload.ranking && payload.ranking.default_metric) || "support_amount");
 
   const amountModeSelect = document.querySelector("[data-metrics-v2-amount-select]");
   const averageAmountCanvas = document.getElementById("metrics-v2-average-amount-chart");
   let averageAmountChart = null;
+  let averageAmountPayload = null;
   const amountPalettes = {
     age: ["#1d7dfa", "#56d4a7", "#f59e0b", "#8b5cf6", "#ef4444", "#14b8a6", "#f97316", "#94a3b8", "#7bc4ff"],
     gender: ["#1d7dfa", "#ec4899", "#94a3b8"],
@@ -415,10 +418,10 @@
   };
 
   function renderAverageAmount(mode) {
-    const chartPayload = payload.average_amount_comparison ? payload.average_amount_comparison[mode] : null;
+    const chartPayload = averageAmountPayload ? averageAmountPayload[mode] : null;
     const isEmpty = !chartPayload || !chartPayload.labels || !chartPayload.labels.length;
     setChartEmptyState(averageAmountCanvas, isEmpty);
-    if (!averageAmountCanvas || isEmpty) {
+    if (!averageAmountCanvas || isEmpty || !hasChart) {
       return;
     }
     if (averageAmountChart) {
@@ -468,5 +471,98 @@
       renderAverageAmount(amountModeSelect.value);
     });
   }
-  renderAverageAmount("age");
+
+  // Sections below the summary are fetched separately; lazy ones when they near the viewport.
+  const sectionUrls = payload.section_urls || {};
+  const sectionRequests = {};
+  const sectionHandlers = {
+    history: function (data) {
+      buildComboChart("metrics-v2-month-history-chart", data.month_history);
+      buildComboChart("metrics-v2-period-history-chart", data.period_history);
+    },
+    ranking: function (data) {
+      rankingPayload = data.ranking;
+      renderRanking((rankingSelect && rankingSelect.value) || (rankingPayload && rankingPayload.default_metric) || "support_amount");
+    },
+    distribution: function (data) {
+      averageAmountPayload = data.average_amount_comparison;
+      renderAverageAmount((amountModeSelect && amountModeSelect.value) || "age");
+    },
+  };
+
+  function showSectionError(section) {
+    const status = section.querySelector("[data-metrics-section-status]");
+    if (status) {
+      status.textContent = "読み込みに失敗しました。再読み込みしてください。";
+      return;
+    }
+    section.querySelectorAll("canvas").forEach(function (canvas) {
+      setChartEmptyState(canvas, true);
+    });
+  }
+
+  function loadSection(section) {
+    const name = section.dataset.metricsSection;
+    const url = sectionUrls[name];
+    if (!url) {
+      return Promise.resolve();
+    }
+    if (!sectionRequests[name]) {
+      section.setAttribute("aria-busy", "true");
+      sectionRequests[name] = fetch(url, {
+        credentials: "same-origin",
+        headers: { "X-Requested-With": "XMLHttpRequest" },
+      })
+        .then(function (response) {
+          if (!response.ok) {
+            throw new Error("section " + name + " failed: " + response.status);
+          }
+          return response.json();
+        })
+        .then(function (data) {
+          const body = section.querySelector("[data-metrics-section-body]");
+          if (body && typeof data.html === "string") {
+            body.innerHTML = data.html;
+            initDistributionCharts(body);
+          }
+          if (sectionHandlers[name]) {
+            sectionHandlers[name](data);
+          }
+          section.dispatchEvent(new CustomEvent("metrics:section-loaded", { bubbles: true, detail: { section: name } }));
+        })
+        .catch(function () {
+          showSectionError(section);
+        })
+        .finally(function () {
+          section.removeAttribute("aria-busy");
+        });
+    }
+    return sectionRequests[name];
+  }
+
+  const sections = Array.from(document.querySelectorAll("[data-metrics-section]"));
+  const lazySections = [];
+  sections.forEach(function (section) {
+    if ("metricsSectionLazy" in section.dataset && "IntersectionObserver" in window) {
+      lazySections.push(section);
+    } else {
+      loadSection(section);
+    }
+  });
+  if (lazySections.length) {
+    const observer = new IntersectionObserver(function (entries) {
+      entries.forEach(function (entry) {
+        if (entry.isIntersecting) {
+          observer.unobserve(entry.target);
+          loadSection(entry.target);
+        }
+      });
+    }, { rootMargin: "400px 0px" });
+    lazySections.forEach(function (section) {
+      observer.observe(section);
+    });
+  }
+  window.addEventListener("beforeprint", function () {
+    sections.forEach(loadSection);
+  });
 })();
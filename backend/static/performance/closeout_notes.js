@@ -76,7 +76,7 @@
       if (!response.ok) throw new Error(`HTTP ${response.status}`);
       const payload = await response.json();
       results.innerHTML = payload.results_html;
-      if (count) count.textContent = payload.count;
+      if (count) count.textContent = payload.count_label ?? payload.count;
       updateScope(payload.scope_key, payload.scope_label);
       window.history.replaceState({}, "", url);
       if (closeOnSuccess && window.matchMedia("(max-width: 700px)").matches) {